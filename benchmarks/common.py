@@ -0,0 +1,131 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+
+def load_corpus(corpus_dir: Path = CORPUS_DIR) -> Tuple[List[str], List[str]]:
+    """Return the sample resume texts and job descriptions."""
+    resumes = [path.read_text() for path in sorted((corpus_dir / "resumes").iterdir())]
+    jobs = [path.read_text() for path in sorted((corpus_dir / "jobs").iterdir())]
+    return resumes, jobs
+
+
+def quiet_logging() -> None:
+    """Keep per-stage INFO logging from dominating the measurements."""
+    logging.disable(logging.INFO)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile, `q` in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+@dataclass
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a sleeping coroutine, i.e. time spent blocked by other work."""
+
+    interval: float = 0.01
+    lags: List[float] = field(default_factory=list)
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    async def _run(self) -> None:
+        while True:
+            started_at = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(time.perf_counter() - started_at - self.interval, 0.0))
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    concurrency: int
+    requests: int
+    errors: int
+    duration: float
+    throughput: float
+    p50: float
+    p95: float
+    p99: float
+    loop_lag_p99: float
+    loop_lag_max: float
+
+    @classmethod
+    def from_measurements(
+        cls, name: str, concurrency: int, latencies: List[float], errors: int, duration: float, lags: List[float]
+    ) -> "BenchmarkResult":
+        requests = len(latencies) + errors
+        return cls(
+            name=name,
+            concurrency=concurrency,
+            requests=requests,
+            errors=errors,
+            duration=duration,
+            throughput=requests / duration if duration > 0 else 0.0,
+            p50=percentile(latencies, 50),
+            p95=percentile(latencies, 95),
+            p99=percentile(latencies, 99),
+            loop_lag_p99=percentile(lags, 99),
+            loop_lag_max=max(lags, default=0.0),
+        )
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.concurrency}"
+
+
+def print_results(results: List[BenchmarkResult], baseline: Optional[Dict[str, BenchmarkResult]] = None) -> None:
+    """Print a results table; with a baseline, throughput and p95 deltas are appended."""
+    header = (
+        f"{'benchmark':<24}{'conc':>6}{'reqs':>7}{'errs':>6}{'req/s':>10}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'lag p99':>10}{'lag max':>10}"
+    )
+    click.echo(header + ("  vs baseline" if baseline else ""))
+    for result in results:
+        line = (
+            f"{result.name:<24}{result.concurrency:>6}{result.requests:>7}{result.errors:>6}"
+            f"{result.throughput:>10.2f}{result.p50 * 1000:>10.1f}{result.p95 * 1000:>10.1f}{result.p99 * 1000:>10.1f}"
+            f"{result.loop_lag_p99 * 1000:>10.1f}{result.loop_lag_max * 1000:>10.1f}"
+        )
+        previous = (baseline or {}).get(result.key)
+        if previous is not None:
+            line += f"  req/s {_delta(result.throughput, previous.throughput)}, p95 {_delta(result.p95, previous.p95)}"
+        click.echo(line)
+
+
+def _delta(current: float, previous: float) -> str:
+    if previous == 0:
+        return "n/a"
+    return f"{(current - previous) / previous * 100:+.1f}%"
+
+
+def save_results(results: List[BenchmarkResult], path: Path) -> None:
+    path.write_text(json.dumps([asdict(result) for result in results], indent=2))
+
+
+def load_results(path: Path) -> Dict[str, BenchmarkResult]:
+    results = [BenchmarkResult(**item) for item in json.loads(path.read_text())]
+    return {result.key: result for result in results}
@@ -0,0 +1,103 @@
+"""
+Compare format-specific text extraction with generic markitdown conversion.
+
+    python -m benchmarks.extraction --repeat 5 --pages 1,40 --output extraction.json
+"""
+
+import json
+import statistics
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import click
+from PyPDF2 import PdfReader, PdfWriter
+
+from benchmarks.common import CORPUS_DIR, quiet_logging
+from src.extractors import create_extractor_registry, get_pdf_pool
+
+SAMPLE_PDF = Path(__file__).parent.parent / "tests" / "examples" / "test_resume.pdf"
+
+
+@dataclass
+class ExtractionResult:
+    format: str
+    size: int
+    markitdown: float
+    """Median seconds of `MarkItDown.convert`."""
+    registry: float
+    """Median seconds of the extractor the registry selects."""
+
+    @property
+    def speedup(self) -> float:
+        return self.markitdown / self.registry if self.registry else 0.0
+
+
+def write_pdf(path: Path, pages: int) -> Path:
+    writer = PdfWriter()
+    page = PdfReader(SAMPLE_PDF).pages[0]
+    for _ in range(pages):
+        writer.add_page(page)
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def create_samples(directory: Path, pdf_pages: List[int]) -> List[Tuple[str, Path]]:
+    resume = (CORPUS_DIR / "resumes" / "backend_python.md").read_text()
+    samples = [("txt", directory / "resume.txt"), ("md", directory / "resume.md")]
+    for _, path in samples:
+        path.write_text(resume)
+    for pages in pdf_pages:
+        samples.append((f"pdf {pages}p", write_pdf(directory / f"resume_{pages}.pdf", pages)))
+    return samples
+
+
+def median_time(function: Callable[[], str], repeat: int) -> float:
+    function()
+    times = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started_at)
+    return statistics.median(times)
+
+
+@click.command()
+@click.option('--repeat', type=click.IntRange(min=1), default=5, show_default=True)
+@click.option('--pages', default='1,40', show_default=True, help='Comma-separated page counts of the PDF samples')
+@click.option('--output', type=click.Path(path_type=Path), help='Save results as JSON')
+def main(repeat: int, pages: str, output: Optional[Path]):
+    """Report extraction time per format for markitdown and the extractor registry."""
+    from markitdown import MarkItDown
+
+    quiet_logging()
+    markitdown = MarkItDown()
+    registry = create_extractor_registry(fallback=lambda path: markitdown.convert(str(path)).text_content)
+
+    results = []
+    click.echo(f"{'format':<12}{'KB':>8}{'markitdown ms':>15}{'registry ms':>13}{'speedup':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, path in create_samples(Path(directory), [int(count) for count in pages.split(',')]):
+            result = ExtractionResult(
+                format=name,
+                size=path.stat().st_size,
+                markitdown=median_time(lambda: markitdown.convert(str(path)).text_content, repeat),
+                registry=median_time(lambda: registry.extract(path), repeat),
+            )
+            results.append(result)
+            click.echo(
+                f"{name:<12}{result.size / 1024:>8.1f}{result.markitdown * 1000:>15.1f}"
+                f"{result.registry * 1000:>13.1f}{result.speedup:>8.1f}x"
+            )
+    if get_pdf_pool.cache_info().currsize:
+        get_pdf_pool().shutdown()
+
+    if output:
+        output.write_text(json.dumps([asdict(result) for result in results], indent=2))
+
+
+if __name__ == "__main__":
+    main()
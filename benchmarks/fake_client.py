@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import random
+from dataclasses import dataclass, field
+from typing import Optional, Type, Union
+
+from pydantic import BaseModel
+
+from src.entities import ContactInfo, Emphasis, JobRequirements, Location, UnifiedResume
+from src.interfaces import AIClientInterface
+
+WORDS = (
+    "python service platform latency team design delivery cloud api data model pipeline review "
+    "mentor scale reliability product customer migration testing security observability"
+).split()
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "lognormal", "exponential")
+
+
+class FakeProviderError(Exception):
+    pass
+
+
+@dataclass
+class LatencyModel:
+    """Provider latency distribution in seconds; `median` is the typical latency, `spread` its variability."""
+
+    distribution: str = "lognormal"
+    median: float = 0.5
+    spread: float = 0.5
+
+    def __post_init__(self):
+        if self.distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "constant":
+            return self.median
+        if self.distribution == "uniform":
+            return max(rng.uniform(self.median - self.spread, self.median + self.spread), 0.0)
+        if self.distribution == "exponential":
+            return rng.expovariate(1 / self.median) if self.median > 0 else 0.0
+        return self.median * rng.lognormvariate(0, self.spread)
+
+
+@dataclass
+class FakeAIClient(AIClientInterface):
+    """
+    Synthetic AIClientInterface that answers every pipeline stage without calling a provider.
+
+    Responses are derived from the prompt, so the same input always produces the same analysis.
+    """
+
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    error_rate: float = 0.0
+    response_words: int = 300
+    seed: Optional[int] = None
+    calls: int = field(default=0, init=False)
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    async def run(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        system_prompt: str = "",
+        result_type: Optional[Type[BaseModel]] = None,
+        use_cache: bool = True,
+        prompt_prefix: str = "",
+        stage: str = "",
+    ) -> Union[str, BaseModel]:
+        self.calls += 1
+        await asyncio.sleep(self.latency.sample(self._rng))
+        if self._rng.random() < self.error_rate:
+            raise FakeProviderError(f"Synthetic provider error in stage {stage or 'unknown'}")
+
+        prompt_rng = random.Random(hashlib.sha256((prompt_prefix + prompt).encode()).digest())
+        if result_type is JobRequirements:
+            return self._job_requirements(prompt_rng)
+        if result_type is Location:
+            return Location(country="Remote", city="Remote")
+        if result_type is UnifiedResume:
+            return UnifiedResume(
+                markdown=" ".join(prompt_rng.choice(WORDS) for _ in range(self.response_words)),
+                contact=ContactInfo(website="https://example.com", email="candidate@example.com"),
+            )
+        if stage == "website":
+            return "https://example.com"
+        if stage in ("unify", "match_reasons"):
+            return " ".join(prompt_rng.choice(WORDS) for _ in range(self.response_words))
+        return str(prompt_rng.randint(0, 100))
+
+    @staticmethod
+    def _job_requirements(rng: random.Random) -> JobRequirements:
+        return JobRequirements(
+            required_experience_years=rng.randint(0, 10),
+            required_education_level="Bachelor's",
+            required_skills=rng.sample(WORDS, 5),
+            optional_skills=rng.sample(WORDS, 3),
+            certifications_preferred=[],
+            soft_skills=["Communication", "Teamwork"],
+            keywords_to_match=rng.sample(WORDS, 4),
+            location=Location(country="Remote", city="Remote"),
+            emphasis=Emphasis(),
+        )
@@ -0,0 +1,96 @@
+"""
+Measure module import time in fresh interpreters.
+
+    python -m benchmarks.imports --repeat 5 --output imports.json
+    python -m benchmarks.imports --baseline imports.json --top 10
+"""
+
+import json
+import statistics
+import subprocess  # nosec: B404
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+MODULES = ("src.manage", "src.tasks", "src.services", "src.client", "src.server")
+
+
+@dataclass
+class ImportResult:
+    module: str
+    repeat: int
+    wall: float
+    """Median wall time of `python -c "import module"` minus an empty interpreter, in seconds."""
+    cumulative: float
+    """Median cumulative import time reported by `-X importtime`, in seconds."""
+
+
+def parse_importtime(output: str) -> List[Tuple[str, float, float]]:
+    """Return (module, self seconds, cumulative seconds) rows from `-X importtime` stderr."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return rows
+
+
+def time_interpreter(code: str) -> Tuple[float, str]:
+    started_at = time.perf_counter()
+    completed = subprocess.run(  # nosec: B603
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    return time.perf_counter() - started_at, completed.stderr
+
+
+def measure_import(module: str, repeat: int, startup: float) -> Tuple[ImportResult, List[Tuple[str, float, float]]]:
+    walls, cumulatives = [], []
+    rows: List[Tuple[str, float, float]] = []
+    for _ in range(repeat):
+        wall, stderr = time_interpreter(f"import {module}")
+        rows = parse_importtime(stderr)
+        walls.append(wall - startup)
+        cumulatives.append(next((row[2] for row in rows if row[0] == module), 0.0))
+    result = ImportResult(module, repeat, statistics.median(walls), statistics.median(cumulatives))
+    return result, rows
+
+
+def load_baseline(path: Path) -> Dict[str, ImportResult]:
+    return {item["module"]: ImportResult(**item) for item in json.loads(path.read_text())}
+
+
+@click.command()
+@click.option('--module', 'modules', multiple=True, default=MODULES, show_default=True, help='Module to import')
+@click.option('--repeat', type=click.IntRange(min=1), default=5, show_default=True)
+@click.option('--top', type=click.IntRange(min=0), default=0, help='Show the slowest dependencies of each module')
+@click.option('--output', type=click.Path(path_type=Path), help='Save results as JSON')
+@click.option('--baseline', type=click.Path(exists=True, path_type=Path), help='Compare with saved results')
+def main(modules: Tuple[str, ...], repeat: int, top: int, output: Optional[Path], baseline: Optional[Path]):
+    """Report how long importing each entry-point module takes."""
+    startup = statistics.median(time_interpreter("pass")[0] for _ in range(repeat))
+    previous = load_baseline(baseline) if baseline else {}
+    click.echo(f"interpreter startup {startup * 1000:.1f} ms")
+    click.echo(f"{'module':<24}{'wall ms':>10}{'import ms':>11}" + ("  vs baseline" if baseline else ""))
+
+    results = []
+    for module in modules:
+        result, rows = measure_import(module, repeat, startup)
+        results.append(result)
+        line = f"{module:<24}{result.wall * 1000:>10.1f}{result.cumulative * 1000:>11.1f}"
+        if module in previous and previous[module].cumulative:
+            line += f"  {(result.cumulative - previous[module].cumulative) / previous[module].cumulative * 100:+.1f}%"
+        click.echo(line)
+        for name, self_time, cumulative in sorted(rows, key=lambda row: row[2], reverse=True)[1 : top + 1]:
+            click.echo(f"    {name:<40}{cumulative * 1000:>10.1f}{self_time * 1000:>10.1f}")
+
+    if output:
+        output.write_text(json.dumps([asdict(result) for result in results], indent=2))
+
+
+if __name__ == "__main__":
+    main()
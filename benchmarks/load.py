@@ -0,0 +1,74 @@
+"""
+Drive a running cv_matcher server over HTTP, typically pointed at the provider stub.
+
+    python -m benchmarks.load --url http://localhost:8000 --concurrency 1,16,64 --requests 128
+"""
+
+import asyncio
+import itertools
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+import click
+import httpx
+
+from benchmarks.common import BenchmarkResult, load_corpus, load_results, print_results, save_results
+from benchmarks.pipeline import run_level
+
+
+async def run_load(
+    url: str, concurrency_levels: List[int], requests: int, unique: bool, timeout: float
+) -> List[BenchmarkResult]:
+    resumes, jobs = load_corpus()
+    pairs = list(itertools.product(resumes, jobs))
+    limits = httpx.Limits(max_connections=max(concurrency_levels))
+
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as http_client:
+
+        async def call(index: int):
+            resume_text, job_description = pairs[index % len(pairs)]
+            if unique:
+                # Defeat the AIClient response cache so every request reaches the provider
+                resume_text += f"\n\nReference: {uuid.uuid4().hex}\n"
+            response = await http_client.post(
+                "/analyze_resume",
+                files={
+                    "resume_file": ("resume.md", resume_text.encode(), "text/markdown"),
+                    "job_description_file": ("job.txt", job_description.encode(), "text/plain"),
+                },
+            )
+            response.raise_for_status()
+            return response
+
+        return [await run_level("load", concurrency, requests, call) for concurrency in concurrency_levels]
+
+
+@click.command()
+@click.option('--url', default='http://localhost:8000', show_default=True, help='cv_matcher server URL')
+@click.option('--concurrency', default='1,4,16,64', show_default=True, help='Comma-separated concurrency levels')
+@click.option('--requests', type=click.IntRange(min=1), default=64, show_default=True, help='Requests per level')
+@click.option('--unique/--no-unique', default=True, show_default=True, help='Make every resume unique')
+@click.option('--timeout', type=float, default=300, show_default=True, help='Per-request timeout in seconds')
+@click.option('--output', type=click.Path(path_type=Path), help='Save results as JSON')
+@click.option('--baseline', type=click.Path(exists=True, path_type=Path), help='Compare with saved results')
+def main(
+    url: str,
+    concurrency: str,
+    requests: int,
+    unique: bool,
+    timeout: float,
+    output: Optional[Path],
+    baseline: Optional[Path],
+):
+    """Load-test the /analyze_resume endpoint of a running server."""
+    levels = [int(level) for level in concurrency.split(',')]
+    results = asyncio.run(run_load(url, levels, requests, unique, timeout))
+
+    print_results(results, load_results(baseline) if baseline else None)
+    if output:
+        save_results(results, output)
+
+
+if __name__ == "__main__":
+    main()
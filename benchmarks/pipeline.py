@@ -0,0 +1,174 @@
+"""
+Benchmark the analysis pipeline against a synthetic provider.
+
+    python -m benchmarks.pipeline --target service --concurrency 1,8,32 --requests 64
+
+With --archive the synthetic provider is replaced by responses recorded with LLM_ARCHIVE_MODE=record:
+
+    python -m benchmarks.pipeline --target service --archive data/llm_archive.jsonl --latency-scale 0
+"""
+
+import asyncio
+import itertools
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Union
+from unittest.mock import patch
+
+import click
+import httpx
+
+from benchmarks.common import (
+    BenchmarkResult,
+    LoopLagMonitor,
+    load_corpus,
+    load_results,
+    print_results,
+    quiet_logging,
+    save_results,
+)
+from benchmarks.fake_client import LATENCY_DISTRIBUTIONS, FakeAIClient, LatencyModel
+from src.analysis import JobAnalyzer
+from src.client import AIClient
+from src.entities import ArchiveMode, ModelType
+from src.interfaces import AIClientInterface
+from src.recording import ProviderArchive
+from src.services import ResumeAnalysisService
+
+TARGETS = ("analyzer", "service", "api")
+
+
+async def run_level(
+    name: str, concurrency: int, requests: int, call: Callable[[int], Awaitable[object]]
+) -> BenchmarkResult:
+    """Issue `requests` calls with at most `concurrency` in flight and measure them."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def measure(index: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            started_at = time.perf_counter()
+            try:
+                await call(index)
+            except Exception:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started_at)
+
+    async with LoopLagMonitor() as monitor:
+        started_at = time.perf_counter()
+        await asyncio.gather(*(measure(index) for index in range(requests)))
+        duration = time.perf_counter() - started_at
+
+    return BenchmarkResult.from_measurements(name, concurrency, latencies, errors, duration, monitor.lags)
+
+
+async def create_target(target: str, client: AIClientInterface) -> Callable[[int], Awaitable[object]]:
+    """Build the callable exercised by the benchmark, cycling through the corpus."""
+    resumes, jobs = load_corpus()
+    pairs = list(itertools.product(resumes, jobs))
+
+    if target == "analyzer":
+        analyzer = JobAnalyzer(client)
+        requirements = [await analyzer.extract_job_requirements(job) for job in jobs]
+        prepared = list(itertools.product(resumes, zip(jobs, requirements)))
+
+        async def call(index: int):
+            resume_text, (job_description, job_requirements) = prepared[index % len(prepared)]
+            return await analyzer.match_resume(resume_text, job_description, job_requirements)
+
+        return call
+
+    if target == "service":
+        service = ResumeAnalysisService(client)
+
+        async def call(index: int):
+            resume_text, job_description = pairs[index % len(pairs)]
+            return await service.analyze_resume(resume_text, job_description)
+
+        return call
+
+    from src.server import app
+
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+
+    async def call(index: int):
+        resume_text, job_description = pairs[index % len(pairs)]
+        response = await http_client.post(
+            "/analyze_resume",
+            files={
+                "resume_file": ("resume.md", resume_text.encode(), "text/markdown"),
+                "job_description_file": ("job.txt", job_description.encode(), "text/plain"),
+            },
+        )
+        response.raise_for_status()
+        return response
+
+    return call
+
+
+async def run_benchmark(
+    target: str, concurrency_levels: List[int], requests: int, client: AIClientInterface
+) -> List[BenchmarkResult]:
+    call = await create_target(target, client)
+    return [await run_level(target, concurrency, requests, call) for concurrency in concurrency_levels]
+
+
+@click.command()
+@click.option('--target', type=click.Choice(TARGETS), default='service', show_default=True)
+@click.option('--concurrency', default='1,4,16,64', show_default=True, help='Comma-separated concurrency levels')
+@click.option('--requests', type=click.IntRange(min=1), default=64, show_default=True, help='Requests per level')
+@click.option('--latency', type=click.Choice(LATENCY_DISTRIBUTIONS), default='lognormal', show_default=True)
+@click.option('--latency-median', type=float, default=0.05, show_default=True, help='Seconds per provider call')
+@click.option('--latency-spread', type=float, default=0.5, show_default=True)
+@click.option('--error-rate', type=click.FloatRange(0, 1), default=0.0, show_default=True)
+@click.option('--response-words', type=int, default=300, show_default=True)
+@click.option('--seed', type=int, default=42, show_default=True)
+@click.option(
+    '--archive', type=click.Path(exists=True, path_type=Path), help='Replay recorded provider responses instead'
+)
+@click.option('--latency-scale', type=float, default=1.0, show_default=True, help='Replayed latency multiplier')
+@click.option('--output', type=click.Path(path_type=Path), help='Save results as JSON')
+@click.option('--baseline', type=click.Path(exists=True, path_type=Path), help='Compare with saved results')
+def main(
+    target: str,
+    concurrency: str,
+    requests: int,
+    latency: str,
+    latency_median: float,
+    latency_spread: float,
+    error_rate: float,
+    response_words: int,
+    seed: int,
+    archive: Optional[Path],
+    latency_scale: float,
+    output: Optional[Path],
+    baseline: Optional[Path],
+):
+    """Measure throughput, latency percentiles and event-loop lag of the analysis pipeline."""
+    quiet_logging()
+    client: Union[AIClient, FakeAIClient]
+    if archive:
+        replay = ProviderArchive(archive, mode=ArchiveMode.REPLAY, latency_scale=latency_scale)
+        client = AIClient(ModelType.OPENAI, archive=replay)
+    else:
+        client = FakeAIClient(
+            latency=LatencyModel(latency, latency_median, latency_spread),
+            error_rate=error_rate,
+            response_words=response_words,
+            seed=seed,
+        )
+    levels = [int(level) for level in concurrency.split(',')]
+
+    with patch("src.routers.AIClient", lambda *args, **kwargs: client):
+        results = asyncio.run(run_benchmark(target, levels, requests, client))
+
+    print_results(results, load_results(baseline) if baseline else None)
+    if output:
+        save_results(results, output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Compare encoders on realistic DetailedMatchResult and JobRequirements payloads.
+
+    python -m benchmarks.serialization --count 1000 --repeat 5 --output serialization.json
+"""
+
+import json
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import click
+from pydantic import BaseModel, TypeAdapter
+
+from benchmarks.fake_client import WORDS
+from src.analysis import RedFlagAnalyzer, calculate_overall_score, create_scoring_criteria
+from src.entities import ContactInfo, DetailedMatchResult, Emphasis, JobRequirements, Location
+from src.serialization import JSON_FORMAT, MSGPACK_FORMAT, dumps, is_available, loads
+
+
+@dataclass
+class SerializationResult:
+    payload: str
+    encoder: str
+    count: int
+    size: int
+    """Encoded bytes of the whole list."""
+    encode: float
+    """Median seconds to encode the list of models."""
+    render: Optional[float]
+    """Median seconds to encode the list once dumped to plain data, the only step left to a response class."""
+    decode: float
+    """Median seconds to decode the list back into models."""
+
+
+def words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def make_job_requirements(rng: random.Random) -> JobRequirements:
+    return JobRequirements(
+        required_experience_years=rng.randint(1, 10),
+        required_education_level=rng.choice(["Bachelor's", "Master's", "PhD"]),
+        required_skills=[words(rng, 2) for _ in range(8)],
+        optional_skills=[words(rng, 2) for _ in range(5)],
+        certifications_preferred=[words(rng, 3) for _ in range(2)],
+        soft_skills=[words(rng, 1) for _ in range(4)],
+        keywords_to_match=[words(rng, 1) for _ in range(12)],
+        location=Location(country="Germany", city="Berlin"),
+        emphasis=Emphasis(),
+    )
+
+
+def make_match_result(rng: random.Random) -> DetailedMatchResult:
+    """Shaped like a real analysis: six criteria, a paragraph of match reasons, contact details."""
+    criteria = create_scoring_criteria(make_job_requirements(rng))
+    for criterion in criteria:
+        criterion.score = rng.randint(0, 100)
+    return DetailedMatchResult(
+        overall_score=calculate_overall_score(criteria),
+        criteria_scores=criteria,
+        match_reasons=words(rng, 120),
+        red_flags=RedFlagAnalyzer().analyze(criteria),
+        website="https://example.com",
+        contact=ContactInfo(website="https://example.com", email="jane@example.com", links=["https://github.com/jane"]),
+    )
+
+
+Encoder = Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]
+
+
+def get_encoders() -> Dict[str, Encoder]:
+    """Encoder name -> (plain data to bytes, bytes to plain data); pydantic is measured separately."""
+    encoders: Dict[str, Encoder] = {
+        "stdlib json": (lambda data: json.dumps(data).encode(), json.loads),
+        "orjson": (lambda data: dumps(data, JSON_FORMAT), lambda data: loads(data, JSON_FORMAT)),
+    }
+    if is_available(MSGPACK_FORMAT):
+        encoders["msgpack"] = (lambda data: dumps(data, MSGPACK_FORMAT), lambda data: loads(data, MSGPACK_FORMAT))
+    return encoders
+
+
+def timed(function: Callable[[], Any], repeat: int) -> Tuple[Any, float]:
+    times = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        value = function()
+        times.append(time.perf_counter() - started_at)
+    return value, statistics.median(times)
+
+
+def measure(payload: str, items: List[BaseModel], repeat: int) -> List[SerializationResult]:
+    adapter = TypeAdapter(List[type(items[0])])
+    encoded, encode = timed(lambda: adapter.dump_json(items), repeat)
+    decoded, decode = timed(lambda: adapter.validate_json(encoded), repeat)
+    assert decoded == items, f"pydantic does not round-trip {payload}"
+    results = [SerializationResult(payload, "pydantic", len(items), len(encoded), encode, None, decode)]
+
+    for name, (to_bytes, from_bytes) in get_encoders().items():
+        encoded, encode = timed(lambda: to_bytes(adapter.dump_python(items, mode="json")), repeat)
+        plain = adapter.dump_python(items, mode="json")
+        _, render = timed(lambda: to_bytes(plain), repeat)
+        decoded, decode = timed(lambda: adapter.validate_python(from_bytes(encoded)), repeat)
+        assert decoded == items, f"{name} does not round-trip {payload}"
+        results.append(SerializationResult(payload, name, len(items), len(encoded), encode, render, decode))
+    return results
+
+
+@click.command()
+@click.option('--count', type=click.IntRange(min=1), default=1000, show_default=True, help='Payloads per list')
+@click.option('--repeat', type=click.IntRange(min=1), default=5, show_default=True)
+@click.option('--seed', type=int, default=0, show_default=True)
+@click.option('--output', type=click.Path(path_type=Path), help='Save results as JSON')
+def main(count: int, repeat: int, seed: int, output: Optional[Path]):
+    """Report encode/decode time and size of result and requirement lists per encoder."""
+    rng = random.Random(seed)
+    payloads = {
+        "DetailedMatchResult": [make_match_result(rng) for _ in range(count)],
+        "JobRequirements": [make_job_requirements(rng) for _ in range(count)],
+    }
+    click.echo(f"{'payload':<22}{'encoder':<14}{'size KB':>10}{'encode ms':>12}{'render ms':>12}{'decode ms':>12}")
+    results = []
+    for payload, items in payloads.items():
+        for result in measure(payload, items, repeat):
+            results.append(result)
+            render = f"{result.render * 1000:.1f}" if result.render is not None else "-"
+            click.echo(
+                f"{payload:<22}{result.encoder:<14}{result.size / 1024:>10.1f}"
+                f"{result.encode * 1000:>12.1f}{render:>12}{result.decode * 1000:>12.1f}"
+            )
+
+    if output:
+        output.write_text(json.dumps([asdict(result) for result in results], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Local stand-in for the OpenAI chat-completions and Anthropic messages APIs.
+
+    python -m benchmarks.stub_server --port 9000 --latency-median 0.5 --max-concurrency 64
+    OPENAI_BASE_URL=http://localhost:9000/v1 OPENAI_API_KEY=stub PYTHONPATH=. python src/manage.py start-server
+
+The OpenAI files and batches endpoints are served too, completing each batch `--batch-latency` seconds after
+it was created, so batch mode can be exercised offline.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import click
+import uvicorn
+from fastapi import FastAPI, File, Form, HTTPException, Request, Response, UploadFile
+from fastapi.responses import JSONResponse
+
+from benchmarks.fake_client import LATENCY_DISTRIBUTIONS, WORDS, LatencyModel
+
+
+@dataclass
+class StubConfig:
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    response_words: int = 300
+    max_concurrency: int = 0
+    """Requests in flight above this limit get 429; 0 disables the limit."""
+    rate_limit: float = 0.0
+    """Requests per second allowed by a token bucket; 0 disables the limit."""
+    seed: Optional[int] = None
+    batch_latency: float = 0.0
+    """Seconds after its creation at which a batch reports completed."""
+
+
+@dataclass
+class Throttle:
+    max_concurrency: int
+    rate_limit: float
+    in_flight: int = 0
+    _tokens: float = 0.0
+    _updated_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self):
+        self._tokens = self.rate_limit
+
+    def acquire(self) -> bool:
+        if self.max_concurrency and self.in_flight >= self.max_concurrency:
+            return False
+        if self.rate_limit:
+            now = time.monotonic()
+            self._tokens = min(self._tokens + (now - self._updated_at) * self.rate_limit, self.rate_limit)
+            self._updated_at = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+
+def count_tokens(text: str) -> int:
+    return max(len(text) // 4, 1)
+
+
+def fake_from_schema(schema: Dict[str, Any], rng: random.Random, defs: Optional[Dict[str, Any]] = None) -> Any:
+    """Generate a value that validates against a JSON schema as produced by pydantic."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return fake_from_schema(defs[schema["$ref"].split("/")[-1]], rng, defs)
+    if "anyOf" in schema:
+        return fake_from_schema(schema["anyOf"][0], rng, defs)
+
+    schema_type = schema.get("type")
+    if schema_type == "object":
+        return {name: fake_from_schema(prop, rng, defs) for name, prop in schema.get("properties", {}).items()}
+    if schema_type == "array":
+        return [fake_from_schema(schema.get("items", {}), rng, defs) for _ in range(rng.randint(1, 4))]
+    if schema_type == "integer":
+        return rng.randint(schema.get("minimum", 0), schema.get("maximum", 10))
+    if schema_type == "number":
+        return rng.uniform(schema.get("minimum", 0), schema.get("maximum", 10))
+    if schema_type == "boolean":
+        return rng.random() < 0.5
+    if schema_type == "null":
+        return None
+    return rng.choice(WORDS)
+
+
+def fake_text(prompt: str, rng: random.Random, response_words: int) -> str:
+    """Answer like the provider would for each cv_matcher prompt."""
+    if "integer score from 0 to 100" in prompt:
+        return str(rng.randint(0, 100))
+    if "website URL" in prompt:
+        return "https://example.com"
+    return " ".join(rng.choice(WORDS) for _ in range(response_words))
+
+
+def completion_prompt(body: Dict[str, Any]) -> str:
+    return "\n".join(_message_text(message.get("content")) for message in body["messages"])
+
+
+def build_chat_completion(body: Dict[str, Any], rng: random.Random, config: StubConfig) -> Dict[str, Any]:
+    """Chat completion answering with a tool call, a JSON schema response format or plain text."""
+    prompt = completion_prompt(body)
+    tools = body.get("tools") or []
+    response_format = body.get("response_format") or {}
+    message: Dict[str, Any] = {"role": "assistant", "content": None}
+    if tools:
+        function = tools[0]["function"]
+        arguments = json.dumps(fake_from_schema(function["parameters"], rng))
+        message["tool_calls"] = [
+            {
+                "id": f"call_{uuid.uuid4().hex}",
+                "type": "function",
+                "function": {"name": function["name"], "arguments": arguments},
+            }
+        ]
+        output = arguments
+    elif response_format.get("type") == "json_schema":
+        message["content"] = output = json.dumps(fake_from_schema(response_format["json_schema"]["schema"], rng))
+    else:
+        message["content"] = output = fake_text(prompt, rng, config.response_words)
+
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body["model"],
+        "choices": [
+            {"index": 0, "message": message, "finish_reason": "tool_calls" if tools else "stop"},
+        ],
+        "usage": {
+            "prompt_tokens": count_tokens(prompt),
+            "completion_tokens": count_tokens(output),
+            "total_tokens": count_tokens(prompt) + count_tokens(output),
+        },
+    }
+
+
+def create_stub_app(config: StubConfig) -> FastAPI:
+    app = FastAPI(title="provider stub")
+    throttle = Throttle(config.max_concurrency, config.rate_limit)
+    latency_rng = random.Random(config.seed)
+
+    async def respond(prompt: str, build) -> JSONResponse:
+        if not throttle.acquire():
+            return JSONResponse(
+                {"error": {"type": "rate_limit_error", "message": "Stub provider is throttling"}},
+                status_code=429,
+                headers={"retry-after": "1"},
+            )
+        try:
+            await asyncio.sleep(config.latency.sample(latency_rng))
+            return JSONResponse(build(random.Random(hashlib.sha256(prompt.encode()).digest())))
+        finally:
+            throttle.release()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        return await respond(completion_prompt(body), lambda rng: build_chat_completion(body, rng, config))
+
+    files: Dict[str, bytes] = {}
+    batches: Dict[str, Dict[str, Any]] = {}
+
+    @app.post("/v1/files")
+    async def upload_file(file: UploadFile = File(...), purpose: str = Form(...)):
+        file_id = f"file-{uuid.uuid4().hex}"
+        files[file_id] = await file.read()
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(files[file_id]),
+            "created_at": int(time.time()),
+            "filename": file.filename,
+            "purpose": purpose,
+            "status": "processed",
+        }
+
+    @app.get("/v1/files/{file_id}/content")
+    async def file_content(file_id: str):
+        if file_id not in files:
+            raise HTTPException(status_code=404, detail="No such file")
+        return Response(files[file_id], media_type="application/jsonl")
+
+    @app.post("/v1/batches")
+    async def create_batch(request: Request):
+        body = await request.json()
+        if body["input_file_id"] not in files:
+            raise HTTPException(status_code=404, detail="No such file")
+        batch_id = f"batch_{uuid.uuid4().hex}"
+        batches[batch_id] = {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": body["endpoint"],
+            "input_file_id": body["input_file_id"],
+            "completion_window": body["completion_window"],
+            "status": "in_progress",
+            "created_at": int(time.time()),
+            "output_file_id": None,
+            "error_file_id": None,
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+        }
+        return batches[batch_id]
+
+    @app.get("/v1/batches/{batch_id}")
+    async def retrieve_batch(batch_id: str):
+        batch = batches.get(batch_id)
+        if batch is None:
+            raise HTTPException(status_code=404, detail="No such batch")
+        if batch["status"] == "in_progress" and time.time() - batch["created_at"] >= config.batch_latency:
+            complete_batch(batch)
+        return batch
+
+    def complete_batch(batch: Dict[str, Any]) -> None:
+        """Answer every line of the input file the way the chat-completions endpoint would."""
+        output = []
+        for line in files[batch["input_file_id"]].decode().splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            rng = random.Random(hashlib.sha256(completion_prompt(request["body"]).encode()).digest())
+            response = {
+                "status_code": 200,
+                "request_id": uuid.uuid4().hex,
+                "body": build_chat_completion(request["body"], rng, config),
+            }
+            output.append(
+                {
+                    "id": f"batch_req_{uuid.uuid4().hex}",
+                    "custom_id": request["custom_id"],
+                    "response": response,
+                    "error": None,
+                }
+            )
+        output_file_id = f"file-{uuid.uuid4().hex}"
+        files[output_file_id] = "".join(json.dumps(line) + "\n" for line in output).encode()
+        batch.update(
+            status="completed",
+            output_file_id=output_file_id,
+            completed_at=int(time.time()),
+            request_counts={"total": len(output), "completed": len(output), "failed": 0},
+        )
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        prompt = "\n".join(
+            [_message_text(body.get("system"))] + [_message_text(m["content"]) for m in body["messages"]]
+        )
+        tools = body.get("tools") or []
+
+        def build(rng: random.Random) -> Dict[str, Any]:
+            if tools:
+                tool_input = fake_from_schema(tools[0]["input_schema"], rng)
+                content = [
+                    {
+                        "type": "tool_use",
+                        "id": f"toolu_{uuid.uuid4().hex}",
+                        "name": tools[0]["name"],
+                        "input": tool_input,
+                    }
+                ]
+                output = json.dumps(tool_input)
+            else:
+                output = fake_text(prompt, rng, config.response_words)
+                content = [{"type": "text", "text": output}]
+
+            return {
+                "id": f"msg_{uuid.uuid4().hex}",
+                "type": "message",
+                "role": "assistant",
+                "model": body["model"],
+                "content": content,
+                "stop_reason": "tool_use" if tools else "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": count_tokens(prompt), "output_tokens": count_tokens(output)},
+            }
+
+        return await respond(prompt, build)
+
+    return app
+
+
+def _message_text(content: Any) -> str:
+    """Flatten string or content-block message content to text."""
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    blocks: List[Dict[str, Any]] = content
+    return "".join(block.get("text", "") for block in blocks if isinstance(block, dict))
+
+
+@click.command()
+@click.option('--host', default='127.0.0.1', show_default=True)
+@click.option('--port', type=int, default=9000, show_default=True)
+@click.option('--latency', type=click.Choice(LATENCY_DISTRIBUTIONS), default='lognormal', show_default=True)
+@click.option('--latency-median', type=float, default=0.5, show_default=True, help='Seconds per request')
+@click.option('--latency-spread', type=float, default=0.5, show_default=True)
+@click.option('--response-words', type=int, default=300, show_default=True)
+@click.option('--max-concurrency', type=int, default=0, show_default=True, help='429 above this many in flight')
+@click.option('--rate-limit', type=float, default=0.0, show_default=True, help='Requests per second before 429')
+@click.option('--batch-latency', type=float, default=5.0, show_default=True, help='Seconds until a batch completes')
+def main(
+    host: str,
+    port: int,
+    latency: str,
+    latency_median: float,
+    latency_spread: float,
+    response_words: int,
+    max_concurrency: int,
+    rate_limit: float,
+    batch_latency: float,
+):
+    """Serve OpenAI- and Anthropic-compatible endpoints with synthetic latency and throttling."""
+    config = StubConfig(
+        latency=LatencyModel(latency, latency_median, latency_spread),
+        response_words=response_words,
+        max_concurrency=max_concurrency,
+        rate_limit=rate_limit,
+        batch_latency=batch_latency,
+    )
+    uvicorn.run(create_stub_app(config), host=host, port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
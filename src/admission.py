@@ -0,0 +1,129 @@
+import asyncio
+import math
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Optional
+
+from src.conf import settings
+from src.logger import create_logger
+from src.metrics import record_admission_rejection, record_admission_state, record_admission_wait
+
+logger = create_logger(__name__)
+
+DURATION_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """An analysis was turned away before doing any work; the client should retry after `retry_after` seconds."""
+
+    def __init__(self, reason: str, retry_after: float, detail: str):
+        super().__init__(detail)
+        self.reason = reason
+        self.retry_after = retry_after
+        self.detail = detail
+
+    @property
+    def status_code(self) -> int:
+        return 429 if self.reason == "key_quota" else 503
+
+
+@dataclass
+class AdmissionController:
+    """
+    Bounds the analyses a server process runs at once and turns requests away instead of queueing them blindly.
+
+    At most `max_concurrency` analyses run; the rest wait for a slot. A request whose estimated wait exceeds
+    `max_wait` is rejected at once with the estimate as its retry delay, before any tokens are spent on it.
+    The estimate assumes each slot frees up once per average analysis duration, a moving average seeded with
+    `initial_duration`. Each API key may have at most `key_concurrency` analyses running or waiting, so one
+    busy client cannot take the whole capacity; requests sent without a key are bounded only by the overall
+    limits. State is per process: with several uvicorn workers each admits its own share.
+    """
+
+    max_concurrency: int = field(default_factory=lambda: settings.admission_max_concurrency)
+    max_wait: float = field(default_factory=lambda: settings.admission_max_wait)
+    key_concurrency: int = field(default_factory=lambda: settings.admission_key_concurrency)
+    """Analyses one API key may have running or waiting; 0 disables the quota. Keyless requests are exempt."""
+    initial_duration: float = field(default_factory=lambda: settings.admission_initial_duration)
+    running: int = field(default=0, init=False)
+    queued: int = field(default=0, init=False)
+    average_duration: float = field(default=0.0, init=False)
+    _per_key: Dict[str, int] = field(default_factory=lambda: defaultdict(int), init=False, repr=False)
+    _slots: asyncio.Semaphore = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.average_duration = self.initial_duration
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+    def estimate_wait(self) -> float:
+        """Seconds a request arriving now would wait for a slot."""
+        if self.running < self.max_concurrency and not self.queued:
+            return 0.0
+        return math.ceil((self.queued + 1) / self.max_concurrency) * self.average_duration
+
+    def check(self, key: Optional[str] = None) -> None:
+        """Raise AdmissionRejected if a request for `key` would not be admitted now."""
+        if key and self.key_concurrency and self._per_key.get(key, 0) >= self.key_concurrency:
+            self._reject(
+                "key_quota",
+                self.average_duration,
+                f"API key already has {self._per_key[key]} analyses in progress, the limit is {self.key_concurrency}",
+            )
+        wait = self.estimate_wait()
+        if wait > self.max_wait:
+            self._reject(
+                "overloaded", wait, f"Server is at capacity, estimated wait {wait:.0f}s exceeds {self.max_wait:.0f}s"
+            )
+
+    @asynccontextmanager
+    async def admit(self, key: Optional[str] = None) -> AsyncIterator[None]:
+        """Hold an analysis slot for the block, waiting for one if needed; rejects like `check`."""
+        self.check(key)
+        if key:
+            self._per_key[key] += 1
+        self.queued += 1
+        self._record_state()
+        queued_at = time.monotonic()
+        started = False
+        try:
+            async with self._slots:
+                self.queued -= 1
+                self.running += 1
+                started = True
+                self._record_state()
+                record_admission_wait(time.monotonic() - queued_at)
+                started_at = time.monotonic()
+                try:
+                    yield
+                finally:
+                    self.running -= 1
+                    duration = time.monotonic() - started_at
+                    self.average_duration += DURATION_SMOOTHING * (duration - self.average_duration)
+        finally:
+            if not started:
+                # Cancelled, e.g. by a client disconnect, while still waiting for a slot
+                self.queued -= 1
+            if key:
+                self._per_key[key] -= 1
+                if not self._per_key[key]:
+                    del self._per_key[key]
+            self._record_state()
+
+    def _reject(self, reason: str, retry_after: float, detail: str) -> None:
+        logger.warning(f"Rejecting analysis: {detail}")
+        record_admission_rejection(reason)
+        raise AdmissionRejected(reason, retry_after, detail)
+
+    def _record_state(self) -> None:
+        record_admission_state(self.running, self.queued)
+
+
+@lru_cache(maxsize=None)
+def get_admission_controller() -> Optional[AdmissionController]:
+    """Controller configured through settings, or None when admission control is disabled."""
+    if not settings.admission_enabled:
+        return None
+    return AdmissionController()
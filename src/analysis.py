@@ -1,15 +1,46 @@
 import re
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
-
-from src.entities import DetailedMatchResult, JobRequirements, ScoringCriterion
+from typing import AsyncIterator, Dict, List, Optional
+
+from src.entities import (
+    AnalysisEvent,
+    AnalysisEventType,
+    ContactInfo,
+    DetailedMatchResult,
+    Emphasis,
+    JobRequirements,
+    Location,
+    RankedMatchResult,
+    RedFlagLevel,
+    ScoringCriterion,
+    UnifiedResume,
+)
 from src.interfaces import AIClientInterface
-from src.logger import create_logger
-from src.promts import EXTRACT_REQUIREMENTS_PROMT, MATCH_REASONS_PROMT, RESUME_INIFIRED_PROMT, RESUME_WEBSITE_PROMT
+from src.logger import TimeLogger, create_logger
+from src.promts import (
+    ANALYSIS_CONTEXT_PROMT,
+    CRITERION_EVALUATION_PROMT,
+    EXTRACT_LOCATION_PROMT,
+    EXTRACT_REQUIREMENTS_PROMT,
+    MATCH_REASONS_PROMT,
+    RESUME_CONTACT_PROMT,
+    RESUME_INIFIRED_PROMT,
+    RESUME_WEBSITE_PROMT,
+)
 
 logger = create_logger(__name__)
 
 
+CRITERION_WEIGHT_FIELDS = {
+    'language_proficiency': 'language_proficiency_weight',
+    'education_level': 'education_weight',
+    'experience': 'experience_weight',
+    'technical_skills': 'technical_skills_weight',
+    'certifications': 'certifications_weight',
+    'soft_skills': 'soft_skills_weight',
+}
+
+
 def create_scoring_criteria(job_requirements: JobRequirements) -> List[ScoringCriterion]:
     """Create a list of scoring criteria based on job requirements."""
     return [
@@ -62,17 +93,79 @@ def create_scoring_criteria(job_requirements: JobRequirements) -> List[ScoringCr
     ]
 
 
+def calculate_overall_score(criteria: List[ScoringCriterion]) -> int:
+    """Weighted average of the criterion scores; unscored criteria count as 0."""
+    total_weight = sum(c.weight for c in criteria)
+    if total_weight <= 0:
+        return 0
+    return sum((c.score or 0) * c.weight for c in criteria) // total_weight
+
+
+def calculate_best_achievable_score(criteria: List[ScoringCriterion]) -> int:
+    """Overall score if every criterion not evaluated yet scored 100."""
+    total_weight = sum(c.weight for c in criteria)
+    if total_weight <= 0:
+        return 0
+    return sum((100 if c.score is None else c.score) * c.weight for c in criteria) // total_weight
+
+
+def reweight_result(result: DetailedMatchResult, emphasis: Emphasis) -> DetailedMatchResult:
+    """Apply new emphasis weights to a stored result, recomputing the overall score and red flags locally."""
+    criteria = [
+        (
+            criterion.model_copy(update={"weight": getattr(emphasis, CRITERION_WEIGHT_FIELDS[criterion.key])})
+            if criterion.key in CRITERION_WEIGHT_FIELDS
+            else criterion
+        )
+        for criterion in result.criteria_scores
+    ]
+    return result.model_copy(
+        update={
+            "criteria_scores": criteria,
+            "overall_score": calculate_overall_score(criteria),
+            "red_flags": RedFlagAnalyzer().analyze(criteria),
+        }
+    )
+
+
+def rerank_results(results: List[DetailedMatchResult], emphasis: Emphasis) -> List[RankedMatchResult]:
+    """Re-weight stored results and order them by the new overall score, best first."""
+    reweighted = [reweight_result(result, emphasis) for result in results]
+    order = sorted(range(len(reweighted)), key=lambda index: reweighted[index].overall_score, reverse=True)
+    return [RankedMatchResult(rank=rank, index=index, result=reweighted[index]) for rank, index in enumerate(order, 1)]
+
+
+def select_shortlist(
+    results: Dict[int, DetailedMatchResult], size: Optional[int] = None, min_score: Optional[int] = None
+) -> List[int]:
+    """Keys of the best results scoring at least `min_score`, at most `size` of them, best first."""
+    ranked = sorted(results, key=lambda key: results[key].overall_score, reverse=True)
+    if min_score is not None:
+        ranked = [key for key in ranked if results[key].overall_score >= min_score]
+    return ranked if size is None else ranked[:size]
+
+
+def create_analysis_context(resume_text: str, job_requirements: JobRequirements) -> str:
+    """Build the resume and job block shared as a byte-identical prefix by all per-resume prompts."""
+    return ANALYSIS_CONTEXT_PROMT.format(
+        resume_text=resume_text,
+        job_requirements=job_requirements.model_dump_json(),
+    )
+
+
 @dataclass
 class ResumeProcessor:
     """Handles resume-related operations."""
 
     client: AIClientInterface
 
-    async def unify_resume(self, resume_text: str) -> str:
-        """Standardize the resume format."""
+    async def parse_resume(self, resume_text: str) -> UnifiedResume:
+        """Standardize the resume format and extract contact details in a single call."""
         return await self.client.run(
-            prompt=RESUME_INIFIRED_PROMT.format(resume_text=resume_text),
-            max_tokens=4092,
+            prompt=RESUME_INIFIRED_PROMT.format(resume_text=resume_text) + RESUME_CONTACT_PROMT,
+            max_tokens=4500,
+            result_type=UnifiedResume,
+            stage="unify",
         )
 
     async def get_website(self, resume_text: str) -> str:
@@ -80,6 +173,7 @@ class ResumeProcessor:
         return await self.client.run(
             prompt=RESUME_WEBSITE_PROMT.format(resume_text=resume_text),
             max_tokens=100,
+            stage="website",
         )
 
 
@@ -93,34 +187,24 @@ class CriteriaEvaluator:
         self, criterion: ScoringCriterion, resume_text: str, job_requirements: JobRequirements
     ) -> int:
         """Evaluate a single criterion and return a score."""
-        prompt = self._create_evaluation_prompt(criterion, resume_text, job_requirements)
+        prompt = self._create_evaluation_prompt(criterion)
         try:
-            response = await self.client.run(prompt)
+            response = await self.client.run(
+                prompt,
+                prompt_prefix=create_analysis_context(resume_text, job_requirements),
+                stage=criterion.key,
+            )
             return self._parse_score(response, criterion.name)
         except Exception as e:
             logger.error(f"Error evaluating criterion {criterion.name}: {str(e)}")
             return 0
 
-    def _create_evaluation_prompt(
-        self, criterion: ScoringCriterion, resume_text: str, job_requirements: JobRequirements
-    ) -> str:
-        return f"""
-        Evaluate the candidate's resume for the criterion: "{criterion.name}"
-        
-        Criterion Description: {criterion.description}
-        
-        Factors to consider:
-        {', '.join(criterion.factors)}
-        
-        Job Requirements:
-        {job_requirements.model_dump_json()}
-        
-        Resume:
-        {resume_text}
-        
-        Provide your evaluation as an integer score from 0 to 100.
-        Only return the integer score, no explanation needed.
-        """
+    def _create_evaluation_prompt(self, criterion: ScoringCriterion) -> str:
+        return CRITERION_EVALUATION_PROMT.format(
+            criterion_name=criterion.name,
+            criterion_description=criterion.description,
+            criterion_factors=', '.join(criterion.factors),
+        )
 
     def _parse_score(self, response: str, criterion_name: str) -> int:
         try:
@@ -134,19 +218,30 @@ class CriteriaEvaluator:
 class RedFlagAnalyzer:
     """Analyzes and categorizes red flags in the evaluation."""
 
+    @staticmethod
+    def level(criterion: ScoringCriterion) -> RedFlagLevel:
+        """Red flag level of one criterion from its score and weight."""
+        if criterion.score is None:
+            return RedFlagLevel.NONE
+        if criterion.score < 30 and criterion.weight >= 30:
+            return RedFlagLevel.HIGH
+        if criterion.score < 50 and criterion.weight >= 20:
+            return RedFlagLevel.MEDIUM
+        if criterion.score < 70:
+            return RedFlagLevel.LOW
+        return RedFlagLevel.NONE
+
     def analyze(self, criteria: List[ScoringCriterion]) -> Dict[str, List[str]]:
         """Identify red flags based on criteria scores and weights."""
         red_flags = {"low": [], "medium": [], "high": []}
 
         for criterion in criteria:
-            if criterion.score is None:
-                continue
-
-            if criterion.score < 30 and criterion.weight >= 30:
+            level = self.level(criterion)
+            if level is RedFlagLevel.HIGH:
                 red_flags["high"].append(f"Low {criterion.name}")
-            elif criterion.score < 50 and criterion.weight >= 20:
+            elif level is RedFlagLevel.MEDIUM:
                 red_flags["medium"].append(f"Below average {criterion.name}")
-            elif criterion.score < 70:
+            elif level is RedFlagLevel.LOW:
                 red_flags["low"].append(f"Improvement needed in {criterion.name}")
 
         return red_flags
@@ -166,15 +261,25 @@ class JobAnalyzer:
         self._criteria_evaluator = CriteriaEvaluator(self.client)
         self._red_flag_analyzer = RedFlagAnalyzer()
 
-    async def unify_resume(self, resume_text: str) -> str:
-        """Standardize the resume format."""
-        return await self._resume_processor.unify_resume(resume_text)
+    async def parse_resume(self, resume_text: str) -> UnifiedResume:
+        """Standardize the resume format and extract contact details in a single call."""
+        return await self._resume_processor.parse_resume(resume_text)
 
     async def extract_job_requirements(self, job_description: str) -> Optional[JobRequirements]:
         """Extract structured requirements from job description."""
         return await self.client.run(
             prompt=EXTRACT_REQUIREMENTS_PROMT.format(job_description=job_description),
             result_type=JobRequirements,
+            stage="extract_requirements",
+        )
+
+    async def extract_job_location(self, job_description: str) -> Optional[Location]:
+        """Extract only the location of a job, for postings that otherwise reuse another's requirements."""
+        return await self.client.run(
+            prompt=EXTRACT_LOCATION_PROMT.format(job_description=job_description),
+            max_tokens=100,
+            result_type=Location,
+            stage="extract_location",
         )
 
     async def match_resume(
@@ -182,38 +287,93 @@ class JobAnalyzer:
         resume_text: str,
         job_description: str,
         job_requirements: JobRequirements,
+        contact: Optional[ContactInfo] = None,
+        min_score: Optional[int] = None,
     ) -> DetailedMatchResult:
         """Match a resume against job requirements and provide detailed analysis."""
+        async for event in self.match_resume_events(resume_text, job_description, job_requirements, contact, min_score):
+            pass
+        # The result is always the last event
+        return event.data
+
+    async def match_resume_events(
+        self,
+        resume_text: str,
+        job_description: str,
+        job_requirements: JobRequirements,
+        contact: Optional[ContactInfo] = None,
+        min_score: Optional[int] = None,
+    ) -> AsyncIterator[AnalysisEvent]:
+        """
+        Match a resume, yielding each criterion score and the match reasons as they land, then the result.
+
+        Contact details from `parse_resume` are reused; without them the website is looked up separately.
+        With `min_score`, criteria are evaluated heaviest first and evaluation stops once the candidate
+        cannot reach it even with full marks on the rest; those criteria are marked skipped and no match
+        reasons are generated.
+        """
         criteria = create_scoring_criteria(job_requirements)
-        total_weight = sum(c.weight for c in criteria)
 
         # Evaluate each criterion
-        for criterion in criteria:
-            criterion.score = await self._criteria_evaluator.evaluate_criterion(
-                criterion, resume_text, job_requirements
-            )
+        order = sorted(criteria, key=lambda c: c.weight, reverse=True) if min_score is not None else criteria
+        for position, criterion in enumerate(order):
+            async with TimeLogger(f"Evaluating {criterion.name}", stage=criterion.key):
+                criterion.score = await self._criteria_evaluator.evaluate_criterion(
+                    criterion, resume_text, job_requirements
+                )
+            yield AnalysisEvent(event=AnalysisEventType.CRITERION, data=criterion)
+
+            if min_score is not None and calculate_best_achievable_score(criteria) < min_score:
+                for remaining in order[position + 1 :]:
+                    remaining.skipped = True
+                break
 
         # Calculate overall score
-        overall_score = (
-            sum(criterion.score * criterion.weight for criterion in criteria) // total_weight if total_weight > 0 else 0
-        )
+        overall_score = calculate_overall_score(criteria)
+
+        if min_score is not None and calculate_best_achievable_score(criteria) < min_score:
+            skipped = [c.name for c in criteria if c.skipped]
+            logger.info(f"Candidate cannot reach {min_score}, skipped {', '.join(skipped) or 'match reasons'}")
+            yield AnalysisEvent(
+                event=AnalysisEventType.RESULT,
+                data=DetailedMatchResult(
+                    overall_score=overall_score,
+                    criteria_scores=criteria,
+                    match_reasons=f"Below the minimum score of {min_score}; the analysis was stopped early.",
+                    website=contact.website if contact is not None else None,
+                    red_flags=self._red_flag_analyzer.analyze(criteria),
+                    contact=contact,
+                ),
+            )
+            return
 
         # Generate match reasons
-        match_reasons = await self.client.run(
-            prompt=MATCH_REASONS_PROMT.format(
-                criteries=', '.join(f'{c.name}: {c.score}' for c in criteria),
-                resume_text=resume_text,
-                job_description=job_description,
-            ),
-        )
+        async with TimeLogger("Generating match reasons", stage="match_reasons"):
+            match_reasons = await self.client.run(
+                prompt=MATCH_REASONS_PROMT.format(
+                    criteries=', '.join(f'{c.name}: {c.score}' for c in criteria),
+                    job_description=job_description,
+                ),
+                prompt_prefix=create_analysis_context(resume_text, job_requirements),
+                stage="match_reasons",
+            )
+        yield AnalysisEvent(event=AnalysisEventType.MATCH_REASONS, data=match_reasons.strip())
 
-        website = await self._resume_processor.get_website(resume_text)
+        if contact is not None:
+            website = contact.website
+        else:
+            async with TimeLogger("Extracting website", stage="website"):
+                website = (await self._resume_processor.get_website(resume_text)).strip()
         red_flags = self._red_flag_analyzer.analyze(criteria)
 
-        return DetailedMatchResult(
-            overall_score=overall_score,
-            criteria_scores=criteria,
-            match_reasons=match_reasons.strip(),
-            website=website.strip(),
-            red_flags=red_flags,
+        yield AnalysisEvent(
+            event=AnalysisEventType.RESULT,
+            data=DetailedMatchResult(
+                overall_score=overall_score,
+                criteria_scores=criteria,
+                match_reasons=match_reasons.strip(),
+                website=website,
+                red_flags=red_flags,
+                contact=contact,
+            ),
         )
@@ -0,0 +1,284 @@
+import asyncio
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel
+from pydantic_ai.usage import Usage
+
+from src.client import DEFAULT_SYSTEM_PROMPT, AIClient, get_model_config
+from src.conf import settings
+from src.entities import ModelTier, ModelType
+from src.logger import create_logger
+from src.metrics import record_cache_hit, record_request_error, record_usage
+from src.recording import get_request_key
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = create_logger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+FINAL_BATCH_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+class BatchError(RuntimeError):
+    """A batch, or one request in it, did not produce a response."""
+
+
+def build_request_body(
+    model_name: str,
+    prompt: str,
+    system_prompt: str,
+    max_tokens: int,
+    temperature: float,
+    result_type: Optional[Type[BaseModel]] = None,
+) -> Dict[str, Any]:
+    """Chat-completions request body; structured results are asked for with a JSON schema response format."""
+    messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+    messages.append({"role": "user", "content": prompt})
+    body: Dict[str, Any] = {
+        "model": model_name,
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+    }
+    if result_type is not None:
+        body["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": result_type.__name__, "schema": result_type.model_json_schema()},
+        }
+    return body
+
+
+def parse_response_line(
+    line: Dict[str, Any], result_type: Optional[Type[BaseModel]] = None
+) -> Tuple[Union[str, BaseModel], Usage]:
+    """Result and usage of one line of a batch output file."""
+    response = line.get("response") or {}
+    if line.get("error") or response.get("status_code") != 200:
+        raise BatchError(f"Request {line.get('custom_id')} failed: {line.get('error') or response.get('body')}")
+    body = response["body"]
+    content = body["choices"][0]["message"]["content"] or ""
+    usage = body.get("usage") or {}
+    return (
+        result_type.model_validate_json(content) if result_type is not None else content,
+        Usage(
+            requests=1,
+            request_tokens=usage.get("prompt_tokens"),
+            response_tokens=usage.get("completion_tokens"),
+            total_tokens=usage.get("total_tokens"),
+        ),
+    )
+
+
+@dataclass
+class BatchRequest:
+    custom_id: str
+    stage: str
+    body: Dict[str, Any]
+    result_type: Optional[Type[BaseModel]]
+    future: asyncio.Future
+
+
+@dataclass
+class BatchRunner:
+    """
+    Collects requests into provider batch jobs instead of sending them one by one.
+
+    Requests are held until no new one has arrived for `collect_window` seconds, which is when every
+    analysis waits on the model. They are then written to one submission file per model and stage,
+    uploaded as batch jobs and polled every `poll_interval` seconds; each request's waiter resumes once
+    its batch completes, and the requests of the next stage make up the next round of batches.
+    Submission and output files are kept in `directory`.
+    """
+
+    client: "AsyncOpenAI"
+    directory: Path = field(default_factory=lambda: Path(settings.batch_dir))
+    collect_window: float = field(default_factory=lambda: settings.batch_collect_window)
+    poll_interval: float = field(default_factory=lambda: settings.batch_poll_interval)
+    max_requests: int = field(default_factory=lambda: settings.batch_max_requests)
+    """Requests per submission file; a round with more is split across several batches."""
+    run_id: str = field(default_factory=lambda: time.strftime("%Y%m%d-%H%M%S"))
+    _pending: Dict[str, BatchRequest] = field(default_factory=dict, init=False, repr=False)
+    _in_flight: Dict[str, BatchRequest] = field(default_factory=dict, init=False, repr=False)
+    _flusher: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+    _rounds: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        self.directory = Path(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def submit(
+        self, custom_id: str, stage: str, body: Dict[str, Any], result_type: Optional[Type[BaseModel]] = None
+    ) -> asyncio.Future:
+        """Queue a request for the next round; identical requests share one batch line and one future."""
+        existing = self._pending.get(custom_id) or self._in_flight.get(custom_id)
+        if existing is not None:
+            return existing.future
+        request = BatchRequest(custom_id, stage, body, result_type, asyncio.get_running_loop().create_future())
+        self._pending[custom_id] = request
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_when_idle())
+        return request.future
+
+    async def _flush_when_idle(self) -> None:
+        while self._pending:
+            queued = len(self._pending)
+            await asyncio.sleep(self.collect_window)
+            if len(self._pending) != queued:
+                continue
+            requests, self._pending = self._pending, {}
+            self._in_flight.update(requests)
+            try:
+                await self._run_round(list(requests.values()))
+            finally:
+                for custom_id in requests:
+                    self._in_flight.pop(custom_id, None)
+
+    async def _run_round(self, requests: List[BatchRequest]) -> None:
+        self._rounds += 1
+        groups: Dict[Tuple[str, str], List[BatchRequest]] = defaultdict(list)
+        for request in requests:
+            groups[(request.body["model"], request.stage)].append(request)
+
+        jobs = []
+        for (model_name, stage), group in groups.items():
+            for start in range(0, len(group), self.max_requests):
+                name = f"{self.run_id}-{self._rounds:03d}-{stage}-{model_name}-{start // self.max_requests}"
+                jobs.append(self._run_batch(name, group[start : start + self.max_requests]))
+        await asyncio.gather(*jobs)
+
+    async def _run_batch(self, name: str, requests: List[BatchRequest]) -> None:
+        """Submit one batch and resolve its requests; a failed batch fails every request in it."""
+        try:
+            output = await self.run_file(self.write_submission(name, requests))
+        except Exception as e:
+            logger.error(f"Batch {name} failed: {str(e)}")
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(BatchError(str(e)))
+            return
+
+        for request in requests:
+            if request.future.done():
+                continue
+            line = output.get(request.custom_id)
+            if line is None:
+                request.future.set_exception(BatchError(f"Request {request.custom_id} is missing from the output"))
+                continue
+            try:
+                request.future.set_result(parse_response_line(line, request.result_type))
+            except Exception as e:
+                request.future.set_exception(e)
+
+    def write_submission(self, name: str, requests: List[BatchRequest]) -> Path:
+        path = self.directory / f"{name}.jsonl"
+        with open(path, "w") as f:
+            for request in requests:
+                line = {"custom_id": request.custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": request.body}
+                f.write(json.dumps(line) + "\n")
+        return path
+
+    async def run_file(self, path: Path) -> Dict[str, Dict[str, Any]]:
+        """Upload a submission file, wait for its batch and return the output lines by custom id."""
+        with open(path, "rb") as f:
+            uploaded = await self.client.files.create(file=(path.name, f.read()), purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=uploaded.id, endpoint=BATCH_ENDPOINT, completion_window="24h"
+        )
+        logger.info(f"Submitted batch {batch.id} with {path.name}")
+
+        while batch.status not in FINAL_BATCH_STATUSES:
+            await asyncio.sleep(self.poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+        if batch.status != "completed":
+            raise BatchError(f"Batch {batch.id} is {batch.status}: {batch.errors}")
+        logger.info(f"Batch {batch.id} completed: {batch.request_counts}")
+
+        output = b""
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                output += (await self.client.files.content(file_id)).content
+        path.with_suffix(".output.jsonl").write_bytes(output)
+        lines = (json.loads(line) for line in output.splitlines() if line.strip())
+        return {line["custom_id"]: line for line in lines}
+
+
+class BatchAIClient(AIClient):
+    """
+    AIClient whose provider requests are answered through the OpenAI batch API.
+
+    Responses are cached as usual, so a rerun of the same batch only submits what is missing. Each call waits
+    for the batch round holding its request; run the analyses of a bulk job concurrently so that a round
+    carries every resume at the same stage.
+    """
+
+    def __init__(
+        self,
+        runner: BatchRunner,
+        model_type: ModelType = ModelType.OPENAI,
+        max_tokens: Optional[int] = None,
+        tier: ModelTier = ModelTier.FAST,
+    ):
+        if model_type is not ModelType.OPENAI:
+            raise ValueError("Batch mode is only available for the OpenAI batch API")
+        super().__init__(model_type, max_tokens, tier=tier)
+        self._runner = runner
+        self._temperature = get_model_config(model_type, tier).temperature
+
+    async def run(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+        result_type: Optional[Type[BaseModel]] = None,
+        use_cache: bool = True,
+        prompt_prefix: str = "",
+        stage: str = "",
+    ) -> Union[str, BaseModel]:
+        """Serve the response from cache or queue the request for the next batch round and wait for it."""
+        full_prompt = prompt_prefix + prompt
+        cache_key = self._get_cache_key(full_prompt, system_prompt)
+        if use_cache:
+            cached_result = self._load_from_cache(cache_key, result_type)
+            if cached_result is not None:
+                self._cache.record_hit()
+                record_cache_hit(self._provider, self._model_name, stage)
+                return cached_result
+            self._cache.record_miss()
+
+        body = build_request_body(
+            self._model_name,
+            full_prompt,
+            system_prompt,
+            max_tokens or self._model_settings["max_tokens"],
+            self._temperature,
+            result_type,
+        )
+        custom_id = get_request_key(self._provider, self._model_name, full_prompt, system_prompt, result_type)
+        started_at = time.perf_counter()
+        try:
+            # Shielded: identical requests share the future, one caller giving up must not cancel it for the rest
+            result, usage = await asyncio.shield(self._runner.submit(custom_id, stage or "default", body, result_type))
+        except Exception:
+            record_request_error(self._provider, self._model_name, stage, time.perf_counter() - started_at)
+            raise
+
+        self.usage.incr(usage)
+        record_usage(self._provider, self._model_name, stage, usage, time.perf_counter() - started_at)
+        if use_cache:
+            self._save_to_cache(cache_key, result)
+        return result
+
+
+def create_batch_runner(directory: Optional[Path] = None) -> BatchRunner:
+    """Runner using the configured OpenAI credentials, e.g. the local stand-in through OPENAI_BASE_URL."""
+    from openai import AsyncOpenAI
+
+    config = get_model_config(ModelType.OPENAI)
+    client = AsyncOpenAI(api_key=config.api_key, base_url=config.base_url)
+    return BatchRunner(client=client, directory=directory or Path(settings.batch_dir))
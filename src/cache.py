@@ -0,0 +1,323 @@
+import asyncio
+import os
+import tempfile
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from src import entities
+from src.conf import settings
+from src.logger import create_logger
+from src.serialization import JSON_FORMAT, MSGPACK_FORMAT, dumps, is_available, loads
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock, fall back to unlocked access
+    fcntl = None
+
+logger = create_logger(__name__)
+
+LOCKS_DIR = ".locks"
+STATS_DIR = ".stats"
+CORRUPT = "corrupt"
+FORMATS = (JSON_FORMAT, MSGPACK_FORMAT)
+STALE_TEMP_SECONDS = 3600
+
+
+@dataclass
+class CacheStats:
+    entries: Dict[str, int] = field(default_factory=dict)
+    """Entry count by payload type; unreadable entries are counted as `corrupt`."""
+    bytes: Dict[str, int] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def total_entries(self) -> int:
+        return sum(self.entries.values())
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.bytes.values())
+
+    @property
+    def hit_ratio(self) -> Optional[float]:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+
+def validate_entry(payload: Any) -> str:
+    """Return the payload type of a cache entry, raising ValueError if the entry is malformed."""
+    if not isinstance(payload, dict) or "type" not in payload or "data" not in payload:
+        raise ValueError("Missing type or data")
+    payload_type = payload["type"]
+    if payload_type == "str":
+        if not isinstance(payload["data"], str):
+            raise ValueError("String entry with non-string data")
+        return payload_type
+
+    model = getattr(entities, payload_type, None)
+    if isinstance(model, type) and issubclass(model, BaseModel):
+        try:
+            model.model_validate(payload["data"])
+        except ValidationError as e:
+            raise ValueError(f"Invalid {payload_type}: {e.error_count()} errors")
+    return payload_type
+
+
+@dataclass
+class DiskCache:
+    """
+    Directory of JSON cache entries shared by every worker process on the host.
+
+    Entries are written to a temporary file and renamed into place, so readers only ever see complete
+    files. `lock(key)` serializes the fetch of a key across processes: the first worker takes the lock
+    and calls the provider, the others wait for it and then read its entry from disk.
+
+    Reads refresh the entry mtime, which `prune` uses as the last-access time for LRU eviction. Hits and
+    misses are counted in files under `.stats` holding the count as a decimal number; every process
+    increments them under an exclusive `flock`, so the files stay a few bytes long.
+
+    Entries are JSON or msgpack files named by their format. Loads fall back to the other format, so
+    switching `data_format` keeps serving existing entries until they are pruned.
+    """
+
+    directory: Path = field(default_factory=lambda: Path(settings.cache_dir))
+    lock_timeout: float = field(default_factory=lambda: settings.cache_lock_timeout)
+    """Seconds to wait for another worker's fetch before fetching anyway."""
+    poll_interval: float = 0.05
+    data_format: str = field(default_factory=lambda: settings.cache_format)
+
+    def __post_init__(self):
+        if not is_available(self.data_format):
+            logger.warning(f"Cache format {self.data_format} is not available, writing JSON entries")
+            self.data_format = JSON_FORMAT
+        self.directory = Path(self.directory)
+        (self.directory / LOCKS_DIR).mkdir(parents=True, exist_ok=True)
+        (self.directory / STATS_DIR).mkdir(exist_ok=True)
+
+    def path(self, key: str, data_format: Optional[str] = None) -> Path:
+        return self.directory / f"{key}.{data_format or self.data_format}"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored payload, or None when the entry is missing or unreadable."""
+        for data_format in sorted(FORMATS, key=lambda name: name != self.data_format):
+            path = self.path(key, data_format)
+            try:
+                payload = self._read(path)
+                os.utime(path)
+                return payload
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to load cache: {e}")
+                return None
+        return None
+
+    def save(self, key: str, payload: Dict[str, Any]) -> None:
+        """Atomically replace the entry for `key`."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(dumps(payload, self.data_format))
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def record_hit(self) -> None:
+        self._count("hits")
+
+    def record_miss(self) -> None:
+        self._count("misses")
+
+    def _count(self, name: str) -> None:
+        try:
+            fd = os.open(self.directory / STATS_DIR / name, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                data = str(self._parse_count(fd) + 1).encode()
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, data)
+                os.ftruncate(fd, len(data))
+            finally:
+                # Closing releases the lock
+                os.close(fd)
+        except OSError as e:
+            logger.debug(f"Failed to count cache {name}: {e}")
+        except ValueError as e:
+            logger.warning(f"Cache {name} counter is corrupt, reset it with `cache stats --reset`: {e}")
+
+    def _read_count(self, name: str) -> int:
+        try:
+            fd = os.open(self.directory / STATS_DIR / name, os.O_RDONLY)
+        except FileNotFoundError:
+            return 0
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH)
+            return self._parse_count(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _parse_count(fd: int) -> int:
+        os.lseek(fd, 0, os.SEEK_SET)
+        return int(os.read(fd, 32) or 0)
+
+    def reset_stats(self) -> None:
+        for name in ("hits", "misses"):
+            (self.directory / STATS_DIR / name).unlink(missing_ok=True)
+
+    def entries(self) -> Iterator[Path]:
+        return chain.from_iterable(self.directory.glob(f"*.{data_format}") for data_format in FORMATS)
+
+    @staticmethod
+    def _read(path: Path) -> Any:
+        return loads(path.read_bytes(), path.suffix[1:])
+
+    def stats(self) -> CacheStats:
+        entries: Counter = Counter()
+        sizes: Counter = Counter()
+        for path in self.entries():
+            try:
+                size = path.stat().st_size
+                payload_type = validate_entry(self._read(path))
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError):
+                payload_type = CORRUPT
+            entries[payload_type] += 1
+            sizes[payload_type] += size
+        return CacheStats(
+            entries=dict(entries), bytes=dict(sizes), hits=self._read_count("hits"), misses=self._read_count("misses")
+        )
+
+    def prune(
+        self, max_bytes: Optional[int] = None, max_age: Optional[float] = None, dry_run: bool = False
+    ) -> List[Path]:
+        """
+        Remove entries unused for `max_age` seconds, then least recently used ones until the cache
+        fits in `max_bytes`. Also clears temporary files of crashed writers and abandoned lock files.
+        """
+        now = time.time()
+        entries = []
+        for path in self.entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        removed = []
+        total = sum(size for _, size, _ in entries)
+        for accessed_at, size, path in entries:
+            expired = max_age is not None and now - accessed_at > max_age
+            oversized = max_bytes is not None and total > max_bytes
+            if not (expired or oversized):
+                continue
+            removed.append(path)
+            total -= size
+            if not dry_run:
+                path.unlink(missing_ok=True)
+
+        if not dry_run:
+            self._remove_stale_temporary_files(now)
+            self._remove_abandoned_locks()
+        return removed
+
+    def verify(self, dry_run: bool = False) -> List[Path]:
+        """Remove entries that are not valid JSON or do not match their payload type."""
+        corrupt = []
+        for path in self.entries():
+            try:
+                validate_entry(self._read(path))
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                logger.warning(f"Corrupt cache entry {path.name}: {e}")
+                corrupt.append(path)
+                if not dry_run:
+                    path.unlink(missing_ok=True)
+        return corrupt
+
+    def _remove_stale_temporary_files(self, now: float) -> None:
+        for path in self.directory.glob(".*.tmp"):
+            try:
+                if now - path.stat().st_mtime > STALE_TEMP_SECONDS:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _remove_abandoned_locks(self) -> None:
+        """Unlink lock files left by crashed holders; held locks are skipped."""
+        if fcntl is None:
+            return
+        for path in (self.directory / LOCKS_DIR).glob("*.lock"):
+            try:
+                fd = os.open(path, os.O_RDWR)
+            except FileNotFoundError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                    path.unlink()
+            except (BlockingIOError, FileNotFoundError):
+                pass
+            finally:
+                os.close(fd)
+
+    @asynccontextmanager
+    async def lock(self, key: str) -> AsyncIterator[bool]:
+        """
+        Hold the advisory lock of `key`; yields False if it could not be taken within `lock_timeout`.
+
+        Waiting polls a non-blocking `flock` so it neither blocks the event loop nor ties up threads.
+        """
+        fd = await self._acquire(key)
+        try:
+            yield fd is not None
+        finally:
+            if fd is not None:
+                self._release(key, fd)
+
+    async def _acquire(self, key: str) -> Optional[int]:
+        if fcntl is None:
+            return None
+
+        lock_path = self.directory / LOCKS_DIR / f"{key}.lock"
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Timed out waiting for cache lock {key}, fetching without it")
+                    return None
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            # The previous holder unlinks the lock file on release; a lock taken on an unlinked file
+            # would not exclude processes that open the path afresh, so retry on the new file.
+            try:
+                if os.fstat(fd).st_ino == os.stat(lock_path).st_ino:
+                    return fd
+            except FileNotFoundError:
+                pass
+            os.close(fd)
+
+    def _release(self, key: str, fd: int) -> None:
+        try:
+            (self.directory / LOCKS_DIR / f"{key}.lock").unlink(missing_ok=True)
+        finally:
+            os.close(fd)
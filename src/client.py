@@ -1,18 +1,21 @@
 import hashlib
-import json
+import time
 from pathlib import Path
 from typing import Optional, Type, Union
 
 from pydantic import BaseModel
 from pydantic_ai import Agent
-from pydantic_ai.models.anthropic import AnthropicModel
-from pydantic_ai.models.openai import OpenAIModel
+from pydantic_ai.models import Model
 from pydantic_ai.settings import ModelSettings
+from pydantic_ai.usage import Usage
 
+from src.cache import DiskCache
 from src.conf import settings
-from src.entities import ModelConfig, ModelType
+from src.entities import ArchiveMode, ModelConfig, ModelTier, ModelType
 from src.interfaces import AIClientInterface
 from src.logger import create_logger
+from src.metrics import get_cached_tokens, record_cache_hit, record_request_error, record_usage
+from src.recording import ProviderArchive, get_provider_archive, get_request_key
 
 logger = create_logger(__name__)
 
@@ -23,74 +26,113 @@ DEFAULT_SYSTEM_PROMPT = """
 """
 
 
-MODEL_CONFIGS = {
-    ModelType.ANTHROPIC: ModelConfig(
-        model_name=settings.anthropic_model_name,
-        api_key=settings.anthropic_api_key,
-        max_tokens=settings.anthropic_max_tokens,
-        temperature=settings.anthropic_temperature,
-    ),
-    ModelType.OPENAI: ModelConfig(
-        model_name=settings.openai_model_name,
+class PromptCacheSettings(ModelSettings, total=False):
+    prompt_cache_prefix: str
+    """Leading part of the user prompt shared between requests, marked as a cache breakpoint."""
+
+
+def get_model_config(model_type: ModelType, tier: ModelTier = ModelTier.FAST) -> ModelConfig:
+    """Read the provider configuration from settings; the strong tier only swaps the model name."""
+    strong = tier is ModelTier.STRONG
+    if model_type is ModelType.ANTHROPIC:
+        return ModelConfig(
+            model_name=settings.anthropic_strong_model_name if strong else settings.anthropic_model_name,
+            api_key=settings.anthropic_api_key,
+            max_tokens=settings.anthropic_max_tokens,
+            temperature=settings.anthropic_temperature,
+            base_url=settings.anthropic_base_url or None,
+        )
+    return ModelConfig(
+        model_name=settings.openai_strong_model_name if strong else settings.openai_model_name,
         api_key=settings.openai_api_key,
         max_tokens=settings.openai_max_tokens,
         temperature=settings.openai_temperature,
-    ),
-}
+        base_url=settings.openai_base_url or None,
+    )
 
-MODEL_CLASSES = {
-    ModelType.ANTHROPIC: AnthropicModel,
-    ModelType.OPENAI: OpenAIModel,
-}
 
+def get_model_class(model_type: ModelType) -> Type[Model]:
+    """Import only the provider SDK that is actually used."""
+    if model_type is ModelType.ANTHROPIC:
+        from src.providers import CachingAnthropicModel
 
-class AIClient(AIClientInterface):
-    def __init__(self, model_type: ModelType, max_tokens: Optional[int] = None):
-        config = MODEL_CONFIGS[model_type]
-        model_class = MODEL_CLASSES[model_type]
+        return CachingAnthropicModel
+
+    from pydantic_ai.models.openai import OpenAIModel
+
+    return OpenAIModel
 
-        self._model = model_class(config.model_name, api_key=config.api_key)
-        self._model_settings = ModelSettings(
+
+class AIClient(AIClientInterface):
+    def __init__(
+        self,
+        model_type: ModelType,
+        max_tokens: Optional[int] = None,
+        archive: Optional[ProviderArchive] = None,
+        tier: ModelTier = ModelTier.FAST,
+    ):
+        config = get_model_config(model_type, tier)
+        model_class = get_model_class(model_type)
+
+        self._provider = model_type.value
+        self._model_name = config.model_name
+        self._tier = tier
+        self._model = model_class(config.model_name, api_key=config.api_key, base_url=config.base_url)
+        self._model_settings = PromptCacheSettings(
             max_tokens=max_tokens or config.max_tokens,
             temperature=config.temperature,
         )
-        self._cache_dir = Path(settings.cache_dir)
-        self._cache_dir.mkdir(exist_ok=True)
+        self._cache = DiskCache(Path(settings.cache_dir))
+        self._archive = archive if archive is not None else get_provider_archive()
+        self.usage = Usage()
+
+    @property
+    def max_tokens(self) -> Optional[int]:
+        """Default completion limit of the client's requests."""
+        return self._model_settings.get("max_tokens")
+
+    @property
+    def cached_tokens(self) -> int:
+        """Prompt tokens served from the provider prefix cache over the client lifetime."""
+        return get_cached_tokens(self.usage)
 
     def _get_cache_key(self, prompt: str, system_prompt: str) -> str:
-        """Generate a cache key from the prompt and system prompt."""
+        """
+        Generate a cache key from the prompt and system prompt.
+
+        Strong-tier keys include the model name so a cascade never serves the fast model's answer to the
+        same prompt; fast-tier keys are unchanged and existing cache entries stay valid.
+        """
         content = f"{prompt}|{system_prompt}"
+        if self._tier is ModelTier.STRONG:
+            content += f"|{self._model_name}"
         return hashlib.sha256(content.encode()).hexdigest()
 
     def _get_cache_path(self, cache_key: str) -> Path:
         """Get the full path for a cache file."""
-        return self._cache_dir / f"{cache_key}.json"
+        return self._cache.path(cache_key)
 
     def _save_to_cache(self, cache_key: str, result: Union[str, BaseModel]) -> None:
         """Save the result to cache."""
-        cache_path = self._get_cache_path(cache_key)
-        data = result if isinstance(result, str) else result.model_dump()
-        with open(cache_path, "w") as f:
-            json.dump({"data": data, "type": type(result).__name__}, f)
+        data = result if isinstance(result, str) else result.model_dump(mode="json")
+        self._cache.save(cache_key, {"data": data, "type": type(result).__name__})
 
     def _load_from_cache(
         self, cache_key: str, result_type: Optional[Type[BaseModel]] = None
     ) -> Optional[Union[str, BaseModel]]:
         """Load the result from cache if it exists."""
-        cache_path = self._get_cache_path(cache_key)
-        if not cache_path.exists():
+        cached = self._cache.load(cache_key)
+        if cached is None:
             return None
 
         try:
-            with open(cache_path) as f:
-                cached = json.load(f)
-                if cached["type"] == "str":
-                    return cached["data"]
-                elif result_type and cached["type"] == result_type.__name__:
-                    return result_type.model_validate(cached["data"])
+            if cached["type"] == "str":
+                return cached["data"]
+            elif result_type and cached["type"] == result_type.__name__:
+                return result_type.model_validate(cached["data"])
         except Exception as e:
             logger.warning(f"Failed to load cache: {e}")
-            return None
+        return None
 
     async def run(
         self,
@@ -99,6 +141,8 @@ class AIClient(AIClientInterface):
         system_prompt: str = DEFAULT_SYSTEM_PROMPT,
         result_type: Optional[Type[BaseModel]] = None,
         use_cache: bool = True,
+        prompt_prefix: str = "",
+        stage: str = "",
     ) -> Union[str, BaseModel]:
         """
         Run the AI model with the given prompt and parameters.
@@ -108,16 +152,61 @@ class AIClient(AIClientInterface):
             max_tokens: Optional override for max tokens
             system_prompt: System prompt to use (defaults to job matcher prompt)
             result_type: Optional Pydantic model to structure the output
+            prompt_prefix: Context shared between calls, sent verbatim ahead of the prompt
+                so providers can serve it from their prompt prefix cache
+            stage: Pipeline stage the call belongs to, used to label metrics
+
+        With a replay archive the response is served from the archive and neither the
+        response cache nor the provider is consulted. With a record archive every call goes
+        to the provider, so prompts the cache would answer are archived too; the cache is
+        still updated. Concurrent cache misses for the same prompt, in this or other worker
+        processes, are fetched from the provider only once.
         """
-        cache_key = self._get_cache_key(prompt, system_prompt)
+        full_prompt = prompt_prefix + prompt
+        if self._archive is not None and self._archive.mode is ArchiveMode.REPLAY:
+            return await self._replay(full_prompt, system_prompt, result_type)
+        if self._archive is not None and self._archive.mode is ArchiveMode.RECORD:
+            # Replay never reads the cache, so a hit left out of the archive would be a replay miss
+            result = await self._request(prompt, max_tokens, system_prompt, result_type, prompt_prefix, stage)
+            if use_cache:
+                self._save_to_cache(self._get_cache_key(full_prompt, system_prompt), result)
+            return result
+        if not use_cache:
+            return await self._request(prompt, max_tokens, system_prompt, result_type, prompt_prefix, stage)
+
+        cache_key = self._get_cache_key(full_prompt, system_prompt)
         cached_result = self._load_from_cache(cache_key, result_type)
-        if use_cache and cached_result is not None:
-            logger.debug("Using cached response")
-            return cached_result
-
+        if cached_result is None:
+            async with self._cache.lock(cache_key):
+                # Another worker may have fetched the same prompt while we waited for the lock
+                cached_result = self._load_from_cache(cache_key, result_type)
+                if cached_result is None:
+                    self._cache.record_miss()
+                    result = await self._request(prompt, max_tokens, system_prompt, result_type, prompt_prefix, stage)
+                    self._save_to_cache(cache_key, result)
+                    return result
+
+        logger.debug("Using cached response")
+        self._cache.record_hit()
+        record_cache_hit(self._provider, self._model_name, stage)
+        return cached_result
+
+    async def _request(
+        self,
+        prompt: str,
+        max_tokens: Optional[int],
+        system_prompt: str,
+        result_type: Optional[Type[BaseModel]],
+        prompt_prefix: str,
+        stage: str,
+    ) -> Union[str, BaseModel]:
+        """Call the provider, recording usage metrics and, in record mode, the response."""
+        prompt = prompt_prefix + prompt
         model_settings = self._model_settings.copy()
         if max_tokens is not None:
             model_settings["max_tokens"] = max_tokens
+        if prompt_prefix:
+            model_settings["prompt_cache_prefix"] = prompt_prefix
 
         agent = Agent(
             model=self._model,
@@ -132,9 +221,29 @@ class AIClient(AIClientInterface):
                 result_type=result_type,
             )
 
-        result = await agent.run(prompt)
-        logger.debug(f"Request usage: {result.usage()}")
-
-        if use_cache:
-            self._save_to_cache(cache_key, result.data)
+        started_at = time.perf_counter()
+        try:
+            result = await agent.run(prompt)
+        except Exception:
+            record_request_error(self._provider, self._model_name, stage, time.perf_counter() - started_at)
+            raise
+
+        duration = time.perf_counter() - started_at
+        usage = result.usage()
+        self.usage.incr(usage)
+        record_usage(self._provider, self._model_name, stage, usage, duration)
+        logger.debug(f"Request usage: {usage}, cached tokens: {get_cached_tokens(usage)}")
+
+        if self._archive is not None:
+            request_key = get_request_key(self._provider, self._model_name, prompt, system_prompt, result_type)
+            self._archive.record(request_key, stage, result.data, usage, duration)
         return result.data
+
+    async def _replay(
+        self, prompt: str, system_prompt: str, result_type: Optional[Type[BaseModel]] = None
+    ) -> Union[str, BaseModel]:
+        """Serve a recorded provider response, waiting its (scaled) recorded latency."""
+        request_key = get_request_key(self._provider, self._model_name, prompt, system_prompt, result_type)
+        recorded = await self._archive.replay(request_key)
+        self.usage.incr(recorded.to_usage())
+        return recorded.to_result(result_type)
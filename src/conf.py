@@ -1,4 +1,5 @@
 import os
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -14,13 +15,66 @@ class Settings(BaseSettings):
     docs_enable: bool = True
     debug: bool = False
     log_level: str = "INFO"
+    sse_keepalive_interval: float = 15.0
+
+    admission_enabled: bool = True
+    admission_max_concurrency: int = 16
+    admission_max_wait: float = 30.0
+    admission_key_concurrency: int = 4
+    admission_initial_duration: float = 20.0
+
+    pdf_extract_workers: int = 0
+    pdf_parallel_min_pages: int = 8
 
     cache_dir: str = "cache"
+    cache_lock_timeout: float = 120.0
+    cache_format: Literal["json", "msgpack"] = "json"
+    fast_json_enabled: bool = True
+
+    llm_archive_mode: Literal["off", "record", "replay"] = "off"
+    llm_archive_path: str = "data/llm_archive.jsonl"
+    llm_replay_latency_scale: float = 1.0
+
+    results_store_enabled: bool = True
+    results_store_path: str = "data/results.sqlite3"
+
+    dedup_enabled: bool = True
+    dedup_index_path: str = "data/fingerprints.sqlite3"
+    resume_dedup_threshold: float = 0.9
+    resume_dedup_reuse: bool = False
+    job_dedup_threshold: float = 0.9
+
+    task_queue_path: str = "data/tasks.sqlite3"
+    task_lease_seconds: int = 600
+    task_max_attempts: int = 3
+    worker_concurrency: int = 4
+    worker_poll_interval: float = 1.0
+
+    cascade_enabled: bool = False
+    cascade_shortlist_size: Optional[int] = 10
+    cascade_min_score: Optional[int] = None
+    screen_concurrency: int = 4
+
+    pipeline_queue_size: int = 32
+    pipeline_concurrency: int = 4
+
+    journal_enabled: bool = True
+    journal_path: str = "data/journal.sqlite3"
+    journal_config_version: str = ""
+
+    batch_dir: str = "data/batches"
+    batch_collect_window: float = 1.0
+    batch_poll_interval: float = 30.0
+    batch_max_requests: int = 50000
 
     openai_api_key: str = ""
     anthropic_api_key: str = ""
+    openai_base_url: str = ""
+    anthropic_base_url: str = ""
     openai_model_name: str = "gpt-4o-mini"
     anthropic_model_name: str = "claude-3-5-haiku-latest"
+    openai_strong_model_name: str = "gpt-4o"
+    anthropic_strong_model_name: str = "claude-3-5-sonnet-latest"
     openai_temperature: float = 0.7
     anthropic_temperature: float = 0.7
     openai_max_tokens: int = 2000
@@ -0,0 +1,241 @@
+import hashlib
+import random
+import re
+import time
+import unicodedata
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import ClassVar, List, Optional, Sequence, Set, Tuple
+
+from src.conf import settings
+from src.entities import DuplicateRecord, JobRequirements, NearDuplicate
+from src.logger import create_logger
+from src.results import text_hash
+from src.storage import SQLiteStore
+
+logger = create_logger(__name__)
+
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 32
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# Seeded so every process derives the same MinHash permutations; not used for anything secret
+_rng = random.Random(1)  # nosec: B311
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+FINGERPRINTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    kind TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    payload TEXT,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (kind, doc_id)
+);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    kind TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    PRIMARY KEY (kind, bucket, doc_id)
+);
+CREATE TABLE IF NOT EXISTS duplicates (
+    kind TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    duplicate_of TEXT NOT NULL,
+    similarity REAL NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (kind, doc_id)
+);
+"""
+
+Signature = Tuple[int, ...]
+
+
+def canonicalize(text: str) -> List[str]:
+    """Lowercased word tokens, ignoring punctuation, markup and whitespace differences."""
+    return re.findall(r"\w+", unicodedata.normalize("NFKC", text).lower())
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """32-bit hashes of the overlapping `size`-word sequences of the text."""
+    words = canonicalize(text)
+    grams = {" ".join(words[i : i + size]) for i in range(max(len(words) - size + 1, 1))}
+    return {int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=4).digest(), "big") for gram in grams}
+
+
+@lru_cache(maxsize=256)
+def minhash(text: str) -> Signature:
+    """MinHash signature; the share of equal positions in two signatures estimates their shingle Jaccard similarity."""
+    hashes = shingles(text)
+    return tuple(min(((a * x + b) % MERSENNE_PRIME) & MAX_HASH for x in hashes) for a, b in PERMUTATIONS)
+
+
+def similarity(first: Signature, second: Signature) -> float:
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+def band_buckets(signature: Signature) -> List[str]:
+    """LSH bucket of each band; documents sharing any bucket are candidate near-duplicates."""
+    return [
+        f"{band}:"
+        + hashlib.blake2b(_pack(signature[band * LSH_ROWS : (band + 1) * LSH_ROWS]), digest_size=8).hexdigest()
+        for band in range(LSH_BANDS)
+    ]
+
+
+def _pack(signature: Sequence[int]) -> bytes:
+    return array("I", signature).tobytes()
+
+
+def _unpack(data: bytes) -> Signature:
+    return tuple(array("I", data))
+
+
+@dataclass
+class FingerprintIndex(SQLiteStore):
+    """
+    Local LSH index of MinHash signatures kept in SQLite, one namespace per document kind.
+
+    Signatures are split into `LSH_BANDS` bands; a query only compares against documents sharing a band
+    bucket, so lookups stay cheap as the index grows while pairs above ~0.5 similarity are almost never missed.
+    """
+
+    schema: ClassVar[str] = FINGERPRINTS_SCHEMA
+
+    path: Path = field(default_factory=lambda: Path(settings.dedup_index_path))
+
+    def add(self, kind: str, doc_id: str, signature: Signature, payload: Optional[str] = None) -> None:
+        """Index a document; `payload` is data derived from it, such as extracted job requirements."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT INTO documents (kind, doc_id, signature, payload, created_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (kind, doc_id) DO UPDATE SET payload = coalesce(excluded.payload, payload)",
+                    (kind, doc_id, _pack(signature), payload, time.time()),
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO lsh_buckets (kind, bucket, doc_id) VALUES (?, ?, ?)",
+                    [(kind, bucket, doc_id) for bucket in band_buckets(signature)],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def query(
+        self, kind: str, signature: Signature, threshold: float, with_payload: bool = False
+    ) -> List[NearDuplicate]:
+        """Indexed documents at least `threshold` similar to the signature, most similar first."""
+        buckets = band_buckets(signature)
+        with self._connect() as conn:
+            # Only fixed clauses and one placeholder per bucket are interpolated; all values are bound
+            rows = conn.execute(
+                "SELECT doc_id, signature FROM documents WHERE kind = ? "
+                f"{'AND payload IS NOT NULL ' if with_payload else ''}AND doc_id IN ("  # nosec: B608
+                f"SELECT doc_id FROM lsh_buckets WHERE kind = ? AND bucket IN ({', '.join('?' * len(buckets))}))",
+                (kind, kind, *buckets),
+            ).fetchall()
+        matches = [
+            NearDuplicate(text_hash=row["doc_id"], similarity=similarity(signature, _unpack(row["signature"])))
+            for row in rows
+        ]
+        return sorted(
+            (match for match in matches if match.similarity >= threshold), key=lambda m: m.similarity, reverse=True
+        )
+
+    def payload(self, kind: str, doc_id: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload FROM documents WHERE kind = ? AND doc_id = ?", (kind, doc_id)).fetchone()
+        return row["payload"] if row is not None else None
+
+    def record_duplicate(self, kind: str, doc_id: str, match: NearDuplicate) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO duplicates (kind, doc_id, duplicate_of, similarity, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (kind, doc_id, match.text_hash, match.similarity, time.time()),
+            )
+
+    def duplicates(self, kind: str) -> List[DuplicateRecord]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM duplicates WHERE kind = ? ORDER BY created_at", (kind,)).fetchall()
+        return [
+            DuplicateRecord(
+                text_hash=row["doc_id"],
+                duplicate_of=row["duplicate_of"],
+                similarity=row["similarity"],
+                created_at=datetime.fromtimestamp(row["created_at"], tz=timezone.utc),
+            )
+            for row in rows
+        ]
+
+    def count(self, kind: str) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT count(*) FROM documents WHERE kind = ?", (kind,)).fetchone()[0]
+
+
+@dataclass
+class Deduplicator:
+    """Flags documents that are near-duplicates of ones seen before, then remembers them."""
+
+    index: FingerprintIndex = field(default_factory=FingerprintIndex)
+    resume_threshold: float = field(default_factory=lambda: settings.resume_dedup_threshold)
+    reuse_analysis: bool = field(default_factory=lambda: settings.resume_dedup_reuse)
+    """Return the earlier analysis of a near-duplicate resume for the same job instead of running a new one."""
+    job_threshold: float = field(default_factory=lambda: settings.job_dedup_threshold)
+
+    def check_resume(self, resume_text: str) -> List[NearDuplicate]:
+        """Earlier resumes above the threshold, most similar first; an identical resubmission has similarity 1."""
+        signature = minhash(resume_text)
+        doc_id = text_hash(resume_text)
+        matches = self.index.query("resume", signature, self.resume_threshold)
+        self.index.add("resume", doc_id, signature)
+        if matches:
+            logger.info(f"Resume is a near-duplicate of {matches[0].text_hash} ({matches[0].similarity:.2f})")
+            self._record("resume", doc_id, matches[0])
+        return matches
+
+    def find_job_requirements(self, job_description: str) -> Optional[Tuple[JobRequirements, bool]]:
+        """
+        Requirements already extracted from this job description or a near-duplicate posting of it, and whether
+        they come from this very text.
+
+        Near-duplicate postings are often the same role in another place, so requirements taken from one still
+        carry that posting's `location`; the caller re-derives it and remembers the corrected requirements.
+        """
+        signature = minhash(job_description)
+        doc_id = text_hash(job_description)
+        matches = self.index.query("job", signature, self.job_threshold, with_payload=True)
+        for match in matches:
+            payload = self.index.payload("job", match.text_hash)
+            if payload is None:
+                continue
+            requirements = JobRequirements.model_validate_json(payload)
+            if match.text_hash != doc_id:
+                logger.info(f"Reusing requirements of near-duplicate job {match.text_hash} ({match.similarity:.2f})")
+                self._record("job", doc_id, match)
+            return requirements, match.text_hash == doc_id
+        return None
+
+    def remember_job_requirements(self, job_description: str, requirements: JobRequirements) -> None:
+        self.index.add("job", text_hash(job_description), minhash(job_description), requirements.model_dump_json())
+
+    def _record(self, kind: str, doc_id: str, match: NearDuplicate) -> None:
+        """Log a near-duplicate for the report; resubmissions of the identical text are not duplicates."""
+        if match.text_hash != doc_id:
+            self.index.record_duplicate(kind, doc_id, match)
+
+
+@lru_cache(maxsize=None)
+def get_deduplicator() -> Optional[Deduplicator]:
+    """Deduplicator configured through settings, or None when deduplication is disabled."""
+    if not settings.dedup_enabled:
+        return None
+    return Deduplicator()
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -14,12 +15,24 @@ class ModelType(Enum):
     OPENAI = "openai"
 
 
+class ModelTier(str, Enum):
+    FAST = "fast"
+    STRONG = "strong"
+
+
+class ArchiveMode(str, Enum):
+    OFF = "off"
+    RECORD = "record"
+    REPLAY = "replay"
+
+
 @dataclass
 class ModelConfig:
     model_name: str
     api_key: str
     max_tokens: int
     temperature: float
+    base_url: Optional[str] = None
 
 
 class Location(BaseModel):
@@ -55,6 +68,9 @@ class ScoringCriterion(BaseModel):
     description: str
     factors: List[str]
     score: Optional[int] = None
+    skipped: bool = Field(
+        default=False, description="Not evaluated because the candidate could no longer reach min_score"
+    )
 
 
 class ScoreLevel(BaseModel):
@@ -63,9 +79,151 @@ class ScoreLevel(BaseModel):
     label: str
 
 
+class ContactInfo(BaseModel):
+    website: Optional[str] = Field(default=None, description="Candidate's professional website URL")
+    email: Optional[str] = Field(default=None, description="Candidate's email address")
+    links: List[str] = Field(default_factory=list, description="Other profile and portfolio URLs")
+
+
+class UnifiedResume(BaseModel):
+    markdown: str = Field(description="The resume converted to the unified markdown format")
+    contact: ContactInfo
+
+
+class NearDuplicate(BaseModel):
+    text_hash: str = Field(description="SHA-256 of the earlier document text")
+    similarity: float = Field(ge=0, le=1, description="Estimated Jaccard similarity of the word shingles")
+
+
+class DuplicateRecord(BaseModel):
+    text_hash: str
+    duplicate_of: str
+    similarity: float
+    created_at: datetime
+
+
 class DetailedMatchResult(BaseModel):
     overall_score: int = Field(ge=0, le=100)
     criteria_scores: List[ScoringCriterion]
     match_reasons: str
     red_flags: Dict[str, List[str]]
     website: Optional[str] = None
+    contact: Optional[ContactInfo] = None
+    duplicate_of: Optional[NearDuplicate] = None
+    reused: bool = Field(default=False, description="Copied from the analysis of the near-duplicate resume")
+    tier: Optional[ModelTier] = Field(
+        default=None, description="Model tier that produced the scores in a cascade screening"
+    )
+
+
+class JournalStage(str, Enum):
+    UNIFIED = "unified"
+    COMPLETED = "completed"
+
+
+class JournalEntry(BaseModel):
+    resume_hash: str
+    job_hash: str
+    config_version: str
+    stage: JournalStage
+    unified: Optional[UnifiedResume] = None
+    result: Optional[DetailedMatchResult] = None
+    updated_at: datetime
+
+
+class PipelineRecord(BaseModel):
+    """One line of the pipeline output: the result of a resume, or the stage it failed at."""
+
+    id: str
+    resume_hash: Optional[str] = None
+    result: Optional[DetailedMatchResult] = None
+    error: Optional[str] = None
+
+
+class RedFlagLevel(str, Enum):
+    NONE = "none"
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+
+
+class StoredMatchResult(BaseModel):
+    result_id: str
+    job_hash: str
+    resume_hash: str
+    created_at: datetime
+    result: DetailedMatchResult
+
+
+class ResultsPage(BaseModel):
+    items: List[StoredMatchResult]
+    next_cursor: Optional[str] = None
+
+
+class RerankRequest(BaseModel):
+    results: List[DetailedMatchResult]
+    emphasis: Emphasis
+
+
+class RankedMatchResult(BaseModel):
+    rank: int
+    index: int = Field(description="Position of the result in the request")
+    result: DetailedMatchResult
+
+
+class ResultFormat(str, Enum):
+    FULL = "full"
+    COMPACT = "compact"
+
+
+class CriterionDefinition(BaseModel):
+    key: str
+    name: str
+    weight: int
+    description: str
+    factors: List[str]
+
+
+class CompactResults(BaseModel):
+    """
+    Results with the criteria sent once; each row holds the columns below for one candidate.
+
+    `scores` and `flags` are aligned with `criteria`; a flag is an index into `flag_levels`. `weights` is null
+    when the candidate was scored with the weights given in `criteria`.
+    """
+
+    criteria: List[CriterionDefinition]
+    columns: List[str] = ["id", "overall_score", "scores", "flags", "weights", "candidate"]
+    flag_levels: List[RedFlagLevel] = list(RedFlagLevel)
+    rows: List[List[Any]]
+    next_cursor: Optional[str] = None
+
+
+class AnalysisEventType(str, Enum):
+    REQUIREMENTS = "requirements"
+    RESUME = "resume"
+    CRITERION = "criterion"
+    MATCH_REASONS = "match_reasons"
+    RESULT = "result"
+    ERROR = "error"
+
+
+class AnalysisEvent(BaseModel):
+    event: AnalysisEventType
+    data: Any
+
+
+class TaskStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class AnalysisTask(BaseModel):
+    task_id: str
+    status: TaskStatus
+    attempts: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
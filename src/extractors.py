@@ -0,0 +1,113 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from src.conf import settings
+from src.logger import create_logger
+
+logger = create_logger(__name__)
+
+Extractor = Callable[[Path], str]
+
+TEXT_SUFFIXES = (".txt", ".text", ".md", ".markdown")
+PDF_MAGIC = b"%PDF-"
+MAGIC_BYTES = 8
+PDF_DEFAULT_WORKERS = 4
+
+
+def extract_text_file(path: Path) -> str:
+    """Plain text and markdown are already what the prompts take; decode them as they are."""
+    return path.read_bytes().decode("utf-8-sig")
+
+
+def _extract_pdf_pages(path: str, start: int, stop: int) -> List[str]:
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(path)
+    return [reader.pages[number].extract_text() or "" for number in range(start, stop)]
+
+
+def pdf_workers() -> int:
+    return settings.pdf_extract_workers or min(PDF_DEFAULT_WORKERS, os.cpu_count() or 1)
+
+
+@lru_cache(maxsize=None)
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """
+    Worker processes for page ranges, started from a forkserver (spawn where it is unavailable).
+
+    Forking the server process would copy its event loop, threads and open connections into the workers.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=pdf_workers(), mp_context=multiprocessing.get_context(method))
+
+
+def extract_pdf(path: Path) -> str:
+    """
+    Extract PDF text with PyPDF2, splitting long documents into page ranges parsed by worker processes.
+
+    PyPDF2 is pure Python and holds the GIL, so threads would not help; documents shorter than
+    `pdf_parallel_min_pages` are parsed inline, where process start-up would cost more than it saves.
+    """
+    from PyPDF2 import PdfReader
+
+    page_count = len(PdfReader(path).pages)
+    workers = pdf_workers()
+    if page_count < settings.pdf_parallel_min_pages or workers < 2:
+        return "\n\n".join(_extract_pdf_pages(str(path), 0, page_count))
+
+    chunk = -(-page_count // workers)
+    ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+    pool = get_pdf_pool()
+    futures = [pool.submit(_extract_pdf_pages, str(path), start, stop) for start, stop in ranges]
+    return "\n\n".join(page for future in futures for page in future.result())
+
+
+@dataclass
+class ExtractorRegistry:
+    """
+    Picks a text extractor by the file's magic bytes, then by its suffix, and falls back to `fallback`.
+
+    A specialised extractor that fails or returns no text hands the file to the fallback, so unusual
+    files still get the generic conversion.
+    """
+
+    fallback: Extractor
+    by_magic: List[Tuple[bytes, Extractor]] = field(default_factory=list)
+    by_suffix: Dict[str, Extractor] = field(default_factory=dict)
+
+    def register(self, extractor: Extractor, suffixes: Tuple[str, ...] = (), magic: Tuple[bytes, ...] = ()) -> None:
+        for suffix in suffixes:
+            self.by_suffix[suffix.lower()] = extractor
+        for prefix in magic:
+            self.by_magic.append((prefix, extractor))
+
+    def select(self, path: Path) -> Extractor:
+        with open(path, "rb") as f:
+            head = f.read(MAGIC_BYTES)
+        for prefix, extractor in self.by_magic:
+            if head.startswith(prefix):
+                return extractor
+        return self.by_suffix.get(path.suffix.lower(), self.fallback)
+
+    def extract(self, path: Path) -> str:
+        extractor = self.select(path)
+        if extractor is self.fallback:
+            return self.fallback(path)
+        try:
+            text = extractor(path)
+        except Exception as e:
+            logger.warning(f"{extractor.__name__} failed on {path.name}, using the generic converter: {e}")
+            return self.fallback(path)
+        return text if text.strip() else self.fallback(path)
+
+
+def create_extractor_registry(fallback: Extractor) -> ExtractorRegistry:
+    registry = ExtractorRegistry(fallback=fallback)
+    registry.register(extract_pdf, suffixes=(".pdf",), magic=(PDF_MAGIC,))
+    registry.register(extract_text_file, suffixes=TEXT_SUFFIXES)
+    return registry
@@ -0,0 +1,65 @@
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from src.analysis import RedFlagAnalyzer
+from src.entities import (
+    CompactResults,
+    CriterionDefinition,
+    DetailedMatchResult,
+    RankedMatchResult,
+    RedFlagLevel,
+    StoredMatchResult,
+)
+
+FLAG_CODES = {level.value: code for code, level in enumerate(RedFlagLevel)}
+
+
+def get_flag_codes(result: DetailedMatchResult, criteria: List[CriterionDefinition]) -> List[int]:
+    """Red flag level of each criterion, computed from its score and weight as RedFlagAnalyzer does."""
+    positions = {criterion.key: position for position, criterion in enumerate(criteria)}
+    codes = [0] * len(criteria)
+    for criterion in result.criteria_scores:
+        codes[positions[criterion.key]] = FLAG_CODES[RedFlagAnalyzer.level(criterion).value]
+    return codes
+
+
+def to_compact(
+    items: Iterable[Tuple[Union[str, int], DetailedMatchResult]], next_cursor: Optional[str] = None
+) -> CompactResults:
+    """Encode (id, result) pairs as one criteria table plus a row of scores per candidate."""
+    items = list(items)
+    criteria: List[CriterionDefinition] = []
+    positions: Dict[str, int] = {}
+    for _, result in items:
+        for criterion in result.criteria_scores:
+            if criterion.key not in positions:
+                positions[criterion.key] = len(criteria)
+                criteria.append(CriterionDefinition(**criterion.model_dump(exclude={"score"})))
+
+    rows = []
+    for item_id, result in items:
+        scores: List[Optional[int]] = [None] * len(criteria)
+        weights = [criterion.weight for criterion in criteria]
+        for criterion in result.criteria_scores:
+            scores[positions[criterion.key]] = criterion.score
+            weights[positions[criterion.key]] = criterion.weight
+        candidate = (result.contact and result.contact.email) or result.website
+        rows.append(
+            [
+                item_id,
+                result.overall_score,
+                scores,
+                get_flag_codes(result, criteria),
+                None if weights == [criterion.weight for criterion in criteria] else weights,
+                candidate,
+            ]
+        )
+    return CompactResults(criteria=criteria, rows=rows, next_cursor=next_cursor)
+
+
+def compact_stored(results: List[StoredMatchResult], next_cursor: Optional[str] = None) -> CompactResults:
+    return to_compact(((item.result_id, item.result) for item in results), next_cursor)
+
+
+def compact_ranked(results: List[RankedMatchResult]) -> CompactResults:
+    """Rows are in rank order; the id is the position of the result in the request."""
+    return to_compact((item.index, item.result) for item in results)
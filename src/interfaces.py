@@ -15,5 +15,8 @@ class AIClientInterface:
         max_tokens: Optional[int] = None,
         system_prompt: str = "",
         result_type: Optional[Type[BaseModel]] = None,
+        use_cache: bool = True,
+        prompt_prefix: str = "",
+        stage: str = "",
     ) -> Union[str, BaseModel]:
         pass
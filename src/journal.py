@@ -0,0 +1,130 @@
+import hashlib
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import ClassVar, Optional
+
+from src import promts
+from src.conf import settings
+from src.entities import DetailedMatchResult, JournalEntry, JournalStage, UnifiedResume
+from src.logger import create_logger
+from src.storage import SQLiteStore
+
+logger = create_logger(__name__)
+
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    resume_hash TEXT NOT NULL,
+    job_hash TEXT NOT NULL,
+    config_version TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    unified TEXT,
+    result TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (resume_hash, job_hash, config_version)
+);
+"""
+
+
+def get_config_version(min_score: Optional[int] = None, max_tokens: Optional[int] = None) -> str:
+    """
+    Fingerprint of what shapes an analysis: the prompts, models and sampling settings, plus `journal_config_version`.
+
+    The run's `min_score` and the client's `max_tokens` are part of it too, as a result stopped early or cut
+    short is not the result of a run without them. Progress journaled under another version is ignored, so
+    changing any of these re-runs every item.
+    """
+    parts = [
+        *(value for name, value in sorted(vars(promts).items()) if name.endswith("_PROMT")),
+        settings.openai_model_name,
+        settings.openai_strong_model_name,
+        settings.anthropic_model_name,
+        settings.anthropic_strong_model_name,
+        str(settings.openai_temperature),
+        str(settings.anthropic_temperature),
+        settings.journal_config_version,
+        str(min_score),
+        str(max_tokens),
+    ]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()[:16]
+
+
+@dataclass
+class ProgressJournal(SQLiteStore):
+    """
+    Durable progress of batch runs in SQLite, one row per (resume, job, config version).
+
+    An item is journaled once its resume is unified and again once it is scored, so a restarted run skips
+    completed items and scores partially completed ones from their stored unified resume.
+    """
+
+    schema: ClassVar[str] = JOURNAL_SCHEMA
+
+    path: Path = field(default_factory=lambda: Path(settings.journal_path))
+
+    def get(self, resume_hash: str, job_hash: str, config_version: str) -> Optional[JournalEntry]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM progress WHERE resume_hash = ? AND job_hash = ? AND config_version = ?",
+                (resume_hash, job_hash, config_version),
+            ).fetchone()
+        if row is None:
+            return None
+        return JournalEntry(
+            resume_hash=row["resume_hash"],
+            job_hash=row["job_hash"],
+            config_version=row["config_version"],
+            stage=JournalStage(row["stage"]),
+            unified=UnifiedResume.model_validate_json(row["unified"]) if row["unified"] else None,
+            result=DetailedMatchResult.model_validate_json(row["result"]) if row["result"] else None,
+            updated_at=datetime.fromtimestamp(row["updated_at"], tz=timezone.utc),
+        )
+
+    def save_unified(self, resume_hash: str, job_hash: str, config_version: str, unified: UnifiedResume) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO progress (resume_hash, job_hash, config_version, stage, unified, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (resume_hash, job_hash, config_version) "
+                "DO UPDATE SET unified = excluded.unified, updated_at = excluded.updated_at",
+                (
+                    resume_hash,
+                    job_hash,
+                    config_version,
+                    JournalStage.UNIFIED.value,
+                    unified.model_dump_json(),
+                    time.time(),
+                ),
+            )
+
+    def save_result(self, resume_hash: str, job_hash: str, config_version: str, result: DetailedMatchResult) -> None:
+        """Mark the item completed; its unified resume is dropped as nothing will resume from it."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO progress (resume_hash, job_hash, config_version, stage, result, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    resume_hash,
+                    job_hash,
+                    config_version,
+                    JournalStage.COMPLETED.value,
+                    result.model_dump_json(),
+                    time.time(),
+                ),
+            )
+
+    def count(self, job_hash: str, config_version: str, stage: JournalStage) -> int:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT count(*) FROM progress WHERE job_hash = ? AND config_version = ? AND stage = ?",
+                (job_hash, config_version, stage.value),
+            ).fetchone()[0]
+
+
+@lru_cache(maxsize=None)
+def get_progress_journal() -> Optional[ProgressJournal]:
+    """Journal configured through settings, or None when journaling is disabled."""
+    if not settings.journal_enabled:
+        return None
+    return ProgressJournal()
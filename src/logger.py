@@ -1,9 +1,11 @@
 import time
 from logging import Logger, getLogger
+from typing import Optional
 
 from request_id_helper import init_logger
 
 from src.conf import LOG_CONFIG
+from src.metrics import record_stage
 
 
 def create_logger(name: str) -> Logger:
@@ -12,9 +14,18 @@ def create_logger(name: str) -> Logger:
 
 
 class TimeLogger:
-    def __init__(self, start_message: str):
+    """
+    Measure a block of work, log its duration and record it in the stage latency histogram.
+
+    Usable as both `with TimeLogger(...)` and `async with TimeLogger(...)`. Blocks that exit with
+    an exception are recorded with the `error` outcome.
+    """
+
+    def __init__(self, start_message: str, stage: Optional[str] = None):
         self._start_message = start_message
+        self._stage = stage
         self.logger = getLogger("")
+        self.duration: Optional[float] = None
 
     def __enter__(self):
         self._t = time.perf_counter()
@@ -23,5 +34,13 @@ class TimeLogger:
         return self
 
     def __exit__(self, type, value, traceback):
-        delta = time.perf_counter() - self._t
-        self.logger.info(f"Processing time: {delta:.6f} sec")
+        self.duration = time.perf_counter() - self._t
+        self.logger.info(f"Processing time: {self.duration:.6f} sec")
+        if self._stage:
+            record_stage(self._stage, "error" if type else "success", self.duration)
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, type, value, traceback):
+        return self.__exit__(type, value, traceback)
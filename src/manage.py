@@ -1,19 +1,58 @@
 #!/usr/bin/env python3
+"""
+Command-line entry point.
+
+Heavy dependencies (provider SDKs, markitdown, uvicorn) are imported inside the commands that
+need them so that `--help` and short-lived worker processes start quickly.
+"""
 
 import asyncio
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 import click
-import uvicorn
 
-from src.client import AIClient
 from src.conf import LOG_CONFIG, settings
 from src.entities import ModelType
 from src.logger import create_logger
-from src.services import ResumeAnalysisService
 
 logger = create_logger(__name__)
 
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class SizeType(click.ParamType):
+    """Byte size such as `500M` or `2G`."""
+
+    name = "size"
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, int):
+            return value
+        text = value.strip().upper().removesuffix("B")
+        unit = text[-1:] if text[-1:] in SIZE_UNITS else ""
+        try:
+            return int(float(text.removesuffix(unit)) * SIZE_UNITS[unit])
+        except ValueError:
+            self.fail(f"{value!r} is not a size like 500M or 2G", param, ctx)
+
+
+class DurationType(click.ParamType):
+    """Duration such as `30m`, `12h` or `7d`, in seconds."""
+
+    name = "duration"
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, (int, float)):
+            return float(value)
+        text = value.strip().lower()
+        unit = text[-1:] if text[-1:] in DURATION_UNITS else "s"
+        try:
+            return float(text.removesuffix(unit)) * DURATION_UNITS[unit]
+        except ValueError:
+            self.fail(f"{value!r} is not a duration like 12h or 7d", param, ctx)
+
 
 @click.group()
 def cli():
@@ -34,17 +73,27 @@ def cli():
     required=True,
     help='Path to the job description file',
 )
-def analyze(resume_path: Path, job_desc_path: Path):
+@click.option(
+    '--min_score',
+    type=click.IntRange(0, 100),
+    help='Stop evaluating once the candidate can no longer reach this overall score',
+)
+def analyze(resume_path: Path, job_desc_path: Path, min_score: Optional[int]):
     """Analyze a resume against a job description."""
+    from src.client import AIClient
+    from src.dedup import get_deduplicator
+    from src.results import get_results_store
+    from src.services import ResumeAnalysisService
+
     client = AIClient(model_type=ModelType.OPENAI, max_tokens=2000)
-    service = ResumeAnalysisService(client)
+    service = ResumeAnalysisService(client, store=get_results_store(), deduplicator=get_deduplicator())
 
     # Process input files
     resume_text, job_description = service.process_files(resume_path, job_desc_path)
 
     # Run analysis
     try:
-        result = asyncio.run(service.analyze_resume(resume_text, job_description))
+        result = asyncio.run(service.analyze_resume(resume_text, job_description, min_score=min_score))
         service.show_analysis_result(result)
     except click.ClickException as e:
         raise e
@@ -53,8 +102,185 @@ def analyze(resume_path: Path, job_desc_path: Path):
         raise click.ClickException("An unexpected error occurred during analysis")
 
 
+@cli.command()
+@click.option(
+    '--resumes_dir',
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    required=True,
+    help='Directory of resume files to screen',
+)
+@click.option(
+    '--job_desc_path',
+    type=click.Path(exists=True, path_type=Path),
+    required=True,
+    help='Path to the job description file',
+)
+@click.option(
+    '--cascade/--no-cascade',
+    default=settings.cascade_enabled,
+    show_default=True,
+    help='Score everyone with the fast model and re-score the shortlist with the strong model',
+)
+@click.option(
+    '--shortlist_size',
+    type=click.IntRange(min=1),
+    default=settings.cascade_shortlist_size,
+    show_default=True,
+    help='Candidates re-scored by the strong model at most',
+)
+@click.option(
+    '--shortlist_min_score',
+    type=click.IntRange(0, 100),
+    default=settings.cascade_min_score,
+    help='Overall fast-model score needed to be re-scored by the strong model',
+)
+@click.option(
+    '--batch',
+    is_flag=True,
+    help='Send the requests through the OpenAI batch API, one batch per stage; slower but cheaper',
+)
+@click.option('--output', type=click.Path(path_type=Path), help='Write the ranked results as JSON')
+def screen(
+    resumes_dir: Path,
+    job_desc_path: Path,
+    cascade: bool,
+    shortlist_size: Optional[int],
+    shortlist_min_score: Optional[int],
+    batch: bool,
+    output: Optional[Path],
+):
+    """Rank a directory of resumes against a job description."""
+    from pydantic import TypeAdapter
+
+    from src.client import AIClient
+    from src.dedup import get_deduplicator
+    from src.entities import ModelTier, RankedMatchResult
+    from src.results import get_results_store
+    from src.services import ResumeAnalysisService
+
+    if batch:
+        from src.batch import BatchAIClient, create_batch_runner
+
+        runner = create_batch_runner()
+        client = BatchAIClient(runner, max_tokens=2000)
+        strong_client = BatchAIClient(runner, max_tokens=2000, tier=ModelTier.STRONG) if cascade else None
+    else:
+        client = AIClient(model_type=ModelType.OPENAI, max_tokens=2000)
+        strong_client = (
+            AIClient(model_type=ModelType.OPENAI, max_tokens=2000, tier=ModelTier.STRONG) if cascade else None
+        )
+    service = ResumeAnalysisService(
+        client, store=get_results_store(), deduplicator=get_deduplicator(), strong_client=strong_client
+    )
+
+    paths, resume_texts = [], []
+    for path in sorted(p for p in resumes_dir.iterdir() if p.is_file()):
+        try:
+            resume_texts.append(service.extractors.extract(path))
+            paths.append(path)
+        except Exception as e:
+            logger.error(f"Skipping {path.name}: {str(e)}")
+    job_description = job_desc_path.read_text()
+
+    ranked = asyncio.run(
+        service.screen_resumes(
+            resume_texts,
+            job_description,
+            shortlist_size=shortlist_size,
+            shortlist_min_score=shortlist_min_score,
+            # A batch round only holds the resumes in flight, so run them all at once
+            concurrency=len(resume_texts) if batch else None,
+        )
+    )
+    click.echo(f"{'rank':>4}{'score':>7}  {'tier':<8}resume")
+    for item in ranked:
+        click.echo(f"{item.rank:>4}{item.result.overall_score:>7}  {item.result.tier.value:<8}{paths[item.index].name}")
+    if output:
+        output.write_text(TypeAdapter(List[RankedMatchResult]).dump_json(ranked, indent=2).decode())
+
+
+@cli.command()
+@click.option(
+    '--input',
+    'input_path',
+    type=click.Path(exists=True, path_type=Path),
+    required=True,
+    help='Directory of resumes, JSON Lines file or manifest with one resume path per line',
+)
+@click.option(
+    '--job_desc_path',
+    type=click.Path(exists=True, path_type=Path),
+    required=True,
+    help='Path to the job description file',
+)
+@click.option('--output', type=click.Path(path_type=Path), required=True, help='JSON Lines file of the results')
+@click.option(
+    '--min_score',
+    type=click.IntRange(0, 100),
+    help='Stop evaluating once the candidate can no longer reach this overall score',
+)
+@click.option(
+    '--concurrency',
+    type=click.IntRange(min=1),
+    default=settings.pipeline_concurrency,
+    show_default=True,
+    help='Workers per stage',
+)
+@click.option(
+    '--queue_size',
+    type=click.IntRange(min=1),
+    default=settings.pipeline_queue_size,
+    show_default=True,
+    help='Resumes waiting between two stages at most',
+)
+@click.option(
+    '--journal/--no-journal',
+    default=True,
+    show_default=True,
+    help='Skip resumes completed by an earlier run of the same job and record progress for the next one',
+)
+def pipeline(
+    input_path: Path,
+    job_desc_path: Path,
+    output: Path,
+    min_score: Optional[int],
+    concurrency: int,
+    queue_size: int,
+    journal: bool,
+):
+    """Stream any number of resumes through the analysis, writing each result as it is scored."""
+    from src.client import AIClient
+    from src.dedup import get_deduplicator
+    from src.journal import get_progress_journal
+    from src.pipeline import ResumePipeline, iter_inputs
+    from src.results import get_results_store
+    from src.services import ResumeAnalysisService
+
+    client = AIClient(model_type=ModelType.OPENAI, max_tokens=2000)
+    service = ResumeAnalysisService(client, store=get_results_store(), deduplicator=get_deduplicator())
+    resume_pipeline = ResumePipeline(
+        service,
+        output,
+        queue_size=queue_size,
+        concurrency=concurrency,
+        min_score=min_score,
+        journal=get_progress_journal() if journal else None,
+    )
+
+    try:
+        stats = asyncio.run(resume_pipeline.run(iter_inputs(input_path), job_desc_path.read_text()))
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(
+        f"Completed {stats.completed} ({stats.resumed} resumed), failed {stats.failed}, "
+        f"skipped {stats.skipped} completed earlier; results in {output}"
+    )
+
+
 @cli.command()
 def start_server():
+    import uvicorn
+
     uvicorn.run(
         app="src.server:app",
         host=settings.app_host,
@@ -67,5 +293,171 @@ def start_server():
     )
 
 
+@cli.command()
+@click.option(
+    '--concurrency',
+    type=click.IntRange(min=1),
+    default=settings.worker_concurrency,
+    show_default=True,
+    help='Number of analyses processed in parallel',
+)
+def worker(concurrency: int):
+    """Process queued resume analyses in the background."""
+    from src.client import AIClient
+    from src.dedup import get_deduplicator
+    from src.results import get_results_store
+    from src.services import ResumeAnalysisService
+    from src.tasks import TaskWorker, get_task_queue
+
+    client = AIClient(model_type=ModelType.OPENAI, max_tokens=2000)
+    service = ResumeAnalysisService(client, store=get_results_store(), deduplicator=get_deduplicator())
+    task_worker = TaskWorker(queue=get_task_queue(), service=service, concurrency=concurrency)
+
+    try:
+        asyncio.run(task_worker.run())
+    except KeyboardInterrupt:
+        logger.info("Worker stopped")
+
+
+@cli.command()
+@click.option(
+    '--results_path',
+    type=click.Path(exists=True, path_type=Path),
+    required=True,
+    help='JSON array or JSON Lines file of stored analysis results',
+)
+@click.option(
+    '--weight',
+    'weights',
+    multiple=True,
+    help='Emphasis weight as name=value, e.g. technical_skills=60; unset weights keep their defaults',
+)
+@click.option('--output', type=click.Path(path_type=Path), help='Write the ranked results as JSON')
+def rerank(results_path: Path, weights: Tuple[str, ...], output: Optional[Path]):
+    """Re-weight stored results and rank them without calling the model."""
+    from pydantic import TypeAdapter, ValidationError
+
+    from src.analysis import rerank_results
+    from src.entities import DetailedMatchResult, Emphasis, RankedMatchResult
+
+    overrides = {}
+    for weight in weights:
+        name, _, value = weight.partition('=')
+        field_name = name if name.endswith('_weight') else f"{name}_weight"
+        if field_name not in Emphasis.model_fields or not value.isdigit():
+            raise click.BadParameter(f"{weight!r}, expected one of {', '.join(Emphasis.model_fields)}=0..100")
+        overrides[field_name] = int(value)
+
+    text = results_path.read_text()
+    try:
+        emphasis = Emphasis(**overrides)
+        if text.lstrip().startswith('['):
+            results = TypeAdapter(List[DetailedMatchResult]).validate_json(text)
+        else:
+            results = [DetailedMatchResult.model_validate_json(line) for line in text.splitlines() if line.strip()]
+    except ValidationError as e:
+        raise click.ClickException(str(e))
+
+    ranked = rerank_results(results, emphasis)
+    click.echo(f"{'rank':>4}{'index':>7}{'score':>7}{'high':>6}{'medium':>8}  candidate")
+    for item in ranked:
+        result = item.result
+        candidate = (result.contact and result.contact.email) or result.website or ""
+        click.echo(
+            f"{item.rank:>4}{item.index:>7}{result.overall_score:>7}"
+            f"{len(result.red_flags.get('high', [])):>6}{len(result.red_flags.get('medium', [])):>8}  {candidate}"
+        )
+    if output:
+        output.write_text(TypeAdapter(List[RankedMatchResult]).dump_json(ranked, indent=2).decode())
+
+
+@cli.group()
+def cache():
+    """Inspect and trim the response cache. Safe to run while the server is live."""
+    pass
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+@cache.command()
+@click.option('--reset', is_flag=True, help='Reset the hit and miss counters after reporting')
+def stats(reset: bool):
+    """Report entries and bytes by payload type, and the hit ratio."""
+    from src.cache import DiskCache
+
+    disk_cache = DiskCache()
+    try:
+        cache_stats = disk_cache.stats()
+    except ValueError as e:
+        if not reset:
+            raise click.ClickException(f"Corrupt cache counters, reset them with --reset: {e}")
+        disk_cache.reset_stats()
+        cache_stats = disk_cache.stats()
+
+    click.echo(f"Cache directory: {disk_cache.directory}")
+    click.echo(f"{'type':<24}{'entries':>10}{'size':>12}")
+    for payload_type in sorted(cache_stats.entries):
+        size = _format_bytes(cache_stats.bytes[payload_type])
+        click.echo(f"{payload_type:<24}{cache_stats.entries[payload_type]:>10}{size:>12}")
+    click.echo(f"{'total':<24}{cache_stats.total_entries:>10}{_format_bytes(cache_stats.total_bytes):>12}")
+
+    ratio = f"{cache_stats.hit_ratio:.1%}" if cache_stats.hit_ratio is not None else "n/a"
+    click.echo(f"Hits: {cache_stats.hits}, misses: {cache_stats.misses}, hit ratio: {ratio}")
+    if reset:
+        disk_cache.reset_stats()
+
+
+@cache.command()
+@click.option('--max-size', type=SizeType(), help='Evict least recently used entries above this size, e.g. 500M')
+@click.option('--max-age', type=DurationType(), help='Evict entries not used for this long, e.g. 7d')
+@click.option('--dry-run', is_flag=True, help='Only list what would be removed')
+def prune(max_size: Optional[int], max_age: Optional[float], dry_run: bool):
+    """Evict entries by age and size in least recently used order."""
+    from src.cache import DiskCache
+
+    if max_size is None and max_age is None:
+        raise click.UsageError("Pass --max-size and/or --max-age")
+
+    removed = DiskCache().prune(max_bytes=max_size, max_age=max_age, dry_run=dry_run)
+    click.echo(f"{'Would remove' if dry_run else 'Removed'} {len(removed)} entries")
+
+
+@cache.command()
+@click.option('--dry-run', is_flag=True, help='Only list corrupt entries')
+def verify(dry_run: bool):
+    """Remove entries that cannot be read back."""
+    from src.cache import DiskCache
+
+    corrupt = DiskCache().verify(dry_run=dry_run)
+    for path in corrupt:
+        click.echo(f"Corrupt: {path.name}")
+    click.echo(f"{'Found' if dry_run else 'Removed'} {len(corrupt)} corrupt entries")
+
+
+@cli.command()
+@click.option('--kind', type=click.Choice(['job', 'resume']), default='job', show_default=True)
+@click.option('--output', type=click.Path(path_type=Path), help='Write the deduplicated documents as JSON')
+def dedup_report(kind: str, output: Optional[Path]):
+    """List documents matched to a near-duplicate seen before."""
+    from pydantic import TypeAdapter
+
+    from src.dedup import FingerprintIndex
+    from src.entities import DuplicateRecord
+
+    index = FingerprintIndex()
+    records = index.duplicates(kind)
+    for record in records:
+        click.echo(f"{record.text_hash[:12]} -> {record.duplicate_of[:12]}  similarity {record.similarity:.2f}")
+    click.echo(f"Deduplicated {len(records)} of {index.count(kind)} indexed {kind} documents")
+
+    if output:
+        output.write_text(TypeAdapter(List[DuplicateRecord]).dump_json(records, indent=2).decode())
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict
+
+from prometheus_client import Counter, Gauge, Histogram
+
+if TYPE_CHECKING:
+    from pydantic_ai.usage import Usage
+
+LLM_LABELS = ("provider", "model", "stage")
+
+# Usage detail keys reporting prompt tokens served from the provider prefix cache
+CACHED_TOKENS_DETAILS = ("cache_read_input_tokens", "cached_tokens")
+# Usage detail keys reporting prompt tokens written to the provider prefix cache
+CACHE_WRITE_TOKENS_DETAILS = ("cache_creation_input_tokens",)
+
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+
+
+@dataclass(frozen=True)
+class TokenPrice:
+    """USD price per million tokens."""
+
+    input: float
+    output: float
+    cached_input: float
+    cache_write: float
+
+
+MODEL_PRICES: Dict[str, TokenPrice] = {
+    # OpenAI caches prefixes automatically and bills cache writes as regular input
+    "gpt-4o": TokenPrice(input=2.50, output=10.00, cached_input=1.25, cache_write=2.50),
+    "gpt-4o-mini": TokenPrice(input=0.15, output=0.60, cached_input=0.075, cache_write=0.15),
+    # Anthropic bills cache writes at 1.25x the input price
+    "claude-3-5-sonnet-latest": TokenPrice(input=3.00, output=15.00, cached_input=0.30, cache_write=3.75),
+    "claude-3-5-haiku-latest": TokenPrice(input=0.80, output=4.00, cached_input=0.08, cache_write=1.00),
+}
+
+LLM_REQUESTS = Counter(
+    "cv_matcher_llm_requests_total",
+    "Provider requests made by AIClient",
+    LLM_LABELS + ("outcome",),
+)
+LLM_CACHE_HITS = Counter(
+    "cv_matcher_llm_cache_hits_total",
+    "AIClient calls answered from the local response cache",
+    LLM_LABELS,
+)
+LLM_TOKENS = Counter(
+    "cv_matcher_llm_tokens_total",
+    "Tokens processed by the provider",
+    LLM_LABELS + ("type",),
+)
+LLM_TOKENS_PER_REQUEST = Histogram(
+    "cv_matcher_llm_tokens_per_request",
+    "Tokens processed by the provider per request",
+    LLM_LABELS + ("type",),
+    buckets=TOKEN_BUCKETS,
+)
+LLM_LATENCY = Histogram(
+    "cv_matcher_llm_request_duration_seconds",
+    "Provider request latency",
+    LLM_LABELS,
+    buckets=LATENCY_BUCKETS,
+)
+LLM_COST = Counter(
+    "cv_matcher_llm_cost_usd_total",
+    "Estimated provider cost in USD",
+    LLM_LABELS,
+)
+STAGE_LATENCY = Histogram(
+    "cv_matcher_stage_duration_seconds",
+    "Analysis pipeline stage latency",
+    ("stage", "outcome"),
+    buckets=(0.01, 0.05, 0.1) + LATENCY_BUCKETS,
+)
+
+ADMISSION_ANALYSES = Gauge(
+    "cv_matcher_admission_analyses",
+    "Analyses admitted by the admission controller, by state",
+    ("state",),
+)
+ADMISSION_WAIT = Histogram(
+    "cv_matcher_admission_wait_seconds",
+    "Time admitted analyses waited for a free slot",
+    buckets=(0.01, 0.05, 0.1) + LATENCY_BUCKETS,
+)
+ADMISSION_REJECTIONS = Counter(
+    "cv_matcher_admission_rejections_total",
+    "Analyses turned away by the admission controller",
+    ("reason",),
+)
+
+
+def get_cached_tokens(usage: "Usage") -> int:
+    """Return the number of prompt tokens that were read from the provider cache."""
+    details = usage.details or {}
+    return sum(details.get(key, 0) for key in CACHED_TOKENS_DETAILS)
+
+
+def get_cache_write_tokens(usage: "Usage") -> int:
+    """Return the number of prompt tokens that were written to the provider cache."""
+    details = usage.details or {}
+    return sum(details.get(key, 0) for key in CACHE_WRITE_TOKENS_DETAILS)
+
+
+def estimate_cost(model: str, usage: "Usage") -> float:
+    """Estimate the USD cost of a request; unknown models are counted as free."""
+    price = MODEL_PRICES.get(model)
+    if price is None:
+        return 0.0
+
+    cached_tokens = get_cached_tokens(usage)
+    written_tokens = get_cache_write_tokens(usage)
+    uncached_tokens = max((usage.request_tokens or 0) - cached_tokens - written_tokens, 0)
+    return (
+        uncached_tokens * price.input
+        + cached_tokens * price.cached_input
+        + written_tokens * price.cache_write
+        + (usage.response_tokens or 0) * price.output
+    ) / 1_000_000
+
+
+def record_cache_hit(provider: str, model: str, stage: str) -> None:
+    LLM_CACHE_HITS.labels(provider, model, stage).inc()
+
+
+def record_request_error(provider: str, model: str, stage: str, duration: float) -> None:
+    LLM_REQUESTS.labels(provider, model, stage, "error").inc()
+    LLM_LATENCY.labels(provider, model, stage).observe(duration)
+
+
+def record_usage(provider: str, model: str, stage: str, usage: "Usage", duration: float) -> None:
+    """Record token counts, latency and estimated cost of a successful provider request."""
+    LLM_REQUESTS.labels(provider, model, stage, "success").inc()
+    LLM_LATENCY.labels(provider, model, stage).observe(duration)
+
+    tokens = {
+        "request": usage.request_tokens or 0,
+        "response": usage.response_tokens or 0,
+        "cached": get_cached_tokens(usage),
+    }
+    for token_type, count in tokens.items():
+        LLM_TOKENS.labels(provider, model, stage, token_type).inc(count)
+        LLM_TOKENS_PER_REQUEST.labels(provider, model, stage, token_type).observe(count)
+
+    LLM_COST.labels(provider, model, stage).inc(estimate_cost(model, usage))
+
+
+def record_stage(stage: str, outcome: str, duration: float) -> None:
+    STAGE_LATENCY.labels(stage, outcome).observe(duration)
+
+
+def record_admission_state(running: int, queued: int) -> None:
+    ADMISSION_ANALYSES.labels("running").set(running)
+    ADMISSION_ANALYSES.labels("queued").set(queued)
+
+
+def record_admission_wait(duration: float) -> None:
+    ADMISSION_WAIT.observe(duration)
+
+
+def record_admission_rejection(reason: str) -> None:
+    ADMISSION_REJECTIONS.labels(reason).inc()
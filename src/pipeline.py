@@ -0,0 +1,259 @@
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable, Iterator, Optional
+
+from src.conf import settings
+from src.entities import (
+    DetailedMatchResult,
+    JobRequirements,
+    JournalStage,
+    NearDuplicate,
+    PipelineRecord,
+    UnifiedResume,
+)
+from src.journal import ProgressJournal, get_config_version
+from src.logger import TimeLogger, create_logger
+from src.results import text_hash
+from src.services import ResumeAnalysisService
+
+logger = create_logger(__name__)
+
+
+@dataclass
+class PipelineItem:
+    """One resume on its way through the stages; it only holds what the next stage needs."""
+
+    item_id: str
+    path: Optional[Path] = None
+    text: Optional[str] = None
+    resume_hash: Optional[str] = None
+    resume: Optional[UnifiedResume] = None
+    duplicate_of: Optional[NearDuplicate] = None
+    result: Optional[DetailedMatchResult] = None
+    error: Optional[str] = None
+    journaled: bool = False
+    """Completed by an earlier run; passed through without work and written with its journaled result."""
+
+
+@dataclass
+class PipelineStats:
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    """Completed by an earlier run."""
+    resumed: int = 0
+    """Unified by an earlier run and only scored in this one."""
+
+
+def iter_directory(directory: Path) -> Iterator[PipelineItem]:
+    """Files of a directory in listing order, without reading the whole listing first."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                yield PipelineItem(item_id=entry.name, path=Path(entry.path))
+
+
+def iter_manifest(manifest: Path) -> Iterator[PipelineItem]:
+    """One resume path per line, relative to the manifest; blank lines and `#` comments are skipped."""
+    with open(manifest) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield PipelineItem(item_id=line, path=manifest.parent / line)
+
+
+def iter_jsonl(source: Path) -> Iterator[PipelineItem]:
+    """
+    Objects with an optional `id` and either the `resume_text` itself or a `path` to the resume file.
+
+    A line that is not a JSON object becomes a failed item, identified by its line number, so the run goes on.
+    """
+    with open(source) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield PipelineItem(item_id=str(number), error=f"read: Invalid JSON: {e}")
+                continue
+            if not isinstance(data, dict):
+                yield PipelineItem(item_id=str(number), error="read: Line is not a JSON object")
+                continue
+            path = data.get("path")
+            yield PipelineItem(
+                item_id=str(data.get("id", number)),
+                path=source.parent / path if path else None,
+                text=data.get("resume_text"),
+            )
+
+
+def iter_inputs(source: Path) -> Iterator[PipelineItem]:
+    """Resumes from a directory, a `.jsonl` file or a manifest of paths."""
+    if source.is_dir():
+        return iter_directory(source)
+    if source.suffix == ".jsonl":
+        return iter_jsonl(source)
+    return iter_manifest(source)
+
+
+Handler = Callable[[PipelineItem], Awaitable[None]]
+
+
+@dataclass
+class ResumePipeline:
+    """
+    Streams resumes through conversion, unification and scoring into a JSON Lines file.
+
+    Stages are connected by queues of `queue_size` items and each runs `concurrency` workers, so a slow stage
+    holds back the ones before it and at most a few queues' worth of resumes is in memory at a time, however
+    many are read. Before unification each resume goes through the service's near-duplicate check, which flags
+    `duplicate_of` and, with reuse on, takes the stored analysis instead of scoring it again. Each result is
+    written and stored as soon as it is scored; a resume that fails at any stage is written with its error and
+    skips the remaining stages.
+
+    With a `journal` the run is resumable: a restarted run skips resumes already completed for this job and
+    configuration, writing their journaled results, and scores those that were unified from their journaled
+    unified resume. The output therefore holds every result of the run whichever output path it is given.
+    """
+
+    service: ResumeAnalysisService
+    output: Path
+    queue_size: int = field(default_factory=lambda: settings.pipeline_queue_size)
+    concurrency: int = field(default_factory=lambda: settings.pipeline_concurrency)
+    min_score: Optional[int] = None
+    """Passed to `JobAnalyzer.match_resume`, stopping the scoring of candidates that cannot reach it."""
+    journal: Optional[ProgressJournal] = None
+    _job_hash: str = field(default="", init=False, repr=False)
+    _config_version: str = field(default="", init=False, repr=False)
+    _stats: PipelineStats = field(default_factory=PipelineStats, init=False, repr=False)
+
+    async def run(self, items: Iterable[PipelineItem], job_description: str) -> PipelineStats:
+        async with TimeLogger("Extracting job requirements", stage="extract_requirements"):
+            job_requirements = await self.service.extract_job_requirements(job_description)
+            if not job_requirements:
+                raise ValueError("Could not extract job requirements")
+
+        self._job_hash = text_hash(job_description)
+        self._config_version = get_config_version(self.min_score, getattr(self.service.client, "max_tokens", None))
+        self._stats = stats = PipelineStats()
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(4)]
+        await asyncio.gather(
+            self._read(items, queues[0]),
+            self._stage("convert", self._convert, queues[0], queues[1], self.concurrency),
+            self._stage(
+                "unify", lambda item: self._unify(item, job_description), queues[1], queues[2], self.concurrency
+            ),
+            self._stage(
+                "score",
+                lambda item: self._score(item, job_description, job_requirements),
+                queues[2],
+                queues[3],
+                self.concurrency,
+                downstream_workers=1,
+            ),
+            self._write(queues[3], job_description, stats),
+        )
+        return stats
+
+    async def _read(self, items: Iterable[PipelineItem], outbox: asyncio.Queue) -> None:
+        for item in items:
+            await outbox.put(item)
+        for _ in range(self.concurrency):
+            await outbox.put(None)
+
+    async def _stage(
+        self,
+        name: str,
+        handler: Handler,
+        inbox: asyncio.Queue,
+        outbox: asyncio.Queue,
+        workers: int,
+        downstream_workers: Optional[int] = None,
+    ) -> None:
+        """Run `handler` on every item with `workers` tasks, then tell each downstream worker to stop."""
+
+        async def work():
+            while (item := await inbox.get()) is not None:
+                if item.error is None and not item.journaled:
+                    try:
+                        await handler(item)
+                    except Exception as e:
+                        logger.error(f"Failed to {name} {item.item_id}: {str(e)}")
+                        item.error = f"{name}: {str(e)}"
+                await outbox.put(item)
+
+        await asyncio.gather(*(work() for _ in range(workers)))
+        for _ in range(downstream_workers or self.concurrency):
+            await outbox.put(None)
+
+    async def _convert(self, item: PipelineItem) -> None:
+        if item.text is None:
+            if item.path is None:
+                raise ValueError("Neither resume_text nor path is given")
+            item.text = await asyncio.to_thread(self.service.extractors.extract, item.path)
+        if not item.text.strip():
+            raise ValueError("Could not extract text from resume")
+        item.resume_hash = text_hash(item.text)
+        if self.journal is None:
+            return
+
+        entry = await asyncio.to_thread(self.journal.get, item.resume_hash, self._job_hash, self._config_version)
+        if entry is not None and entry.stage == JournalStage.COMPLETED:
+            item.journaled = True
+            item.result = entry.result
+        elif entry is not None and entry.unified is not None:
+            item.resume = entry.unified
+            self._stats.resumed += 1
+
+    async def _unify(self, item: PipelineItem, job_description: str) -> None:
+        if item.resume is not None:
+            return
+        item.duplicate_of, item.result = await self.service.check_duplicates(item.text, job_description)
+        if item.result is not None:
+            return
+        item.resume = await self.service.analyzer.parse_resume(item.text)
+        if not item.resume or not item.resume.markdown:
+            raise ValueError("Could not unify resume")
+        if self.journal is not None:
+            await asyncio.to_thread(
+                self.journal.save_unified, item.resume_hash, self._job_hash, self._config_version, item.resume
+            )
+
+    async def _score(self, item: PipelineItem, job_description: str, job_requirements: JobRequirements) -> None:
+        if item.result is not None:
+            # Reused from a near-duplicate resume
+            return
+        item.result = await self.service.analyzer.match_resume(
+            resume_text=item.resume.markdown,
+            job_description=job_description,
+            job_requirements=job_requirements,
+            contact=item.resume.contact,
+            min_score=self.min_score,
+        )
+        item.result.duplicate_of = item.duplicate_of
+        item.resume = None
+
+    async def _write(self, inbox: asyncio.Queue, job_description: str, stats: PipelineStats) -> None:
+        with open(self.output, "w") as f:
+            while (item := await inbox.get()) is not None:
+                if item.journaled:
+                    stats.skipped += 1
+                elif item.result is not None:
+                    await self.service.store_result(item.text, job_description, item.result)
+                    stats.completed += 1
+                else:
+                    stats.failed += 1
+                record = PipelineRecord(
+                    id=item.item_id, resume_hash=item.resume_hash, result=item.result, error=item.error
+                )
+                f.write(record.model_dump_json(exclude_none=True) + "\n")
+                f.flush()
+                # Journaled only once written, so a crash in between re-runs the item rather than losing it
+                if self.journal is not None and item.result is not None and not item.journaled:
+                    await asyncio.to_thread(
+                        self.journal.save_result, item.resume_hash, self._job_hash, self._config_version, item.result
+                    )
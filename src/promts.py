@@ -5,6 +5,13 @@ EXTRACT_REQUIREMENTS_PROMT = """
     {job_description}
 """
 
+EXTRACT_LOCATION_PROMT = """
+    Extract the country and city where the following job is located.
+
+    Job Description:
+    {job_description}
+"""
+
 RESUME_WEBSITE_PROMT = """
     Extract the candidate's professional website URL from the resume.
     Only output the URL, no explanation. If none found, output empty string.
@@ -13,7 +20,39 @@ RESUME_WEBSITE_PROMT = """
     {resume_text}
 """
 
+RESUME_CONTACT_PROMT = """
+    Return the unified resume in the `markdown` field.
+    Also extract the candidate's contact details from the raw resume text into `contact`:
+    - website: the professional website URL, or null if none
+    - email: the email address, or null if none
+    - links: every other profile or portfolio URL (GitHub, LinkedIn, ...)
+    Only use values present in the raw text.
+"""
+
+ANALYSIS_CONTEXT_PROMT = """
+    Resume:
+    {resume_text}
+
+    Job Requirements:
+    {job_requirements}
+"""
+
+CRITERION_EVALUATION_PROMT = """
+    Evaluate the candidate's resume above for the criterion: "{criterion_name}"
+
+    Criterion Description: {criterion_description}
+
+    Factors to consider:
+    {criterion_factors}
+
+    Provide your evaluation as an integer score from 0 to 100.
+    Only return the integer score, no explanation needed.
+"""
+
 MATCH_REASONS_PROMT = """
+    Job Description:
+    {job_description}
+
     Based on the evaluation scores:
     {criteries}
     
@@ -40,12 +79,6 @@ MATCH_REASONS_PROMT = """
 
     **Recommendation**
     Conclude with a clear hiring recommendation based on the technical qualification profile.
-    
-    Resume:
-    {resume_text}
-    
-    Job Description:
-    {job_description}
 """
 
 RESUME_INIFIRED_PROMT = """
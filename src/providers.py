@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from anthropic import AsyncAnthropic
+from anthropic.types import Message as AnthropicMessage
+from anthropic.types import MessageParam, TextBlockParam
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import AgentModel, cached_async_http_client
+from pydantic_ai.models.anthropic import AnthropicAgentModel, AnthropicModel
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.tools import ToolDefinition
+from pydantic_ai.usage import Usage
+
+
+@dataclass
+class CachingAnthropicAgentModel(AnthropicAgentModel):
+    """Anthropic agent model that sends the shared prompt prefix as a `cache_control` block."""
+
+    cache_prefix: str = ""
+
+    async def request(
+        self, messages: List[ModelMessage], model_settings: Optional[ModelSettings]
+    ) -> Tuple[ModelResponse, Usage]:
+        response = await self._messages_create(messages, False, model_settings)
+        return self._process_response(response), self._map_usage(response)
+
+    async def _messages_create(self, messages, stream, model_settings):
+        self.cache_prefix = (model_settings or {}).get("prompt_cache_prefix", "")
+        return await super()._messages_create(messages, stream, model_settings)
+
+    def _map_message(self, messages: List[ModelMessage]) -> Tuple[str, List[MessageParam]]:
+        system_prompt, anthropic_messages = AnthropicAgentModel._map_message(messages)
+        if not self.cache_prefix:
+            return system_prompt, anthropic_messages
+
+        for message in anthropic_messages:
+            content = message["content"]
+            if message["role"] != "user" or not isinstance(content, str) or not content.startswith(self.cache_prefix):
+                continue
+
+            blocks = [
+                TextBlockParam(type="text", text=self.cache_prefix, cache_control={"type": "ephemeral"}),
+            ]
+            if len(content) > len(self.cache_prefix):
+                blocks.append(TextBlockParam(type="text", text=content[len(self.cache_prefix) :]))
+            message["content"] = blocks
+            break
+
+        return system_prompt, anthropic_messages
+
+    @staticmethod
+    def _map_usage(response: AnthropicMessage) -> Usage:
+        usage = response.usage
+        details = {
+            key: value
+            for key, value in (
+                ("cache_creation_input_tokens", usage.cache_creation_input_tokens),
+                ("cache_read_input_tokens", usage.cache_read_input_tokens),
+            )
+            if value
+        }
+        # Anthropic reports cache reads and writes apart from `input_tokens`; fold them back in
+        # so `request_tokens` means the full prompt size for both providers.
+        request_tokens = usage.input_tokens + sum(details.values())
+        return Usage(
+            request_tokens=request_tokens,
+            response_tokens=usage.output_tokens,
+            total_tokens=request_tokens + usage.output_tokens,
+            details=details or None,
+        )
+
+
+class CachingAnthropicModel(AnthropicModel):
+    """Anthropic model with explicit prompt-prefix cache breakpoints."""
+
+    def __init__(self, model_name: str, *, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        if base_url:
+            client = AsyncAnthropic(api_key=api_key, base_url=base_url, http_client=cached_async_http_client())
+            super().__init__(model_name, anthropic_client=client)
+        else:
+            super().__init__(model_name, api_key=api_key)
+
+    async def agent_model(
+        self,
+        *,
+        function_tools: List[ToolDefinition],
+        allow_text_result: bool,
+        result_tools: List[ToolDefinition],
+    ) -> AgentModel:
+        agent_model = await super().agent_model(
+            function_tools=function_tools,
+            allow_text_result=allow_text_result,
+            result_tools=result_tools,
+        )
+        return CachingAnthropicAgentModel(
+            agent_model.client,
+            agent_model.model_name,
+            agent_model.allow_text_result,
+            agent_model.tools,
+        )
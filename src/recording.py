@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import json
+import threading
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Type, Union
+
+from pydantic import BaseModel
+from pydantic_ai.usage import Usage
+
+from src.conf import settings
+from src.entities import ArchiveMode
+from src.logger import create_logger
+
+logger = create_logger(__name__)
+
+
+class ReplayMissError(LookupError):
+    """The archive holds no recorded response for a request."""
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so prompts differing only in indentation share a key."""
+    return " ".join(text.split())
+
+
+def get_request_key(
+    provider: str,
+    model_name: str,
+    prompt: str,
+    system_prompt: str,
+    result_type: Optional[Type[BaseModel]] = None,
+) -> str:
+    """Stable key of a provider request; sampling settings are deliberately left out."""
+    request = {
+        "provider": provider,
+        "model": model_name,
+        "system_prompt": normalize_text(system_prompt),
+        "prompt": normalize_text(prompt),
+        "result_type": result_type.__name__ if result_type else None,
+    }
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+
+@dataclass
+class RecordedResponse:
+    key: str
+    stage: str
+    data: Any
+    usage: Dict[str, Any]
+    latency: float
+
+    def to_result(self, result_type: Optional[Type[BaseModel]] = None) -> Union[str, BaseModel]:
+        return result_type.model_validate(self.data) if result_type else self.data
+
+    def to_usage(self) -> Usage:
+        return Usage(**self.usage)
+
+
+@dataclass
+class ProviderArchive:
+    """
+    JSON Lines archive of provider responses.
+
+    In record mode every provider response is appended together with its usage and latency.
+    In replay mode responses are served back by request key; when a request was recorded several
+    times its responses are replayed in the recorded order, cycling once exhausted.
+    """
+
+    path: Path
+    mode: ArchiveMode = ArchiveMode.RECORD
+    latency_scale: float = 1.0
+    """Multiplier applied to recorded latencies on replay; 0 replays without delay."""
+    _responses: Optional[Dict[str, Deque[RecordedResponse]]] = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        self.path = Path(self.path)
+
+    def record(
+        self, key: str, stage: str, data: Union[str, BaseModel], usage: Usage, latency: float
+    ) -> RecordedResponse:
+        response = RecordedResponse(
+            key=key,
+            stage=stage,
+            data=data if isinstance(data, str) else data.model_dump(mode="json"),
+            usage=asdict(usage),
+            latency=latency,
+        )
+        line = json.dumps(asdict(response)) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(line)
+        return response
+
+    def _load(self) -> Dict[str, Deque[RecordedResponse]]:
+        with self._lock:
+            if self._responses is None:
+                responses: Dict[str, Deque[RecordedResponse]] = defaultdict(deque)
+                with open(self.path) as f:
+                    for number, line in enumerate(f, 1):
+                        try:
+                            response = RecordedResponse(**json.loads(line))
+                        except (ValueError, TypeError) as e:
+                            logger.warning(f"Skipping malformed archive line {number}: {e}")
+                            continue
+                        responses[response.key].append(response)
+                logger.info(f"Loaded {sum(map(len, responses.values()))} recorded responses from {self.path}")
+                self._responses = responses
+            return self._responses
+
+    def lookup(self, key: str) -> RecordedResponse:
+        recorded = self._load().get(key)
+        if not recorded:
+            raise ReplayMissError(f"No recorded response for request {key} in {self.path}")
+        with self._lock:
+            response = recorded[0]
+            recorded.rotate(-1)
+        return response
+
+    async def replay(self, key: str) -> RecordedResponse:
+        """Return the recorded response after waiting its scaled original latency."""
+        response = self.lookup(key)
+        if self.latency_scale > 0:
+            await asyncio.sleep(response.latency * self.latency_scale)
+        return response
+
+
+@lru_cache(maxsize=None)
+def get_provider_archive() -> Optional[ProviderArchive]:
+    """Archive configured through settings, or None when recording is off."""
+    mode = ArchiveMode(settings.llm_archive_mode)
+    if mode is ArchiveMode.OFF:
+        return None
+    return ProviderArchive(
+        path=Path(settings.llm_archive_path), mode=mode, latency_scale=settings.llm_replay_latency_scale
+    )
@@ -0,0 +1,56 @@
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+from src.serialization import MSGPACK_FORMAT, dumps, is_available
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+_response_media_type: ContextVar[str] = ContextVar("response_media_type", default="application/json")
+
+
+def accepts_msgpack(request: Request) -> bool:
+    """True when the client asked for msgpack and it can be produced; anything else gets JSON."""
+    accept = request.headers.get("accept", "")
+    return is_available(MSGPACK_FORMAT) and any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+
+class FastResponse(JSONResponse):
+    """
+    JSON response rendered with orjson, or msgpack when the request negotiated it through `NegotiatingRoute`.
+
+    FastAPI has already serialized response models to plain data with pydantic, so only encoding is left here.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if _response_media_type.get() == MSGPACK_MEDIA_TYPE:
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return dumps(content, MSGPACK_FORMAT)
+        return dumps(content)
+
+
+class NegotiatingRoute(APIRoute):
+    """
+    Route that lets `FastResponse` answer `Accept: application/msgpack` requests in msgpack.
+
+    Its `FastResponse`s carry `Vary: Accept` so shared caches keep the JSON and msgpack bodies apart.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def negotiate(request: Request) -> Response:
+            token = _response_media_type.set(MSGPACK_MEDIA_TYPE if accepts_msgpack(request) else "application/json")
+            try:
+                response = await handler(request)
+            finally:
+                _response_media_type.reset(token)
+            if isinstance(response, FastResponse):
+                response.headers.add_vary_header("Accept")
+            return response
+
+        return negotiate
@@ -0,0 +1,210 @@
+import hashlib
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import ClassVar, List, Optional, Tuple
+
+from src.conf import settings
+from src.entities import DetailedMatchResult, RedFlagLevel, ResultsPage, StoredMatchResult
+from src.logger import create_logger
+from src.storage import SQLiteStore
+
+logger = create_logger(__name__)
+
+RED_FLAG_LEVELS = [RedFlagLevel.NONE, RedFlagLevel.LOW, RedFlagLevel.MEDIUM, RedFlagLevel.HIGH]
+
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    result_id TEXT PRIMARY KEY,
+    job_hash TEXT NOT NULL,
+    resume_hash TEXT NOT NULL,
+    overall_score INTEGER NOT NULL,
+    red_flag_level INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    UNIQUE (job_hash, resume_hash)
+);
+CREATE INDEX IF NOT EXISTS results_job_score ON results (job_hash, overall_score DESC, result_id);
+CREATE INDEX IF NOT EXISTS results_resume ON results (resume_hash);
+CREATE INDEX IF NOT EXISTS results_score ON results (overall_score DESC, result_id);
+CREATE TABLE IF NOT EXISTS criterion_scores (
+    result_id TEXT NOT NULL REFERENCES results (result_id) ON DELETE CASCADE,
+    job_hash TEXT NOT NULL,
+    criterion_key TEXT NOT NULL,
+    score INTEGER,
+    PRIMARY KEY (result_id, criterion_key)
+);
+CREATE INDEX IF NOT EXISTS criterion_scores_job_key_score
+    ON criterion_scores (job_hash, criterion_key, score DESC);
+"""
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.strip().encode()).hexdigest()
+
+
+def get_red_flag_level(result: DetailedMatchResult) -> RedFlagLevel:
+    """The most severe red flag level with at least one flag."""
+    for level in reversed(RED_FLAG_LEVELS[1:]):
+        if result.red_flags.get(level.value):
+            return level
+    return RedFlagLevel.NONE
+
+
+@dataclass
+class ResultsStore(SQLiteStore):
+    """
+    Analysis results kept in SQLite, one row per (job, resume) pair, indexed for ranking queries.
+
+    Jobs and resumes are identified by the SHA-256 of their text, so re-analyzing a pair replaces its row.
+    Listing pages with a keyset cursor on (overall_score, result_id), so deep pages cost the same as the first.
+    """
+
+    schema: ClassVar[str] = RESULTS_SCHEMA
+    foreign_keys: ClassVar[bool] = True
+
+    path: Path = field(default_factory=lambda: Path(settings.results_store_path))
+
+    def save(self, resume_text: str, job_description: str, result: DetailedMatchResult) -> StoredMatchResult:
+        """Store the result of analyzing `resume_text` against `job_description`, replacing an earlier one."""
+        job_hash, resume_hash = text_hash(job_description), text_hash(resume_text)
+        result_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM results WHERE job_hash = ? AND resume_hash = ?", (job_hash, resume_hash))
+                conn.execute(
+                    "INSERT INTO results (result_id, job_hash, resume_hash, overall_score, red_flag_level, result, "
+                    "created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        result_id,
+                        job_hash,
+                        resume_hash,
+                        result.overall_score,
+                        RED_FLAG_LEVELS.index(get_red_flag_level(result)),
+                        result.model_dump_json(),
+                        now,
+                    ),
+                )
+                conn.executemany(
+                    "INSERT INTO criterion_scores (result_id, job_hash, criterion_key, score) VALUES (?, ?, ?, ?)",
+                    [(result_id, job_hash, criterion.key, criterion.score) for criterion in result.criteria_scores],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self._to_stored(result_id, job_hash, resume_hash, now, result)
+
+    def get(self, result_id: str) -> Optional[StoredMatchResult]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM results WHERE result_id = ?", (result_id,)).fetchone()
+        return self._from_row(row) if row is not None else None
+
+    def find(self, job_hash: str, resume_hash: str) -> Optional[StoredMatchResult]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM results WHERE job_hash = ? AND resume_hash = ?", (job_hash, resume_hash)
+            ).fetchone()
+        return self._from_row(row) if row is not None else None
+
+    def top(
+        self,
+        job_hash: str,
+        k: int = 10,
+        criterion: Optional[str] = None,
+        max_red_flag_level: Optional[RedFlagLevel] = None,
+    ) -> List[StoredMatchResult]:
+        """Best `k` results for a job, by overall score or by the score of one criterion."""
+        max_level = RED_FLAG_LEVELS.index(max_red_flag_level or RedFlagLevel.HIGH)
+        with self._connect() as conn:
+            if criterion is None:
+                rows = conn.execute(
+                    "SELECT * FROM results WHERE job_hash = ? AND red_flag_level <= ? "
+                    "ORDER BY overall_score DESC, result_id LIMIT ?",
+                    (job_hash, max_level, k),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT results.* FROM criterion_scores JOIN results USING (result_id) "
+                    "WHERE criterion_scores.job_hash = ? AND criterion_key = ? AND red_flag_level <= ? "
+                    "ORDER BY score DESC, overall_score DESC, result_id LIMIT ?",
+                    (job_hash, criterion, max_level, k),
+                ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def page(
+        self,
+        job_hash: Optional[str] = None,
+        min_score: Optional[int] = None,
+        max_red_flag_level: Optional[RedFlagLevel] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> ResultsPage:
+        """Results ordered by overall score, best first; pass `next_cursor` back to fetch the following page."""
+        conditions, params = ["red_flag_level <= ?"], [RED_FLAG_LEVELS.index(max_red_flag_level or RedFlagLevel.HIGH)]
+        if job_hash is not None:
+            conditions.append("job_hash = ?")
+            params.append(job_hash)
+        if min_score is not None:
+            conditions.append("overall_score >= ?")
+            params.append(min_score)
+        if cursor is not None:
+            score, result_id = self._parse_cursor(cursor)
+            conditions.append("(overall_score < ? OR (overall_score = ? AND result_id > ?))")
+            params.extend([score, score, result_id])
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM results WHERE {' AND '.join(conditions)} "  # nosec: B608
+                "ORDER BY overall_score DESC, result_id LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+
+        items = [self._from_row(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = f"{last.result.overall_score}:{last.result_id}"
+        return ResultsPage(items=items, next_cursor=next_cursor)
+
+    @staticmethod
+    def _parse_cursor(cursor: str) -> Tuple[int, str]:
+        score, _, result_id = cursor.partition(":")
+        if not score.isdigit() or not result_id:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        return int(score), result_id
+
+    def _from_row(self, row: sqlite3.Row) -> StoredMatchResult:
+        return self._to_stored(
+            row["result_id"],
+            row["job_hash"],
+            row["resume_hash"],
+            row["created_at"],
+            DetailedMatchResult.model_validate_json(row["result"]),
+        )
+
+    @staticmethod
+    def _to_stored(
+        result_id: str, job_hash: str, resume_hash: str, created_at: float, result: DetailedMatchResult
+    ) -> StoredMatchResult:
+        return StoredMatchResult(
+            result_id=result_id,
+            job_hash=job_hash,
+            resume_hash=resume_hash,
+            created_at=datetime.fromtimestamp(created_at, tz=timezone.utc),
+            result=result,
+        )
+
+
+@lru_cache(maxsize=None)
+def get_results_store() -> Optional[ResultsStore]:
+    """Store configured through settings, or None when storing results is disabled."""
+    if not settings.results_store_enabled:
+        return None
+    return ResultsStore()
@@ -1,15 +1,45 @@
+import asyncio
+import math
 import tempfile
+from contextlib import nullcontext
 from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple, Union
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, File, Header, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 
+from src.admission import AdmissionRejected, get_admission_controller
+from src.analysis import rerank_results
 from src.client import AIClient
-from src.entities import DetailedMatchResult, ModelType, PingResponse
+from src.conf import settings
+from src.dedup import get_deduplicator
+from src.entities import (
+    AnalysisEvent,
+    AnalysisEventType,
+    AnalysisTask,
+    CompactResults,
+    DetailedMatchResult,
+    ModelType,
+    PingResponse,
+    RankedMatchResult,
+    RedFlagLevel,
+    RerankRequest,
+    ResultFormat,
+    ResultsPage,
+    StoredMatchResult,
+    TaskStatus,
+)
+from src.formats import compact_ranked, compact_stored
 from src.logger import create_logger
+from src.responses import FastResponse, NegotiatingRoute
+from src.results import ResultsStore, get_results_store
 from src.services import ResumeAnalysisService
+from src.tasks import get_task_queue
 
 logger = create_logger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=NegotiatingRoute, default_response_class=FastResponse)
+
+SSE_PING = ": ping\n\n"
 
 
 @router.get(
@@ -35,6 +65,66 @@ async def save_upload_file(upload_file: UploadFile) -> Path:
         raise HTTPException(status_code=400, detail="Could not process uploaded file")
 
 
+async def read_upload_files(
+    service: ResumeAnalysisService, resume_file: UploadFile, job_description_file: UploadFile
+) -> Tuple[str, str]:
+    """Save the uploaded files, extract their text content and remove the temporary copies."""
+    resume_path = await save_upload_file(resume_file)
+    job_desc_path = await save_upload_file(job_description_file)
+
+    # Extraction is CPU-bound and waits on the PDF workers, so keep it off the event loop
+    resume_text, job_description = await asyncio.to_thread(service.process_files, resume_path, job_desc_path)
+
+    # Clean up temporary files
+    resume_path.unlink()
+    job_desc_path.unlink()
+    return resume_text, job_description
+
+
+def admission_error(rejection: AdmissionRejected) -> HTTPException:
+    """503 when the server is overloaded, 429 when the API key is over its quota, both with a Retry-After."""
+    retry_after = max(1, math.ceil(rejection.retry_after))
+    return HTTPException(
+        status_code=rejection.status_code, detail=rejection.detail, headers={"Retry-After": str(retry_after)}
+    )
+
+
+def format_sse(event: AnalysisEvent) -> str:
+    """Serialize an analysis event as a server-sent event message."""
+    return f"event: {event.event.value}\ndata: {event.model_dump_json(include={'data'})}\n\n"
+
+
+async def with_keepalive(messages: AsyncIterator[str], interval: float) -> AsyncIterator[str]:
+    """
+    Relay server-sent event messages, sending a `: ping` comment whenever none arrives for `interval` seconds.
+
+    A single stage can run for a minute, and proxies close connections that stay idle that long.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce() -> None:
+        try:
+            async for message in messages:
+                queue.put_nowait(message)
+        finally:
+            queue.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=interval)
+            except asyncio.TimeoutError:
+                yield SSE_PING
+                continue
+            if message is None:
+                break
+            yield message
+        await producer
+    finally:
+        producer.cancel()
+
+
 @router.post(
     "/analyze_resume",
     tags=["ai"],
@@ -44,6 +134,8 @@ async def save_upload_file(upload_file: UploadFile) -> Path:
 async def analyze_resume(
     resume_file: UploadFile = File(...),
     job_description_file: UploadFile = File(...),
+    min_score: Optional[int] = Query(default=None, ge=0, le=100),
+    api_key: Optional[str] = Header(default=None, alias="X-API-Key"),
 ):
     """
     Analyze a resume against a job description using uploaded files.
@@ -51,32 +143,233 @@ async def analyze_resume(
     Args:
         resume_file: Uploaded resume file
         job_description_file: Uploaded job description file
+        min_score: Stop evaluating once the candidate can no longer reach this overall score
+        api_key: Client key the per-key concurrency quota is counted against
 
     Returns:
         DetailedMatchResult: Analysis results including match score and details
+
+    Responds 503 when the server is too busy to start the analysis in time and 429 when the API key
+    already has its quota of analyses in progress, with a `Retry-After` header in both cases.
     """
 
     # Initialize the AI client and service
     client = AIClient(model_type=ModelType.OPENAI, max_tokens=2000)
-    service = ResumeAnalysisService(client)
+    service = ResumeAnalysisService(client, store=get_results_store(), deduplicator=get_deduplicator())
+    admission = get_admission_controller()
 
     try:
-        # Save uploaded files to temporary locations
-        resume_path = await save_upload_file(resume_file)
-        job_desc_path = await save_upload_file(job_description_file)
-
-        # Process the files and get text content
-        resume_text, job_description = service.process_files(resume_path, job_desc_path)
-
-        # Clean up temporary files
-        resume_path.unlink()
-        job_desc_path.unlink()
+        # Shed load before spending anything on the upload
+        if admission:
+            admission.check(api_key)
+        resume_text, job_description = await read_upload_files(service, resume_file, job_description_file)
 
         # Analyze the resume
-        result = await service.analyze_resume(resume_text, job_description)
+        async with admission.admit(api_key) if admission else nullcontext():
+            result = await service.analyze_resume(resume_text, job_description, min_score=min_score)
         if not result:
             raise HTTPException(status_code=500, detail="Analysis failed to produce results")
         return result
+    except AdmissionRejected as e:
+        raise admission_error(e)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error during analysis: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/analyze_resume/stream",
+    tags=["ai"],
+    summary="Analyze a resume against a job description, streaming progress as server-sent events",
+    response_class=StreamingResponse,
+)
+async def analyze_resume_stream(
+    resume_file: UploadFile = File(...),
+    job_description_file: UploadFile = File(...),
+    min_score: Optional[int] = Query(default=None, ge=0, le=100),
+    api_key: Optional[str] = Header(default=None, alias="X-API-Key"),
+):
+    """
+    Analyze a resume against a job description, emitting an event as each stage completes.
+
+    Events, in order: `requirements`, `resume`, one `criterion` per scoring criterion,
+    `match_reasons` and `result` with the final DetailedMatchResult. A failure ends the
+    stream with an `error` event. With `min_score`, criteria the candidate can no longer
+    make up for are skipped, as is `match_reasons`. Admission is checked before the stream
+    starts, with the same 503 and 429 responses as `/analyze_resume`. While a stage runs, a
+    `: ping` comment is sent every `SSE_KEEPALIVE_INTERVAL` seconds to keep the connection open.
+    """
+    client = AIClient(model_type=ModelType.OPENAI, max_tokens=2000)
+    service = ResumeAnalysisService(client, store=get_results_store(), deduplicator=get_deduplicator())
+    admission = get_admission_controller()
+
+    try:
+        if admission:
+            admission.check(api_key)
+        resume_text, job_description = await read_upload_files(service, resume_file, job_description_file)
+    except AdmissionRejected as e:
+        raise admission_error(e)
     except Exception as e:
         logger.error(f"Error during analysis: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+    async def stream_events() -> AsyncIterator[str]:
+        try:
+            async with admission.admit(api_key) if admission else nullcontext():
+                async for event in service.analyze_resume_events(resume_text, job_description, min_score=min_score):
+                    yield format_sse(event)
+        except AdmissionRejected as e:
+            # Capacity ran out while the upload was being read
+            data = {"detail": e.detail, "retry_after": max(1, math.ceil(e.retry_after))}
+            yield format_sse(AnalysisEvent(event=AnalysisEventType.ERROR, data=data))
+        except Exception as e:
+            logger.error(f"Error during analysis: {str(e)}")
+            yield format_sse(AnalysisEvent(event=AnalysisEventType.ERROR, data={"detail": str(e)}))
+
+    return StreamingResponse(
+        with_keepalive(stream_events(), settings.sse_keepalive_interval),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/rerank",
+    tags=["ai"],
+    summary="Re-weight stored analysis results and rank them, without calling the model",
+    response_model=Union[List[RankedMatchResult], CompactResults],
+)
+def rerank(request: RerankRequest, format: ResultFormat = ResultFormat.FULL):
+    """
+    Recompute the overall score and red flags of each result with new emphasis weights.
+
+    Criterion scores are reused as they are, so no tokens are spent. Results are returned best first;
+    `index` refers to the position of the result in the request. With `format=compact` the criteria are
+    sent once and each result is a row whose id is that position.
+    """
+    ranked = rerank_results(request.results, request.emphasis)
+    return compact_ranked(ranked) if format == ResultFormat.COMPACT else ranked
+
+
+def require_results_store() -> ResultsStore:
+    store = get_results_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Results store is disabled")
+    return store
+
+
+@router.get(
+    "/results",
+    tags=["results"],
+    summary="Page through stored analysis results, best first",
+    response_model=Union[ResultsPage, CompactResults],
+)
+def list_results(
+    job_hash: Optional[str] = None,
+    min_score: Optional[int] = Query(default=None, ge=0, le=100),
+    max_red_flag_level: Optional[RedFlagLevel] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    format: ResultFormat = ResultFormat.FULL,
+):
+    """
+    List stored results ordered by overall score.
+
+    `max_red_flag_level=medium` drops candidates with any high-level red flag. Pass the returned
+    `next_cursor` to fetch the next page. `format=compact` returns a criteria table and one row per result.
+    """
+    try:
+        page = require_results_store().page(job_hash, min_score, max_red_flag_level, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return compact_stored(page.items, page.next_cursor) if format == ResultFormat.COMPACT else page
+
+
+@router.get(
+    "/results/jobs/{job_hash}/top",
+    tags=["results"],
+    summary="Get the top candidates for a job",
+    response_model=Union[List[StoredMatchResult], CompactResults],
+)
+def get_top_results(
+    job_hash: str,
+    k: int = Query(default=10, ge=1, le=500),
+    criterion: Optional[str] = None,
+    max_red_flag_level: Optional[RedFlagLevel] = None,
+    format: ResultFormat = ResultFormat.FULL,
+):
+    """Best `k` stored results for a job, by overall score or by one criterion key (e.g. `technical_skills`)."""
+    results = require_results_store().top(job_hash, k, criterion, max_red_flag_level)
+    return compact_stored(results) if format == ResultFormat.COMPACT else results
+
+
+@router.get(
+    "/results/{result_id}",
+    tags=["results"],
+    summary="Get a stored analysis result",
+    response_model=StoredMatchResult,
+)
+def get_result(result_id: str):
+    result = require_results_store().get(result_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Result not found")
+    return result
+
+
+@router.post(
+    "/tasks/analyze_resume",
+    tags=["tasks"],
+    summary="Queue a resume analysis and return its task id",
+    response_model=AnalysisTask,
+    status_code=202,
+)
+async def submit_analysis_task(
+    resume_file: UploadFile = File(...),
+    job_description_file: UploadFile = File(...),
+):
+    """
+    Extract text from the uploaded files and queue the analysis for the background workers.
+
+    Poll `/tasks/{task_id}` for the status and fetch `/tasks/{task_id}/result` once it is completed.
+    """
+    client = AIClient(model_type=ModelType.OPENAI, max_tokens=2000)
+    service = ResumeAnalysisService(client)
+
+    try:
+        resume_text, job_description = await read_upload_files(service, resume_file, job_description_file)
+    except Exception as e:
+        logger.error(f"Error processing uploaded files: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return await asyncio.to_thread(get_task_queue().submit, resume_text, job_description)
+
+
+@router.get(
+    "/tasks/{task_id}",
+    tags=["tasks"],
+    summary="Get the status of a queued analysis",
+    response_model=AnalysisTask,
+)
+def get_analysis_task(task_id: str):
+    task = get_task_queue().get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+@router.get(
+    "/tasks/{task_id}/result",
+    tags=["tasks"],
+    summary="Get the result of a completed analysis",
+    response_model=DetailedMatchResult,
+)
+def get_analysis_task_result(task_id: str):
+    queue = get_task_queue()
+    task = queue.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if task.status != TaskStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=task.error or f"Task is {task.status.value}")
+    return queue.get_result(task_id)
@@ -0,0 +1,42 @@
+import json
+from typing import Any
+
+from src.conf import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up, stdlib json is used instead
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional, msgpack is then neither offered nor written
+    msgpack = None
+
+JSON_FORMAT = "json"
+MSGPACK_FORMAT = "msgpack"
+
+
+def is_available(data_format: str) -> bool:
+    return data_format == JSON_FORMAT or (data_format == MSGPACK_FORMAT and msgpack is not None)
+
+
+def dumps(data: Any, data_format: str = JSON_FORMAT) -> bytes:
+    """Encode JSON-compatible data; JSON goes through orjson when it is installed and enabled."""
+    if data_format == MSGPACK_FORMAT:
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+        return msgpack.packb(data)
+    if orjson is not None and settings.fast_json_enabled:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def loads(data: bytes, data_format: str = JSON_FORMAT) -> Any:
+    if data_format == MSGPACK_FORMAT:
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+        return msgpack.unpackb(data)
+    if orjson is not None and settings.fast_json_enabled:
+        return orjson.loads(data)
+    return json.loads(data)
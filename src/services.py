@@ -1,19 +1,33 @@
+import asyncio
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple
 
 import click
-from markitdown import MarkItDown
 from request_id_helper import set_request_id
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
 
-from src.analysis import JobAnalyzer
-from src.entities import DetailedMatchResult
+from src.analysis import JobAnalyzer, select_shortlist
+from src.conf import settings
+from src.dedup import Deduplicator
+from src.entities import (
+    AnalysisEvent,
+    AnalysisEventType,
+    DetailedMatchResult,
+    JobRequirements,
+    ModelTier,
+    NearDuplicate,
+    RankedMatchResult,
+    UnifiedResume,
+)
+from src.extractors import ExtractorRegistry, create_extractor_registry
 from src.interfaces import AIClientInterface
 from src.logger import TimeLogger, create_logger
+from src.results import ResultsStore, text_hash
+
+if TYPE_CHECKING:
+    from markitdown import MarkItDown
+    from rich.console import Console
 
 logger = create_logger(__name__)
 
@@ -21,20 +35,43 @@ logger = create_logger(__name__)
 @dataclass
 class ResumeAnalysisService:
     client: AIClientInterface
+    store: Optional[ResultsStore] = None
+    """Where finished analyses are saved for later ranking queries; nothing is saved when None."""
+    deduplicator: Optional[Deduplicator] = None
+    """Flags near-duplicate resumes and, when configured, reuses their stored analysis for the same job."""
+    strong_client: Optional[AIClientInterface] = None
+    """Stronger model that re-scores the shortlist in `screen_resumes`; screening is single-tier without it."""
     analyzer: JobAnalyzer = field(init=False, repr=False)
-    markitdown: MarkItDown = field(init=False, repr=False)
-    console: Console = field(default_factory=Console, init=False)
+    strong_analyzer: Optional[JobAnalyzer] = field(init=False, repr=False)
 
     def __post_init__(self):
         self.analyzer = JobAnalyzer(client=self.client)
-        self.markitdown = MarkItDown()
+        self.strong_analyzer = JobAnalyzer(client=self.strong_client) if self.strong_client is not None else None
+
+    @cached_property
+    def markitdown(self) -> "MarkItDown":
+        """Created on first use: importing markitdown loads every converter it ships with."""
+        from markitdown import MarkItDown
+
+        return MarkItDown()
+
+    @cached_property
+    def extractors(self) -> ExtractorRegistry:
+        """Fast paths for plain text, markdown and PDF; anything else goes through markitdown."""
+        return create_extractor_registry(fallback=lambda path: self.markitdown.convert(str(path)).text_content)
+
+    @cached_property
+    def console(self) -> "Console":
+        from rich.console import Console
+
+        return Console()
 
     @set_request_id()
     def process_files(self, resume_path: Path, job_desc_path: Path) -> Tuple[str, str]:
         """Process input files and return resume and job description texts."""
-        with TimeLogger("Processing input files"):
+        with TimeLogger("Processing input files", stage="process_files"):
             try:
-                resume_text = self.markitdown.convert(str(resume_path)).text_content
+                resume_text = self.extractors.extract(resume_path)
                 if not resume_text:
                     raise ValueError("Could not extract text from resume")
 
@@ -46,32 +83,213 @@ class ResumeAnalysisService:
                 raise click.ClickException(str(e))
 
     @set_request_id()
-    async def analyze_resume(self, resume_text: str, job_description: str) -> Optional[DetailedMatchResult]:
-        """Run the complete resume analysis workflow."""
+    async def analyze_resume(
+        self, resume_text: str, job_description: str, min_score: Optional[int] = None
+    ) -> Optional[DetailedMatchResult]:
+        """Run the complete resume analysis workflow; see `JobAnalyzer.match_resume_events` for `min_score`."""
         try:
-            with TimeLogger("Extracting job requirements"):
-                job_requirements = await self.analyzer.extract_job_requirements(job_description)
-                if not job_requirements:
-                    raise ValueError("Could not extract job requirements")
-
-            with TimeLogger("Unifying resume format"):
-                unified_resume = await self.analyzer.unify_resume(resume_text)
-                if not unified_resume:
-                    raise ValueError("Could not unify resume")
-
-            with TimeLogger("Matching resume"):
-                return await self.analyzer.match_resume(
-                    resume_text=unified_resume,
-                    job_description=job_description,
-                    job_requirements=job_requirements,
-                )
+            async for event in self.analyze_resume_events(resume_text, job_description, min_score=min_score):
+                pass
+            # The result is always the last event
+            return event.data
 
         except Exception as e:
             logger.error(f"Error during analysis: {str(e)}")
             raise click.ClickException(str(e))
 
+    async def analyze_resume_events(
+        self, resume_text: str, job_description: str, min_score: Optional[int] = None
+    ) -> AsyncIterator[AnalysisEvent]:
+        """Run the analysis workflow, yielding an event as each stage completes; the last one carries the result."""
+        duplicate, reused = await self.check_duplicates(resume_text, job_description)
+        if reused is not None:
+            await self.store_result(resume_text, job_description, reused)
+            yield AnalysisEvent(event=AnalysisEventType.RESULT, data=reused)
+            return
+
+        async with TimeLogger("Extracting job requirements", stage="extract_requirements"):
+            job_requirements = await self.extract_job_requirements(job_description)
+            if not job_requirements:
+                raise ValueError("Could not extract job requirements")
+        yield AnalysisEvent(event=AnalysisEventType.REQUIREMENTS, data=job_requirements)
+
+        async with TimeLogger("Unifying resume format", stage="unify"):
+            unified_resume = await self.analyzer.parse_resume(resume_text)
+            if not unified_resume or not unified_resume.markdown:
+                raise ValueError("Could not unify resume")
+        yield AnalysisEvent(event=AnalysisEventType.RESUME, data=unified_resume.markdown)
+
+        async with TimeLogger("Matching resume", stage="match"):
+            async for event in self.analyzer.match_resume_events(
+                resume_text=unified_resume.markdown,
+                job_description=job_description,
+                job_requirements=job_requirements,
+                contact=unified_resume.contact,
+                min_score=min_score,
+            ):
+                if event.event == AnalysisEventType.RESULT:
+                    event.data.duplicate_of = duplicate
+                    await self.store_result(resume_text, job_description, event.data)
+                yield event
+
+    async def screen_resumes(
+        self,
+        resume_texts: List[str],
+        job_description: str,
+        shortlist_size: Optional[int] = None,
+        shortlist_min_score: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> List[RankedMatchResult]:
+        """
+        Score a pool of resumes against one job and rank them; `index` is the position in `resume_texts`.
+
+        With a `strong_client` the screening is a cascade: the fast model scores everyone, stopping early on
+        candidates that cannot reach `shortlist_min_score`, and only the shortlist (at least `shortlist_min_score`,
+        at most `shortlist_size` candidates) is re-scored by the strong model, reusing the requirements and
+        unified resumes of the first pass. The shortlist ranks ahead of the rest and each result's `tier`
+        records the model that scored it. Resumes that fail to be analyzed are logged and left out.
+
+        Every resume first goes through the near-duplicate check, as in `analyze_resume`: results carry
+        `duplicate_of`, and a reused analysis takes the place of the fast pass. A reused result already scored by
+        the strong model is kept on the shortlist as it is.
+        """
+        async with TimeLogger("Extracting job requirements", stage="extract_requirements"):
+            job_requirements = await self.extract_job_requirements(job_description)
+            if not job_requirements:
+                raise click.ClickException("Could not extract job requirements")
+
+        semaphore = asyncio.Semaphore(concurrency or settings.screen_concurrency)
+        unified: Dict[int, UnifiedResume] = {}
+        duplicates: Dict[int, Optional[NearDuplicate]] = {}
+        results: Dict[int, DetailedMatchResult] = {}
+
+        async def score(index: int, analyzer: JobAnalyzer, tier: ModelTier, min_score: Optional[int]) -> None:
+            async with semaphore:
+                try:
+                    if index not in duplicates:
+                        duplicates[index], reused = await self.check_duplicates(resume_texts[index], job_description)
+                        if reused is not None:
+                            results[index] = reused
+                            return
+                    if index not in unified:
+                        resume = await analyzer.parse_resume(resume_texts[index])
+                        if not resume or not resume.markdown:
+                            raise ValueError("Could not unify resume")
+                        unified[index] = resume
+                    result = await analyzer.match_resume(
+                        resume_text=unified[index].markdown,
+                        job_description=job_description,
+                        job_requirements=job_requirements,
+                        contact=unified[index].contact,
+                        min_score=min_score,
+                    )
+                except Exception as e:
+                    logger.error(f"Error screening resume {index} with the {tier.value} model: {str(e)}")
+                    return
+            result.tier = tier
+            result.duplicate_of = duplicates[index]
+            results[index] = result
+
+        cascade = self.strong_analyzer is not None
+        async with TimeLogger(f"Scoring {len(resume_texts)} resumes", stage="screen_fast"):
+            await asyncio.gather(
+                *(
+                    score(index, self.analyzer, ModelTier.FAST, shortlist_min_score if cascade else None)
+                    for index in range(len(resume_texts))
+                )
+            )
+
+        if cascade:
+            shortlist = [
+                index
+                for index in select_shortlist(results, shortlist_size, shortlist_min_score)
+                if results[index].tier is not ModelTier.STRONG
+            ]
+            logger.info(f"Re-scoring {len(shortlist)} of {len(results)} candidates with the strong model")
+            async with TimeLogger(f"Re-scoring {len(shortlist)} shortlisted resumes", stage="screen_strong"):
+                await asyncio.gather(
+                    *(score(index, self.strong_analyzer, ModelTier.STRONG, None) for index in shortlist)
+                )
+
+        for index, result in results.items():
+            await self.store_result(resume_texts[index], job_description, result)
+        order = sorted(
+            results, key=lambda i: (results[i].tier is ModelTier.STRONG, results[i].overall_score), reverse=True
+        )
+        return [RankedMatchResult(rank=rank, index=index, result=results[index]) for rank, index in enumerate(order, 1)]
+
+    async def extract_job_requirements(self, job_description: str) -> Optional[JobRequirements]:
+        """
+        Extract requirements, reusing those of a near-duplicate posting when one was seen before.
+
+        A near-duplicate is often the same role in another city, so its location is extracted anew rather
+        than reused; that costs a short call instead of a full extraction.
+        """
+        if self.deduplicator is None:
+            return await self.analyzer.extract_job_requirements(job_description)
+        try:
+            found = await asyncio.to_thread(self.deduplicator.find_job_requirements, job_description)
+            if found is not None:
+                requirements, exact = found
+                if exact:
+                    return requirements
+                location = await self.analyzer.extract_job_location(job_description)
+                if location:
+                    requirements = requirements.model_copy(update={"location": location})
+                    await self._remember_job_requirements(job_description, requirements)
+                    return requirements
+        except Exception as e:
+            logger.error(f"Failed to look up near-duplicate jobs: {str(e)}")
+
+        requirements = await self.analyzer.extract_job_requirements(job_description)
+        if requirements:
+            await self._remember_job_requirements(job_description, requirements)
+        return requirements
+
+    async def _remember_job_requirements(self, job_description: str, requirements: JobRequirements) -> None:
+        try:
+            await asyncio.to_thread(self.deduplicator.remember_job_requirements, job_description, requirements)
+        except Exception as e:
+            logger.error(f"Failed to index job requirements: {str(e)}")
+
+    async def check_duplicates(
+        self, resume_text: str, job_description: str
+    ) -> Tuple[Optional[NearDuplicate], Optional[DetailedMatchResult]]:
+        """Find the closest earlier near-duplicate resume and, when reuse is on, its stored analysis for this job."""
+        if self.deduplicator is None:
+            return None, None
+        try:
+            matches = await asyncio.to_thread(self.deduplicator.check_resume, resume_text)
+        except Exception as e:
+            logger.error(f"Failed to check resume duplicates: {str(e)}")
+            return None, None
+        if not matches:
+            return None, None
+
+        if self.deduplicator.reuse_analysis and self.store is not None:
+            job_hash = text_hash(job_description)
+            for match in matches:
+                stored = await asyncio.to_thread(self.store.find, job_hash, match.text_hash)
+                if stored is not None:
+                    logger.info(f"Reusing analysis {stored.result_id} of near-duplicate resume")
+                    return match, stored.result.model_copy(update={"duplicate_of": match, "reused": True})
+        return matches[0], None
+
+    async def store_result(self, resume_text: str, job_description: str, result: DetailedMatchResult) -> None:
+        """Save the result; a storage failure is logged without failing the analysis."""
+        if self.store is None or result is None:
+            return
+        try:
+            await asyncio.to_thread(self.store.save, resume_text, job_description, result)
+        except Exception as e:
+            logger.error(f"Failed to store analysis result: {str(e)}")
+
     def show_analysis_result(self, result: DetailedMatchResult) -> None:
         """Display the analysis results in a rich formatted console output."""
+        from rich.panel import Panel
+        from rich.table import Table
+        from rich.text import Text
+
         # Create overall score panel
         score_color = "green" if result.overall_score >= 70 else "yellow" if result.overall_score >= 50 else "red"
         score_text = Text.assemble(
@@ -0,0 +1,39 @@
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar, Iterator
+
+
+@dataclass
+class SQLiteStore:
+    """
+    Base for the local SQLite stores: creates the database file and its `schema`, and opens connections.
+
+    The database runs in WAL mode so API and worker processes can read while another one writes. Each
+    operation opens its own autocommit connection; statements that must be atomic run in an explicit
+    transaction.
+    """
+
+    schema: ClassVar[str] = ""
+    foreign_keys: ClassVar[bool] = False
+
+    path: Path
+
+    def __post_init__(self):
+        self.path = Path(self.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.schema)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if self.foreign_keys:
+            conn.execute("PRAGMA foreign_keys=ON")
+        try:
+            yield conn
+        finally:
+            conn.close()
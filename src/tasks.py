@@ -0,0 +1,225 @@
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import ClassVar, Optional, Tuple
+
+from src.conf import settings
+from src.entities import AnalysisTask, DetailedMatchResult, TaskStatus
+from src.logger import create_logger
+from src.services import ResumeAnalysisService
+from src.storage import SQLiteStore
+
+logger = create_logger(__name__)
+
+TASKS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    resume_text TEXT NOT NULL,
+    job_description TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    lease_expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_status_created_at ON tasks (status, created_at);
+"""
+
+
+@dataclass
+class TaskQueue(SQLiteStore):
+    """
+    Durable queue of resume analyses stored in SQLite and shared by API and worker processes.
+
+    A claimed task is leased to its worker for `lease_seconds`, and the worker renews the lease while it runs
+    the analysis. If the worker dies, the lease expires and the task is handed to another worker, up to
+    `max_attempts` times. A claim is identified by the task id and its attempt number, so a worker whose lease
+    was taken over can neither renew it nor overwrite the outcome of the new attempt.
+    """
+
+    schema: ClassVar[str] = TASKS_SCHEMA
+
+    path: Path = field(default_factory=lambda: Path(settings.task_queue_path))
+    lease_seconds: int = field(default_factory=lambda: settings.task_lease_seconds)
+    max_attempts: int = field(default_factory=lambda: settings.task_max_attempts)
+
+    def submit(self, resume_text: str, job_description: str) -> AnalysisTask:
+        """Enqueue a new analysis and return its task record."""
+        task_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO tasks (task_id, status, resume_text, job_description, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (task_id, TaskStatus.PENDING.value, resume_text, job_description, now, now),
+            )
+        return self.get(task_id)
+
+    def claim(self) -> Optional[Tuple[str, int, str, str]]:
+        """Lease the oldest pending (or abandoned) task; return its id, attempt, resume text and job description."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "UPDATE tasks SET status = ?, error = ?, updated_at = ? "
+                    "WHERE status = ? AND lease_expires_at < ? AND attempts >= ?",
+                    (
+                        TaskStatus.FAILED.value,
+                        "Worker did not finish the task",
+                        now,
+                        TaskStatus.RUNNING.value,
+                        now,
+                        self.max_attempts,
+                    ),
+                )
+                row = conn.execute(
+                    "SELECT task_id, attempts, resume_text, job_description FROM tasks "
+                    "WHERE status = ? OR (status = ? AND lease_expires_at < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (TaskStatus.PENDING.value, TaskStatus.RUNNING.value, now),
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE tasks SET status = ?, attempts = attempts + 1, updated_at = ?, lease_expires_at = ? "
+                        "WHERE task_id = ?",
+                        (TaskStatus.RUNNING.value, now, now + self.lease_seconds, row["task_id"]),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+        return row["task_id"], row["attempts"] + 1, row["resume_text"], row["job_description"]
+
+    def renew(self, task_id: str, attempt: int) -> bool:
+        """Extend the lease of a claim by `lease_seconds`; False once the claim is no longer held."""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET updated_at = ?, lease_expires_at = ? WHERE task_id = ? AND status = ? AND attempts = ?",
+                (now, now + self.lease_seconds, task_id, TaskStatus.RUNNING.value, attempt),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, task_id: str, attempt: int, result: DetailedMatchResult) -> bool:
+        return self._finish(task_id, attempt, TaskStatus.COMPLETED, result=result.model_dump_json())
+
+    def fail(self, task_id: str, attempt: int, error: str) -> bool:
+        return self._finish(task_id, attempt, TaskStatus.FAILED, error=error)
+
+    def _finish(
+        self, task_id: str, attempt: int, status: TaskStatus, result: Optional[str] = None, error: Optional[str] = None
+    ) -> bool:
+        """Record the outcome of a claim; False, leaving the task untouched, when the claim is no longer held."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = ?, result = ?, error = ?, updated_at = ?, lease_expires_at = NULL "
+                "WHERE task_id = ? AND status = ? AND attempts = ?",
+                (status.value, result, error, time.time(), task_id, TaskStatus.RUNNING.value, attempt),
+            )
+        return cursor.rowcount == 1
+
+    def get(self, task_id: str) -> Optional[AnalysisTask]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT task_id, status, attempts, error, created_at, updated_at FROM tasks WHERE task_id = ?",
+                (task_id,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        return AnalysisTask(
+            task_id=row["task_id"],
+            status=TaskStatus(row["status"]),
+            attempts=row["attempts"],
+            error=row["error"],
+            created_at=datetime.fromtimestamp(row["created_at"], tz=timezone.utc),
+            updated_at=datetime.fromtimestamp(row["updated_at"], tz=timezone.utc),
+        )
+
+    def get_result(self, task_id: str) -> Optional[DetailedMatchResult]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT result FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        if row is None or row["result"] is None:
+            return None
+        return DetailedMatchResult.model_validate_json(row["result"])
+
+
+@lru_cache(maxsize=None)
+def get_task_queue() -> TaskQueue:
+    return TaskQueue()
+
+
+@dataclass
+class TaskWorker:
+    """Pool of coroutines running queued analyses through ResumeAnalysisService."""
+
+    queue: TaskQueue
+    service: ResumeAnalysisService
+    concurrency: int = field(default_factory=lambda: settings.worker_concurrency)
+    poll_interval: float = field(default_factory=lambda: settings.worker_poll_interval)
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Process tasks until `stop` is set."""
+        stop = stop or asyncio.Event()
+        logger.info(f"Starting {self.concurrency} workers on {self.queue.path}")
+        await asyncio.gather(*(self._work(stop) for _ in range(self.concurrency)))
+
+    async def _work(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            if await self.process_next():
+                continue
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def process_next(self) -> bool:
+        """Run one queued task; return False when the queue is empty."""
+        task = await asyncio.to_thread(self.queue.claim)
+        if task is None:
+            return False
+
+        task_id, attempt, resume_text, job_description = task
+        logger.info(f"Processing task {task_id}")
+        analysis = asyncio.create_task(self.service.analyze_resume(resume_text, job_description))
+        heartbeat = asyncio.create_task(self._heartbeat(task_id, attempt))
+        try:
+            await asyncio.wait((analysis, heartbeat), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # The heartbeat only ends early when the claim was lost; the analysis is then wasted spend
+            heartbeat.cancel()
+            analysis.cancel()
+            await asyncio.gather(analysis, heartbeat, return_exceptions=True)
+        if analysis.cancelled():
+            logger.warning(f"Abandoned task {task_id}: its lease was taken over by another worker")
+            return True
+
+        try:
+            result = analysis.result()
+            if not result:
+                raise ValueError("Analysis failed to produce results")
+        except Exception as e:
+            logger.error(f"Task {task_id} failed: {str(e)}")
+            finished = await asyncio.to_thread(self.queue.fail, task_id, attempt, str(e))
+        else:
+            finished = await asyncio.to_thread(self.queue.complete, task_id, attempt, result)
+        if not finished:
+            logger.warning(f"Discarded the outcome of task {task_id}: its lease was taken over by another worker")
+        return True
+
+    async def _heartbeat(self, task_id: str, attempt: int) -> None:
+        """Renew the lease every third of its length; return once the claim is lost."""
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            if not await asyncio.to_thread(self.queue.renew, task_id, attempt):
+                return
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from src.admission import AdmissionController, AdmissionRejected
+
+
+@pytest.mark.asyncio
+async def test_admission_sheds_load_once_the_wait_exceeds_the_budget():
+    controller = AdmissionController(max_concurrency=2, max_wait=15, key_concurrency=0, initial_duration=10)
+    release = asyncio.Event()
+
+    async def analyze(key):
+        async with controller.admit(key):
+            await release.wait()
+
+    tasks = [asyncio.create_task(analyze(key)) for key in ("a", "b", "c")]
+    await asyncio.sleep(0)
+
+    # Two running and one queued: the next request would wait a full analysis
+    assert (controller.running, controller.queued) == (2, 1)
+    assert controller.estimate_wait() == 10
+    tasks.append(asyncio.create_task(analyze("d")))
+    await asyncio.sleep(0)
+    assert controller.estimate_wait() == 20
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.check("e")
+    assert (rejected.value.status_code, rejected.value.retry_after) == (503, 20)
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert (controller.running, controller.queued) == (0, 0)
+    assert controller.estimate_wait() == 0
+    assert controller.average_duration < 10
+
+
+@pytest.mark.asyncio
+async def test_admission_enforces_per_key_quota():
+    controller = AdmissionController(max_concurrency=8, max_wait=30, key_concurrency=1, initial_duration=5)
+    release = asyncio.Event()
+
+    async def analyze():
+        async with controller.admit("alice"):
+            await release.wait()
+
+    task = asyncio.create_task(analyze())
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with controller.admit("alice"):
+            pass
+    assert (rejected.value.status_code, rejected.value.retry_after) == (429, 5)
+    async with controller.admit("bob"):
+        pass
+
+    release.set()
+    await task
+    async with controller.admit("alice"):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_gives_up_its_place():
+    controller = AdmissionController(max_concurrency=1, max_wait=60, key_concurrency=0, initial_duration=1)
+    release = asyncio.Event()
+
+    async def analyze():
+        async with controller.admit():
+            await release.wait()
+
+    running = asyncio.create_task(analyze())
+    waiting = asyncio.create_task(analyze())
+    await asyncio.sleep(0)
+    assert controller.queued == 1
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert (controller.running, controller.queued) == (1, 0)
+    release.set()
+    await running
+    assert controller.running == 0
@@ -3,8 +3,29 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from src.analysis import CriteriaEvaluator, JobAnalyzer, RedFlagAnalyzer, ResumeProcessor, create_scoring_criteria
-from src.entities import DetailedMatchResult, Emphasis, JobRequirements, Location, ScoringCriterion
+from src.analysis import (
+    CriteriaEvaluator,
+    JobAnalyzer,
+    RedFlagAnalyzer,
+    ResumeProcessor,
+    calculate_best_achievable_score,
+    calculate_overall_score,
+    create_analysis_context,
+    create_scoring_criteria,
+    rerank_results,
+    reweight_result,
+    select_shortlist,
+)
+from src.entities import (
+    AnalysisEventType,
+    ContactInfo,
+    DetailedMatchResult,
+    Emphasis,
+    JobRequirements,
+    Location,
+    ScoringCriterion,
+    UnifiedResume,
+)
 
 
 # Fixtures
@@ -81,23 +102,26 @@ def test_create_scoring_criteria(job_requirements):
 
 # Test ResumeProcessor
 @pytest.mark.asyncio
-async def test_resume_processor_unify(mock_client, sample_resume_text):
+async def test_resume_processor_get_website(mock_client, sample_resume_text):
     processor = ResumeProcessor(mock_client)
-    mock_client.run.return_value = "Unified Resume"
+    mock_client.run.return_value = "https://johndoe.dev"
 
-    result = await processor.unify_resume(sample_resume_text)
-    assert result == "Unified Resume"
+    result = await processor.get_website(sample_resume_text)
+    assert result == "https://johndoe.dev"
     mock_client.run.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_resume_processor_get_website(mock_client, sample_resume_text):
+async def test_resume_processor_parse_resume(mock_client, sample_resume_text):
     processor = ResumeProcessor(mock_client)
-    mock_client.run.return_value = "https://johndoe.dev"
+    unified = UnifiedResume(markdown="# John Doe", contact=ContactInfo(website="https://johndoe.dev"))
+    mock_client.run.return_value = unified
 
-    result = await processor.get_website(sample_resume_text)
-    assert result == "https://johndoe.dev"
-    mock_client.run.assert_called_once()
+    result = await processor.parse_resume(sample_resume_text)
+
+    assert result == unified
+    assert mock_client.run.call_args.kwargs["result_type"] is UnifiedResume
+    assert sample_resume_text in mock_client.run.call_args.kwargs["prompt"]
 
 
 # Test CriteriaEvaluator
@@ -240,10 +264,160 @@ async def test_job_analyzer_extract_requirements(mock_client, sample_job_descrip
 
 
 @pytest.mark.asyncio
-async def test_job_analyzer_unify_resume(mock_client, sample_resume_text):
+async def test_job_analyzer_shares_prompt_prefix(
+    mock_client, sample_resume_text, sample_job_description, job_requirements
+):
     analyzer = JobAnalyzer(mock_client)
-    mock_client.run.return_value = "Unified Resume"
+    mock_client.run.return_value = "80"
 
-    result = await analyzer.unify_resume(sample_resume_text)
-    assert result == "Unified Resume"
-    mock_client.run.assert_called_once()
+    await analyzer.match_resume(
+        resume_text=sample_resume_text,
+        job_description=sample_job_description,
+        job_requirements=job_requirements,
+    )
+
+    prefixes = [call.kwargs.get("prompt_prefix") for call in mock_client.run.call_args_list]
+    # Six criteria and match reasons reuse the same context; the website lookup does not
+    assert prefixes[:7] == [create_analysis_context(sample_resume_text, job_requirements)] * 7
+    assert sample_resume_text in prefixes[0]
+
+
+@pytest.mark.asyncio
+async def test_job_analyzer_match_resume_events(
+    mock_client, sample_resume_text, sample_job_description, job_requirements
+):
+    analyzer = JobAnalyzer(mock_client)
+    mock_client.run.side_effect = ["85", "75", "90", "80", "70", "60", "Match reasons", "https://johndoe.dev"]
+
+    events = [
+        event
+        async for event in analyzer.match_resume_events(sample_resume_text, sample_job_description, job_requirements)
+    ]
+
+    assert [event.event for event in events] == [AnalysisEventType.CRITERION] * 6 + [
+        AnalysisEventType.MATCH_REASONS,
+        AnalysisEventType.RESULT,
+    ]
+    assert events[0].data.score == 85
+    assert events[6].data == "Match reasons"
+    assert isinstance(events[-1].data, DetailedMatchResult)
+
+
+@pytest.mark.asyncio
+async def test_job_analyzer_reuses_parsed_contact(
+    mock_client, sample_resume_text, sample_job_description, job_requirements
+):
+    analyzer = JobAnalyzer(mock_client)
+    mock_client.run.return_value = "80"
+    contact = ContactInfo(website="https://johndoe.dev", email="john@example.com", links=["https://github.com/jd"])
+
+    result = await analyzer.match_resume(sample_resume_text, sample_job_description, job_requirements, contact)
+
+    # Six criteria and match reasons; no separate website lookup
+    assert mock_client.run.call_count == 7
+    assert result.website == "https://johndoe.dev"
+    assert result.contact == contact
+
+
+def scored_result(job_requirements: JobRequirements, scores: List[int]) -> DetailedMatchResult:
+    criteria = create_scoring_criteria(job_requirements)
+    for criterion, score in zip(criteria, scores):
+        criterion.score = score
+    return DetailedMatchResult(
+        overall_score=calculate_overall_score(criteria),
+        criteria_scores=criteria,
+        match_reasons="Match reasons",
+        red_flags=RedFlagAnalyzer().analyze(criteria),
+    )
+
+
+def test_reweight_result(job_requirements):
+    # Criteria order: language, education, experience, technical skills, certifications, soft skills
+    result = scored_result(job_requirements, [100, 100, 100, 10, 100, 100])
+    emphasis = Emphasis(
+        technical_skills_weight=100,
+        soft_skills_weight=0,
+        experience_weight=0,
+        education_weight=0,
+        language_proficiency_weight=0,
+        certifications_weight=0,
+    )
+
+    reweighted = reweight_result(result, emphasis)
+
+    assert reweighted.overall_score == 10
+    assert reweighted.red_flags["high"] == ["Low Technical Skills"]
+    assert [c.score for c in reweighted.criteria_scores] == [c.score for c in result.criteria_scores]
+    assert result.criteria_scores[3].weight == job_requirements.emphasis.technical_skills_weight
+
+
+def test_rerank_results(job_requirements):
+    strong_technical = scored_result(job_requirements, [0, 0, 0, 100, 0, 0])
+    strong_soft_skills = scored_result(job_requirements, [0, 0, 0, 0, 0, 100])
+
+    ranked = rerank_results(
+        [strong_technical, strong_soft_skills], Emphasis(technical_skills_weight=0, soft_skills_weight=100)
+    )
+
+    assert [(item.rank, item.index) for item in ranked] == [(1, 1), (2, 0)]
+    assert ranked[0].result.overall_score > ranked[1].result.overall_score
+
+
+def test_select_shortlist():
+    results = {
+        index: DetailedMatchResult(overall_score=score, criteria_scores=[], match_reasons="", red_flags={})
+        for index, score in enumerate([40, 90, 70, 60])
+    }
+
+    assert select_shortlist(results) == [1, 2, 3, 0]
+    assert select_shortlist(results, size=2) == [1, 2]
+    assert select_shortlist(results, min_score=65) == [1, 2]
+    assert select_shortlist(results, size=1, min_score=95) == []
+
+
+@pytest.mark.asyncio
+async def test_match_resume_stops_below_min_score(
+    mock_client, sample_resume_text, sample_job_description, job_requirements
+):
+    analyzer = JobAnalyzer(mock_client)
+    mock_client.run.return_value = "10"
+    contact = ContactInfo(website="https://johndoe.dev")
+
+    result = await analyzer.match_resume(
+        sample_resume_text, sample_job_description, job_requirements, contact, min_score=70
+    )
+
+    # Technical skills (50 of 110) at 10 leave at most (500 + 60 * 100) // 110 = 59
+    stages = [call.kwargs["stage"] for call in mock_client.run.call_args_list]
+    assert stages == ["technical_skills"]
+    assert [c.key for c in result.criteria_scores if not c.skipped] == ["technical_skills"]
+    assert all(c.score is None for c in result.criteria_scores if c.skipped)
+    assert result.overall_score == 4
+    assert result.website == "https://johndoe.dev"
+
+
+@pytest.mark.asyncio
+async def test_match_resume_reachable_min_score_evaluates_everything(
+    mock_client, sample_resume_text, sample_job_description, job_requirements
+):
+    analyzer = JobAnalyzer(mock_client)
+    mock_client.run.return_value = "80"
+
+    result = await analyzer.match_resume(
+        sample_resume_text, sample_job_description, job_requirements, ContactInfo(), min_score=70
+    )
+
+    stages = [call.kwargs["stage"] for call in mock_client.run.call_args_list]
+    assert stages[:3] == ["technical_skills", "experience", "soft_skills"]
+    assert stages[-1] == "match_reasons"
+    assert not any(c.skipped for c in result.criteria_scores)
+    assert result.overall_score == 80
+
+
+def test_calculate_best_achievable_score():
+    criteria = [
+        ScoringCriterion(name="A", key="a", weight=60, description="", factors=[], score=20),
+        ScoringCriterion(name="B", key="b", weight=40, description="", factors=[]),
+    ]
+
+    assert calculate_best_achievable_score(criteria) == 52
@@ -0,0 +1,77 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+from benchmarks.fake_client import LatencyModel
+from benchmarks.stub_server import StubConfig, create_stub_app
+from src.batch import BatchAIClient, BatchError, BatchRunner, build_request_body, parse_response_line
+from src.conf import settings
+from src.entities import JobRequirements, ModelTier
+from src.services import ResumeAnalysisService
+
+
+@pytest.fixture
+def batch_settings(tmp_path):
+    with patch.multiple(settings, cache_dir=str(tmp_path / "cache"), openai_api_key="stub", openai_base_url=""):
+        yield
+
+
+@pytest.fixture
+def runner(tmp_path):
+    stub_app = create_stub_app(StubConfig(latency=LatencyModel("constant", 0), response_words=5))
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub_app))
+    client = AsyncOpenAI(base_url="http://stub/v1", api_key="stub", http_client=http_client)
+    return BatchRunner(client=client, directory=tmp_path / "batches", collect_window=0.01, poll_interval=0)
+
+
+def test_request_body_asks_for_json_schema():
+    body = build_request_body("gpt-4o-mini", "Extract", "You are a matcher", 100, 0.7, JobRequirements)
+
+    assert [message["role"] for message in body["messages"]] == ["system", "user"]
+    assert body["response_format"]["json_schema"]["name"] == "JobRequirements"
+    assert "response_format" not in build_request_body("gpt-4o-mini", "Extract", "", 100, 0.7)
+
+
+def test_parse_failed_response_line():
+    line = {"custom_id": "a", "response": {"status_code": 400, "body": {"error": "bad request"}}, "error": None}
+
+    with pytest.raises(BatchError):
+        parse_response_line(line)
+
+
+@pytest.mark.asyncio
+async def test_screening_runs_one_batch_per_stage(batch_settings, runner, tmp_path):
+    service = ResumeAnalysisService(BatchAIClient(runner))
+    resumes = ["Alice, Python developer", "Bob, Go developer", "Carol, data engineer"]
+
+    ranked = await service.screen_resumes(resumes, "Senior Python developer", concurrency=len(resumes))
+
+    assert sorted(item.index for item in ranked) == [0, 1, 2]
+    assert all(criterion.score is not None for item in ranked for criterion in item.result.criteria_scores)
+    submissions = sorted(path.name for path in runner.directory.glob("*.jsonl") if ".output" not in path.name)
+    stages = [name.split("-")[3] for name in submissions]
+    assert stages[:2] == ["extract_requirements", "unify"]
+    assert stages[-1] == "match_reasons"
+    assert len(stages) == 9
+    assert len((runner.directory / submissions[1]).read_text().splitlines()) == 3
+
+    # Responses are cached, so screening the same pool again submits nothing
+    rerun = BatchRunner(client=runner.client, directory=tmp_path / "rerun", collect_window=0.01, poll_interval=0)
+    await ResumeAnalysisService(BatchAIClient(rerun)).screen_resumes(resumes, "Senior Python developer")
+    assert list(rerun.directory.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_a_batch_line(batch_settings, runner):
+    client = BatchAIClient(runner, tier=ModelTier.STRONG)
+
+    first, second = await client.run("Say hi", use_cache=False), await client.run("Say hi", use_cache=False)
+    shared = await asyncio.gather(client.run("Same", use_cache=False), client.run("Same", use_cache=False))
+
+    assert first == second
+    assert shared[0] == shared[1]
+    last_submission = sorted(p for p in runner.directory.glob("*.jsonl") if ".output" not in p.name)[-1]
+    assert len(last_submission.read_text().splitlines()) == 1
@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from benchmarks.common import BenchmarkResult, load_corpus, percentile
+from benchmarks.extraction import create_samples
+from benchmarks.fake_client import FakeAIClient, FakeProviderError, LatencyModel
+from benchmarks.imports import parse_importtime
+from benchmarks.pipeline import run_benchmark, run_level
+from benchmarks.serialization import make_match_result, measure
+from src.entities import JobRequirements
+
+
+@pytest.fixture
+def fake_client():
+    return FakeAIClient(latency=LatencyModel("constant", 0), seed=1)
+
+
+def test_latency_model():
+    rng = random.Random(1)
+
+    assert LatencyModel("constant", 0.2).sample(rng) == 0.2
+    assert all(0.1 <= LatencyModel("uniform", 0.2, 0.1).sample(rng) <= 0.3 for _ in range(100))
+    assert LatencyModel("lognormal", 0.2).sample(rng) > 0
+    with pytest.raises(ValueError):
+        LatencyModel("unknown")
+
+
+@pytest.mark.asyncio
+async def test_fake_client_responses(fake_client):
+    assert isinstance(await fake_client.run("job", result_type=JobRequirements), JobRequirements)
+    assert 0 <= int(await fake_client.run("criterion", stage="experience")) <= 100
+    assert len((await fake_client.run("resume", stage="unify")).split()) == fake_client.response_words
+    assert await fake_client.run("criterion", stage="skills") == await fake_client.run("criterion", stage="skills")
+    assert fake_client.calls == 5
+
+
+@pytest.mark.asyncio
+async def test_fake_client_errors():
+    client = FakeAIClient(latency=LatencyModel("constant", 0), error_rate=1)
+
+    with pytest.raises(FakeProviderError):
+        await client.run("prompt")
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0
+
+
+def test_load_corpus():
+    resumes, jobs = load_corpus()
+
+    assert resumes and jobs
+    assert all(text.strip() for text in resumes + jobs)
+
+
+@pytest.mark.asyncio
+async def test_run_level():
+    calls = []
+
+    async def call(index):
+        calls.append(index)
+        if index == 0:
+            raise ValueError("failure")
+
+    result = await run_level("test", concurrency=2, requests=5, call=call)
+
+    assert isinstance(result, BenchmarkResult)
+    assert sorted(calls) == [0, 1, 2, 3, 4]
+    assert result.requests == 5
+    assert result.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark_analyzer(fake_client):
+    results = await run_benchmark("analyzer", [1, 2], requests=3, client=fake_client)
+
+    assert [result.concurrency for result in results] == [1, 2]
+    assert all(result.errors == 0 for result in results)
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark_service(fake_client):
+    results = await run_benchmark("service", [2], requests=2, client=fake_client)
+
+    assert results[0].errors == 0
+    # Requirements, one merged unify call, six criteria and match reasons per analysis
+    assert fake_client.calls == 2 * 9
+
+
+def test_parse_importtime():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   src.conf\n"
+        "import time:      1000 |       1500 | src.manage\n"
+    )
+
+    assert parse_importtime(output) == [("src.conf", 0.00012, 0.00012), ("src.manage", 0.001, 0.0015)]
+
+
+def test_measure_serialization():
+    results = measure("DetailedMatchResult", [make_match_result(random.Random(0)) for _ in range(3)], repeat=1)
+
+    assert {"pydantic", "stdlib json", "orjson"} <= {result.encoder for result in results}
+    assert all(result.size > 0 for result in results)
+
+
+def test_create_extraction_samples(tmp_path):
+    samples = create_samples(tmp_path, pdf_pages=[3])
+
+    assert [name for name, _ in samples] == ["txt", "md", "pdf 3p"]
+    assert all(path.stat().st_size > 0 for _, path in samples)
@@ -0,0 +1,194 @@
+import asyncio
+import fcntl
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic_ai.usage import Usage
+
+from src.cache import LOCKS_DIR, STATS_DIR, DiskCache
+from src.client import AIClient, ModelType
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(tmp_path / "cache", lock_timeout=1, poll_interval=0.01)
+
+
+def test_save_is_atomic_and_leaves_no_temporary_files(cache):
+    cache.save("key", {"data": "first", "type": "str"})
+    cache.save("key", {"data": "second", "type": "str"})
+
+    assert cache.load("key") == {"data": "second", "type": "str"}
+    assert [path.name for path in cache.directory.iterdir() if path.is_file()] == ["key.json"]
+
+
+def test_msgpack_entries(tmp_path, cache):
+    pytest.importorskip("msgpack")
+    cache.save("old", {"data": "json entry", "type": "str"})
+    packed = DiskCache(cache.directory, data_format="msgpack")
+    packed.save("new", {"data": "msgpack entry", "type": "str"})
+
+    assert packed.path("new").name == "new.msgpack"
+    assert packed.load("new") == {"data": "msgpack entry", "type": "str"}
+    assert packed.load("old") == {"data": "json entry", "type": "str"}
+    assert cache.load("new") == {"data": "msgpack entry", "type": "str"}
+    assert packed.stats().entries == {"str": 2}
+
+
+def test_load_truncated_entry(cache):
+    cache.path("key").write_text('{"data": "trunc')
+
+    assert cache.load("key") is None
+    assert cache.load("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_lock_waits_for_holder_and_removes_lock_file(cache):
+    order = []
+
+    async def hold(name: str):
+        async with cache.lock("key") as locked:
+            assert locked
+            order.append(f"{name} start")
+            await asyncio.sleep(0.05)
+            order.append(f"{name} end")
+
+    await asyncio.gather(hold("first"), hold("second"))
+
+    assert order == ["first start", "first end", "second start", "second end"]
+    assert list((cache.directory / LOCKS_DIR).iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_lock_times_out_when_another_process_holds_it(cache):
+    fd = os.open(cache.directory / LOCKS_DIR / "key.lock", os.O_RDWR | os.O_CREAT)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    cache.lock_timeout = 0.05
+    try:
+        async with cache.lock("key") as locked:
+            assert locked is False
+    finally:
+        os.close(fd)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_fetch_once(tmp_path):
+    with patch("src.client.settings.cache_dir", str(tmp_path / "cache")):
+        clients = [AIClient(ModelType.OPENAI), AIClient(ModelType.OPENAI)]
+
+    async def slow_run(prompt):
+        await asyncio.sleep(0.05)
+        response = MagicMock()
+        response.data = "fetched once"
+        response.usage = lambda: Usage(total_tokens=10)
+        return response
+
+    with patch("src.client.Agent") as MockAgent:
+        MockAgent.return_value.run = AsyncMock(side_effect=slow_run)
+        results = await asyncio.gather(*(client.run("same prompt") for client in clients))
+
+    assert results == ["fetched once", "fetched once"]
+    assert MockAgent.return_value.run.await_count == 1
+
+
+def write_entry(cache: DiskCache, key: str, data: str, accessed_at: float) -> None:
+    cache.save(key, {"data": data, "type": "str"})
+    os.utime(cache.path(key), (accessed_at, accessed_at))
+
+
+def test_stats_by_type_and_hit_ratio(cache):
+    cache.save("text", {"data": "reasons", "type": "str"})
+    cache.save("model", {"data": {"country": "Spain", "city": "Madrid"}, "type": "Location"})
+    cache.path("broken").write_text("{")
+    cache.record_hit()
+    cache.record_hit()
+    cache.record_hit()
+    cache.record_miss()
+
+    stats = cache.stats()
+
+    assert stats.entries == {"str": 1, "Location": 1, "corrupt": 1}
+    assert stats.bytes["corrupt"] == 1
+    assert stats.total_bytes == sum(path.stat().st_size for path in cache.entries())
+    assert stats.hit_ratio == 0.75
+
+    cache.reset_stats()
+    assert cache.stats().hit_ratio is None
+
+
+def test_hit_counters_stay_small(cache):
+    for _ in range(1000):
+        cache.record_hit()
+
+    assert cache.stats().hits == 1000
+    assert (cache.directory / STATS_DIR / "hits").stat().st_size == len("1000")
+
+
+def test_corrupt_hit_counter_is_not_guessed(cache):
+    (cache.directory / STATS_DIR / "hits").write_bytes(b"." * 20)
+
+    cache.record_hit()
+
+    with pytest.raises(ValueError):
+        cache.stats()
+    cache.reset_stats()
+    cache.record_hit()
+    assert cache.stats().hits == 1
+
+
+def test_load_refreshes_access_time(cache):
+    write_entry(cache, "key", "value", accessed_at=1000)
+
+    cache.load("key")
+
+    assert cache.path("key").stat().st_mtime > 1000
+
+
+def test_prune_evicts_least_recently_used_until_under_size(cache):
+    now = time.time()
+    for index, key in enumerate(["oldest", "older", "recent"]):
+        write_entry(cache, key, "x" * 100, accessed_at=now - 100 + index)
+    entry_size = cache.path("recent").stat().st_size
+
+    removed = cache.prune(max_bytes=entry_size * 2)
+
+    assert [path.stem for path in removed] == ["oldest"]
+    assert sorted(path.stem for path in cache.entries()) == ["older", "recent"]
+
+
+def test_prune_by_age_and_dry_run(cache):
+    now = time.time()
+    write_entry(cache, "stale", "value", accessed_at=now - 8 * 86400)
+    write_entry(cache, "fresh", "value", accessed_at=now)
+
+    assert [path.stem for path in cache.prune(max_age=7 * 86400, dry_run=True)] == ["stale"]
+    assert cache.path("stale").exists()
+
+    cache.prune(max_age=7 * 86400)
+    assert [path.stem for path in cache.entries()] == ["fresh"]
+
+
+def test_prune_removes_abandoned_locks_but_keeps_held_ones(cache):
+    (cache.directory / LOCKS_DIR / "abandoned.lock").touch()
+    fd = os.open(cache.directory / LOCKS_DIR / "held.lock", os.O_RDWR | os.O_CREAT)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        cache.prune(max_age=86400)
+    finally:
+        os.close(fd)
+
+    assert [path.name for path in (cache.directory / LOCKS_DIR).iterdir()] == ["held.lock"]
+
+
+def test_verify_removes_corrupt_entries(cache):
+    cache.save("valid", {"data": "value", "type": "str"})
+    cache.save("invalid_model", {"data": {"country": "Spain"}, "type": "Location"})
+    cache.path("truncated").write_text('{"data": "va')
+
+    assert sorted(path.stem for path in cache.verify(dry_run=True)) == ["invalid_model", "truncated"]
+    assert len(list(cache.entries())) == 3
+
+    cache.verify()
+    assert [path.stem for path in cache.entries()] == ["valid"]
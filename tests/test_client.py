@@ -2,8 +2,10 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from pydantic import BaseModel
+from pydantic_ai.usage import Usage
 
-from src.client import AIClient, ModelType
+from src.client import AIClient, ModelType, get_model_config
+from src.entities import ModelTier
 
 
 class TestResponse(BaseModel):
@@ -24,6 +26,7 @@ def mock_client(mock_cache_dir):
         mock_settings.anthropic_model_name = "test_model"
         mock_settings.anthropic_max_tokens = 1000
         mock_settings.anthropic_temperature = 0.7
+        mock_settings.anthropic_base_url = ""
         return AIClient(ModelType.ANTHROPIC)
 
 
@@ -31,7 +34,7 @@ def mock_client(mock_cache_dir):
 async def test_run_with_string_output(mock_client):
     mock_response = MagicMock()
     mock_response.data = "test response"
-    mock_response.usage = lambda: {"total_tokens": 100}
+    mock_response.usage = lambda: Usage(total_tokens=100)
 
     with patch("src.client.Agent") as MockAgent:
         mock_agent = AsyncMock()
@@ -49,7 +52,7 @@ async def test_run_with_pydantic_output(mock_client):
     expected_response = TestResponse(name="Test", score=0.95)
     mock_response = MagicMock()
     mock_response.data = expected_response
-    mock_response.usage = lambda: {"total_tokens": 100}
+    mock_response.usage = lambda: Usage(total_tokens=100)
 
     with patch("src.client.Agent") as MockAgent:
         mock_agent = AsyncMock()
@@ -72,7 +75,7 @@ async def test_cache_functionality(mock_client):
     # First call - should save to cache
     mock_response = MagicMock()
     mock_response.data = test_response
-    mock_response.usage = lambda: {"total_tokens": 100}
+    mock_response.usage = lambda: Usage(total_tokens=100)
 
     with patch("src.client.Agent") as MockAgent:
         mock_agent = AsyncMock()
@@ -97,7 +100,7 @@ async def test_cache_with_pydantic_model(mock_client):
 
     mock_response = MagicMock()
     mock_response.data = test_response
-    mock_response.usage = lambda: {"total_tokens": 100}
+    mock_response.usage = lambda: Usage(total_tokens=100)
 
     with patch("src.client.Agent") as MockAgent:
         mock_agent = AsyncMock()
@@ -115,6 +118,21 @@ async def test_cache_with_pydantic_model(mock_client):
         assert mock_agent.run.call_count == 1
 
 
+def test_strong_tier_uses_its_own_model_and_cache_keys(mock_client, mock_cache_dir):
+    with patch("src.client.settings") as mock_settings:
+        mock_settings.cache_dir = str(mock_cache_dir)
+        mock_settings.anthropic_model_name = "fast_model"
+        mock_settings.anthropic_strong_model_name = "strong_model"
+        mock_settings.anthropic_api_key = "test_key"
+        mock_settings.anthropic_base_url = ""
+        assert get_model_config(ModelType.ANTHROPIC).model_name == "fast_model"
+        assert get_model_config(ModelType.ANTHROPIC, ModelTier.STRONG).model_name == "strong_model"
+        strong_client = AIClient(ModelType.ANTHROPIC, tier=ModelTier.STRONG)
+
+    assert strong_client._model_name == "strong_model"
+    assert strong_client._get_cache_key("prompt", "system") != mock_client._get_cache_key("prompt", "system")
+
+
 def test_invalid_cache_handling(mock_client):
     cache_key = mock_client._get_cache_key("test prompt", "test system prompt")
     cache_path = mock_client._get_cache_path(cache_key)
@@ -125,3 +143,22 @@ def test_invalid_cache_handling(mock_client):
 
     result = mock_client._load_from_cache(cache_key)
     assert result is None
+
+
+@pytest.mark.asyncio
+async def test_run_with_prompt_prefix(mock_client):
+    mock_response = MagicMock()
+    mock_response.data = "test response"
+    mock_response.usage = lambda: Usage(request_tokens=100, details={"cached_tokens": 80})
+
+    with patch("src.client.Agent") as MockAgent:
+        mock_agent = AsyncMock()
+        mock_agent.run.return_value = mock_response
+        MockAgent.return_value = mock_agent
+
+        await mock_client.run("test prompt", use_cache=False, prompt_prefix="shared context ")
+
+        mock_agent.run.assert_called_once_with("shared context test prompt")
+        model_settings = MockAgent.call_args[1]["model_settings"]
+        assert model_settings["prompt_cache_prefix"] == "shared context "
+        assert mock_client.cached_tokens == 80
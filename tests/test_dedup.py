@@ -0,0 +1,154 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.dedup import Deduplicator, FingerprintIndex, canonicalize, minhash, similarity
+from src.entities import AnalysisEvent, AnalysisEventType, DetailedMatchResult, Emphasis, JobRequirements, Location
+from src.results import ResultsStore, text_hash
+from src.services import ResumeAnalysisService
+
+RESUME = """
+Jane Doe - Senior Python Developer
+Eight years building data pipelines and web services with Python, FastAPI, PostgreSQL and Kafka.
+Led a team of five engineers migrating a monolith to event-driven microservices on Kubernetes.
+Mentored junior developers, ran hiring loops and introduced typed Python across the codebase.
+Education: MSc Computer Science, University of Amsterdam. Languages: English, Dutch, German.
+"""
+EDITED_RESUME = RESUME.replace("Eight years", "8 years").replace("team of five", "team of six") + "Hobbies: chess."
+OTHER_RESUME = """
+John Smith - Registered Nurse
+Twelve years of intensive care experience in regional hospitals, triage and patient education.
+Certified in advanced cardiac life support; coordinated night shifts for a ward of forty beds.
+"""
+
+
+@pytest.fixture
+def deduplicator(tmp_path):
+    return Deduplicator(index=FingerprintIndex(path=tmp_path / "fingerprints.sqlite3"), resume_threshold=0.7)
+
+
+def test_canonicalize_ignores_case_punctuation_and_spacing():
+    assert canonicalize("Senior  Python-Developer,\n**FastAPI**") == canonicalize("senior python developer fastapi")
+
+
+def test_minhash_similarity():
+    assert similarity(minhash(RESUME), minhash(RESUME)) == 1.0
+    assert similarity(minhash(RESUME), minhash(EDITED_RESUME)) > 0.7
+    assert similarity(minhash(RESUME), minhash(OTHER_RESUME)) < 0.1
+
+
+def test_check_resume_flags_near_duplicates(deduplicator):
+    assert deduplicator.check_resume(RESUME) == []
+    assert deduplicator.check_resume(OTHER_RESUME) == []
+
+    matches = deduplicator.check_resume(EDITED_RESUME)
+    assert [match.text_hash for match in matches] == [text_hash(RESUME)]
+    assert matches[0].similarity > 0.7
+
+
+@pytest.mark.asyncio
+async def test_service_reuses_analysis_of_near_duplicate(tmp_path, deduplicator):
+    store = ResultsStore(path=tmp_path / "results.sqlite3")
+    earlier = DetailedMatchResult(overall_score=80, criteria_scores=[], match_reasons="Reasons", red_flags={})
+    store.save(RESUME, "job", earlier)
+    deduplicator.check_resume(RESUME)
+    deduplicator.reuse_analysis = True
+
+    with patch('src.services.JobAnalyzer'):
+        service = ResumeAnalysisService(client=MagicMock(), store=store, deduplicator=deduplicator)
+    service.analyzer.extract_job_requirements = AsyncMock()
+
+    result = await service.analyze_resume(EDITED_RESUME, "job")
+
+    service.analyzer.extract_job_requirements.assert_not_called()
+    assert result.reused
+    assert result.overall_score == 80
+    assert result.duplicate_of.text_hash == text_hash(RESUME)
+    assert store.find(text_hash("job"), text_hash(EDITED_RESUME)).result == result
+
+
+@pytest.mark.asyncio
+async def test_service_flags_near_duplicate_without_reuse(deduplicator):
+    deduplicator.check_resume(RESUME)
+    result = DetailedMatchResult(overall_score=60, criteria_scores=[], match_reasons="Reasons", red_flags={})
+
+    with patch('src.services.JobAnalyzer'):
+        service = ResumeAnalysisService(client=MagicMock(), deduplicator=deduplicator)
+    service.analyzer.extract_job_requirements = AsyncMock(return_value=MagicMock())
+    service.analyzer.parse_resume = AsyncMock(return_value=MagicMock(markdown="unified"))
+
+    async def match_resume_events(**kwargs):
+        yield AnalysisEvent(event=AnalysisEventType.RESULT, data=result)
+
+    service.analyzer.match_resume_events = match_resume_events
+
+    result = await service.analyze_resume(EDITED_RESUME, "job")
+
+    assert not result.reused
+    assert result.duplicate_of.text_hash == text_hash(RESUME)
+
+
+JOB = """
+Senior Python Developer - Berlin
+We are looking for a senior Python developer to build data pipelines with FastAPI, PostgreSQL and Kafka.
+Five years of experience, strong communication skills and fluent English are required. Apply by 1 May.
+"""
+JOB_VARIANT = JOB.replace("Berlin", "Munich").replace("1 May", "15 May")
+
+
+@pytest.mark.asyncio
+async def test_service_reuses_requirements_of_near_duplicate_job(deduplicator):
+    deduplicator.job_threshold = 0.7
+    requirements = JobRequirements(
+        required_experience_years=5,
+        required_education_level="Bachelor's",
+        required_skills=["Python"],
+        optional_skills=[],
+        certifications_preferred=[],
+        soft_skills=["Communication"],
+        keywords_to_match=[],
+        location=Location(country="Germany", city="Berlin"),
+        emphasis=Emphasis(),
+    )
+    with patch('src.services.JobAnalyzer'):
+        service = ResumeAnalysisService(client=MagicMock(), deduplicator=deduplicator)
+    munich = Location(country="Germany", city="Munich")
+    service.analyzer.extract_job_requirements = AsyncMock(return_value=requirements)
+    service.analyzer.extract_job_location = AsyncMock(return_value=munich)
+
+    assert await service.extract_job_requirements(JOB) == requirements
+    # The same role in another city keeps the requirements but not the first posting's location
+    assert await service.extract_job_requirements(JOB_VARIANT) == requirements.model_copy(update={"location": munich})
+    assert (await service.extract_job_requirements(JOB_VARIANT)).location == munich
+    assert await service.extract_job_requirements(JOB) == requirements
+
+    service.analyzer.extract_job_requirements.assert_awaited_once_with(JOB)
+    service.analyzer.extract_job_location.assert_awaited_once_with(JOB_VARIANT)
+    records = deduplicator.index.duplicates("job")
+    assert [(record.text_hash, record.duplicate_of) for record in records] == [(text_hash(JOB_VARIANT), text_hash(JOB))]
+
+
+@pytest.mark.asyncio
+async def test_service_extracts_near_duplicate_job_in_full_without_its_location(deduplicator):
+    deduplicator.job_threshold = 0.7
+    with patch('src.services.JobAnalyzer'):
+        service = ResumeAnalysisService(client=MagicMock(), deduplicator=deduplicator)
+    service.analyzer.extract_job_requirements = AsyncMock(return_value=None)
+    deduplicator.remember_job_requirements(
+        JOB,
+        JobRequirements(
+            required_experience_years=5,
+            required_education_level="Bachelor's",
+            required_skills=["Python"],
+            optional_skills=[],
+            certifications_preferred=[],
+            soft_skills=[],
+            keywords_to_match=[],
+            location=Location(country="Germany", city="Berlin"),
+            emphasis=Emphasis(),
+        ),
+    )
+    service.analyzer.extract_job_location = AsyncMock(return_value=None)
+
+    assert await service.extract_job_requirements(JOB_VARIANT) is None
+    service.analyzer.extract_job_requirements.assert_awaited_once_with(JOB_VARIANT)
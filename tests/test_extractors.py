@@ -0,0 +1,86 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PyPDF2 import PdfReader, PdfWriter
+
+from src.extractors import create_extractor_registry, extract_pdf, extract_text_file, get_pdf_pool, pdf_workers
+
+RESUME_PDF = Path("tests/examples/test_resume.pdf")
+
+
+@pytest.fixture
+def fallback():
+    fallback = MagicMock(return_value="converted")
+    fallback.__name__ = "fallback"
+    return fallback
+
+
+@pytest.fixture
+def registry(fallback):
+    return create_extractor_registry(fallback)
+
+
+def write_long_pdf(path: Path, copies: int) -> Path:
+    writer = PdfWriter()
+    page = PdfReader(RESUME_PDF).pages[0]
+    for _ in range(copies):
+        writer.add_page(page)
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def test_select_by_magic_bytes_then_suffix(registry, fallback, tmp_path):
+    disguised_pdf = tmp_path / "resume.txt"
+    disguised_pdf.write_bytes(RESUME_PDF.read_bytes())
+    markdown = tmp_path / "resume.MD"
+    markdown.write_text("# Resume")
+    docx = tmp_path / "resume.docx"
+    docx.write_bytes(b"PK\x03\x04rest")
+
+    assert registry.select(disguised_pdf) is extract_pdf
+    assert registry.select(markdown) is extract_text_file
+    assert registry.select(docx) is fallback
+
+
+def test_extract_text_and_pdf_without_fallback(registry, fallback, tmp_path):
+    markdown = tmp_path / "resume.md"
+    markdown.write_bytes("﻿# Résumé".encode("utf-8"))
+
+    assert registry.extract(markdown) == "# Résumé"
+    assert "John Doe" in registry.extract(RESUME_PDF)
+    fallback.assert_not_called()
+
+
+def test_failed_or_empty_extraction_falls_back(registry, fallback, tmp_path):
+    broken_pdf = tmp_path / "broken.pdf"
+    broken_pdf.write_bytes(b"%PDF-1.4 truncated")
+    latin1 = tmp_path / "latin1.txt"
+    latin1.write_bytes("Résumé".encode("latin-1"))
+
+    assert registry.extract(broken_pdf) == "converted"
+    assert registry.extract(latin1) == "converted"
+    assert fallback.call_count == 2
+
+
+def test_extract_pdf_pages_in_parallel(tmp_path):
+    path = write_long_pdf(tmp_path / "long.pdf", copies=6)
+
+    get_pdf_pool.cache_clear()
+    with (
+        patch("src.extractors.settings.pdf_parallel_min_pages", 2),
+        patch("src.extractors.settings.pdf_extract_workers", 2),
+    ):
+        text = extract_pdf(path)
+        get_pdf_pool().shutdown()
+    get_pdf_pool.cache_clear()
+
+    assert text == "\n\n".join([extract_pdf(RESUME_PDF)] * 6)
+
+
+def test_pdf_workers_default_is_bounded():
+    with patch("src.extractors.settings.pdf_extract_workers", 0), patch("src.extractors.os.cpu_count", return_value=64):
+        assert pdf_workers() == 4
+    with patch("src.extractors.settings.pdf_extract_workers", 12):
+        assert pdf_workers() == 12
@@ -0,0 +1,73 @@
+from src.analysis import RedFlagAnalyzer, create_scoring_criteria
+from src.entities import ContactInfo, DetailedMatchResult, Emphasis, JobRequirements, Location, StoredMatchResult
+from src.formats import compact_stored, to_compact
+
+
+def make_result(scores, emphasis=None) -> DetailedMatchResult:
+    requirements = JobRequirements(
+        required_experience_years=5,
+        required_education_level="Bachelor's",
+        required_skills=["Python"],
+        optional_skills=[],
+        certifications_preferred=[],
+        soft_skills=[],
+        keywords_to_match=[],
+        location=Location(country="Germany", city="Berlin"),
+        emphasis=emphasis or Emphasis(),
+    )
+    criteria = create_scoring_criteria(requirements)
+    for criterion, score in zip(criteria, scores):
+        criterion.score = score
+    return DetailedMatchResult(
+        overall_score=sum(scores) // len(scores),
+        criteria_scores=criteria,
+        match_reasons="A long explanation " * 50,
+        red_flags=RedFlagAnalyzer().analyze(criteria),
+        contact=ContactInfo(website="https://jane.dev", email="jane@example.com"),
+    )
+
+
+def test_to_compact_sends_criteria_once():
+    first = make_result([90, 80, 70, 20, 60, 95])
+    second = make_result([50, 50, 50, 50, 50, 50], Emphasis(technical_skills_weight=80))
+
+    compact = to_compact([("a", first), ("b", second)])
+
+    assert [criterion.key for criterion in compact.criteria] == [c.key for c in first.criteria_scores]
+    row = dict(zip(compact.columns, compact.rows[0]))
+    assert row == {
+        "id": "a",
+        "overall_score": first.overall_score,
+        "scores": [90, 80, 70, 20, 60, 95],
+        "flags": [0, 0, 0, 3, 1, 0],
+        "weights": None,
+        "candidate": "jane@example.com",
+    }
+    weights = dict(zip(compact.columns, compact.rows[1]))["weights"]
+    assert weights[3] == 80
+
+
+def test_flags_come_from_criterion_scores_not_flag_text():
+    result = make_result([90, 80, 70, 20, 60, 95])
+    result.red_flags = {"high": ["Low Skills"], "medium": [], "low": []}
+    compact = to_compact([("a", result)])
+
+    row = dict(zip(compact.columns, compact.rows[0]))
+
+    assert row["flags"] == [0, 0, 0, 3, 1, 0]
+
+
+def test_compact_is_several_times_smaller():
+    results = [
+        StoredMatchResult(
+            result_id=f"{index:032x}",
+            job_hash="j" * 64,
+            resume_hash="r" * 64,
+            created_at="2024-01-01T00:00:00Z",
+            result=make_result([index % 100] * 6),
+        )
+        for index in range(200)
+    ]
+    full = sum(len(item.model_dump_json()) for item in results)
+
+    assert len(compact_stored(results).model_dump_json()) * 5 < full
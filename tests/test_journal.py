@@ -0,0 +1,34 @@
+from unittest.mock import patch
+
+from src.conf import settings
+from src.entities import ContactInfo, DetailedMatchResult, JournalStage, UnifiedResume
+from src.journal import ProgressJournal, get_config_version
+
+
+def test_journal_tracks_stages(tmp_path):
+    journal = ProgressJournal(path=tmp_path / "journal.sqlite3")
+    unified = UnifiedResume(markdown="# Jane", contact=ContactInfo(email="jane@example.com"))
+    result = DetailedMatchResult(overall_score=70, criteria_scores=[], match_reasons="", red_flags={})
+
+    assert journal.get("resume", "job", "v1") is None
+    journal.save_unified("resume", "job", "v1", unified)
+    entry = journal.get("resume", "job", "v1")
+    assert (entry.stage, entry.unified) == (JournalStage.UNIFIED, unified)
+
+    journal.save_result("resume", "job", "v1", result)
+    entry = journal.get("resume", "job", "v1")
+    assert (entry.stage, entry.result, entry.unified) == (JournalStage.COMPLETED, result, None)
+    assert journal.get("resume", "job", "v2") is None
+    assert journal.count("job", "v1", JournalStage.COMPLETED) == 1
+
+
+def test_config_version_follows_models_and_manual_version():
+    version = get_config_version()
+
+    assert get_config_version() == version
+    with patch.object(settings, "openai_model_name", "gpt-4.1-mini"):
+        assert get_config_version() != version
+    with patch.object(settings, "journal_config_version", "2"):
+        assert get_config_version() != version
+    assert get_config_version(min_score=70) != version
+    assert get_config_version(max_tokens=500) != version
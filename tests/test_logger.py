@@ -0,0 +1,48 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from src.logger import TimeLogger
+
+
+def get_count(stage, outcome):
+    return (
+        REGISTRY.get_sample_value("cv_matcher_stage_duration_seconds_count", {"stage": stage, "outcome": outcome}) or 0
+    )
+
+
+def test_time_logger_records_success():
+    before = get_count("logger_test", "success")
+
+    with TimeLogger("Test stage", stage="logger_test") as timer:
+        pass
+
+    assert timer.duration is not None
+    assert get_count("logger_test", "success") == before + 1
+
+
+def test_time_logger_records_error():
+    before = get_count("logger_test", "error")
+
+    with pytest.raises(ValueError):
+        with TimeLogger("Test stage", stage="logger_test"):
+            raise ValueError("failure")
+
+    assert get_count("logger_test", "error") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_time_logger_async():
+    before = get_count("logger_async_test", "success")
+
+    async with TimeLogger("Test stage", stage="logger_async_test") as timer:
+        pass
+
+    assert timer.duration is not None
+    assert get_count("logger_async_test", "success") == before + 1
+
+
+def test_time_logger_without_stage():
+    with TimeLogger("Test stage") as timer:
+        pass
+
+    assert timer.duration is not None
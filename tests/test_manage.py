@@ -1,3 +1,6 @@
+import json
+import subprocess  # nosec: B404
+import sys
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -6,6 +9,16 @@ from click.testing import CliRunner
 from src.manage import cli
 
 
+@pytest.fixture(autouse=True)
+def disabled_stores():
+    with (
+        patch('src.results.get_results_store', return_value=None),
+        patch('src.dedup.get_deduplicator', return_value=None),
+        patch('src.journal.get_progress_journal', return_value=None),
+    ):
+        yield
+
+
 @pytest.fixture
 def cli_runner():
     return CliRunner()
@@ -13,7 +26,7 @@ def cli_runner():
 
 @pytest.fixture
 def mock_service():
-    with patch('src.manage.ResumeAnalysisService') as mock:
+    with patch('src.services.ResumeAnalysisService') as mock:
         service_instance = MagicMock()
         service_instance.process_files.return_value = ('resume content', 'job description content')
         service_instance.analyze_resume = AsyncMock(
@@ -30,7 +43,7 @@ def mock_service():
 
 @pytest.fixture
 def mock_client():
-    with patch('src.manage.AIClient') as mock:
+    with patch('src.client.AIClient') as mock:
         client_instance = MagicMock()
         mock.return_value = client_instance
         yield client_instance
@@ -49,7 +62,7 @@ def test_cli_analyze_success(cli_runner, mock_service, mock_client, tmp_path):
 
     assert result.exit_code == 0
     mock_service.process_files.assert_called_once()
-    mock_service.analyze_resume.assert_called_once_with('resume content', 'job description content')
+    mock_service.analyze_resume.assert_called_once_with('resume content', 'job description content', min_score=None)
     mock_service.show_analysis_result.assert_called_once()
 
 
@@ -80,7 +93,7 @@ async def test_cli_analyze_service_error(cli_runner, mock_service, mock_client,
     assert "An unexpected error occurred during analysis" in result.output
 
 
-@patch('src.manage.uvicorn.run')
+@patch('uvicorn.run')
 def test_start_server(mock_uvicorn_run, cli_runner):
     result = cli_runner.invoke(cli, ['start-server'])
 
@@ -90,3 +103,150 @@ def test_start_server(mock_uvicorn_run, cli_runner):
     assert call_kwargs['app'] == "src.server:app"
     assert isinstance(call_kwargs['port'], int)
     assert isinstance(call_kwargs['workers'], int)
+
+
+@patch('src.tasks.get_task_queue')
+@patch('src.tasks.TaskWorker')
+def test_worker(mock_worker, mock_get_task_queue, cli_runner, mock_service, mock_client):
+    mock_worker.return_value.run = AsyncMock()
+
+    result = cli_runner.invoke(cli, ['worker', '--concurrency', '2'])
+
+    assert result.exit_code == 0
+    assert mock_worker.call_args[1]['concurrency'] == 2
+    mock_worker.return_value.run.assert_awaited_once()
+
+
+def test_cli_import_does_not_load_heavy_dependencies():
+    heavy = ("uvicorn", "markitdown", "rich", "openai", "anthropic")
+    code = f"import sys, src.manage; print(' '.join(m for m in {heavy!r} if m in sys.modules))"
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)  # nosec: B603
+
+    assert completed.stdout.strip() == ""
+
+
+def test_cache_commands(cli_runner, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    (cache_dir / "entry.json").write_text('{"data": "value", "type": "str"}')
+    (cache_dir / "broken.json").write_text('{"data"')
+
+    with patch('src.cache.settings.cache_dir', str(cache_dir)):
+        stats = cli_runner.invoke(cli, ['cache', 'stats'])
+        verify = cli_runner.invoke(cli, ['cache', 'verify'])
+        prune = cli_runner.invoke(cli, ['cache', 'prune', '--max-size', '0'])
+        missing_limits = cli_runner.invoke(cli, ['cache', 'prune'])
+
+    assert stats.exit_code == 0
+    assert "corrupt" in stats.output
+    assert "Removed 1 corrupt entries" in verify.output
+    assert "Removed 1 entries" in prune.output
+    assert list(cache_dir.glob("*.json")) == []
+    assert missing_limits.exit_code != 0
+
+
+def test_rerank_command(cli_runner, tmp_path):
+    def result(technical_score: int, soft_score: int) -> str:
+        criteria = [
+            {"name": "Technical Skills", "key": "technical_skills", "weight": 50, "description": "", "factors": []},
+            {"name": "Soft Skills", "key": "soft_skills", "weight": 50, "description": "", "factors": []},
+        ]
+        criteria[0]["score"], criteria[1]["score"] = technical_score, soft_score
+        return json.dumps({"overall_score": 50, "criteria_scores": criteria, "match_reasons": "", "red_flags": {}})
+
+    results_path = tmp_path / "results.jsonl"
+    results_path.write_text(result(10, 90) + "\n" + result(90, 10) + "\n")
+    output_path = tmp_path / "ranked.json"
+
+    result = cli_runner.invoke(
+        cli,
+        [
+            'rerank',
+            '--results_path',
+            str(results_path),
+            '--weight',
+            'technical_skills=80',
+            '--output',
+            str(output_path),
+        ],
+    )
+    invalid = cli_runner.invoke(cli, ['rerank', '--results_path', str(results_path), '--weight', 'typing=80'])
+
+    assert result.exit_code == 0
+    assert [item["index"] for item in json.loads(output_path.read_text())] == [1, 0]
+    assert invalid.exit_code != 0
+
+
+def test_screen_command(cli_runner, mock_service, mock_client, tmp_path):
+    from src.entities import DetailedMatchResult, ModelTier, RankedMatchResult
+
+    resumes_dir = tmp_path / "resumes"
+    resumes_dir.mkdir()
+    (resumes_dir / "alice.txt").write_text("Alice")
+    (resumes_dir / "bob.txt").write_text("Bob")
+    job_desc_file = tmp_path / "job.txt"
+    job_desc_file.write_text("Test job description")
+    mock_service.extractors.extract.side_effect = lambda path: path.read_text()
+    mock_service.screen_resumes = AsyncMock(
+        return_value=[
+            RankedMatchResult(
+                rank=1,
+                index=1,
+                result=DetailedMatchResult(
+                    overall_score=80, criteria_scores=[], match_reasons="", red_flags={}, tier=ModelTier.STRONG
+                ),
+            )
+        ]
+    )
+
+    result = cli_runner.invoke(
+        cli,
+        ['screen', '--resumes_dir', str(resumes_dir), '--job_desc_path', str(job_desc_file), '--cascade'],
+    )
+
+    assert result.exit_code == 0
+    assert "strong  bob.txt" in result.output
+    mock_service.screen_resumes.assert_awaited_once_with(
+        ["Alice", "Bob"], "Test job description", shortlist_size=10, shortlist_min_score=None, concurrency=None
+    )
+
+
+def test_pipeline_command(cli_runner, mock_service, mock_client, tmp_path):
+    from src.pipeline import PipelineStats
+
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("alice.md\n")
+    job_desc_file = tmp_path / "job.txt"
+    job_desc_file.write_text("Test job description")
+    output = tmp_path / "results.jsonl"
+
+    with patch('src.pipeline.ResumePipeline') as mock_pipeline:
+        mock_pipeline.return_value.run = AsyncMock(return_value=PipelineStats(completed=3, failed=1))
+        result = cli_runner.invoke(
+            cli,
+            ['pipeline', '--input', str(manifest), '--job_desc_path', str(job_desc_file), '--output', str(output)],
+        )
+
+    assert result.exit_code == 0
+    assert "Completed 3 (0 resumed), failed 1" in result.output
+    items, job_description = mock_pipeline.return_value.run.await_args.args
+    assert [item.item_id for item in items] == ["alice.md"]
+    assert job_description == "Test job description"
+
+
+def test_dedup_report_command(cli_runner, tmp_path):
+    from src.dedup import FingerprintIndex, minhash
+    from src.entities import NearDuplicate
+
+    index = FingerprintIndex(path=tmp_path / "fingerprints.sqlite3")
+    index.add("job", "a" * 64, minhash("senior python developer in berlin"))
+    index.add("job", "b" * 64, minhash("senior python developer in munich"))
+    index.record_duplicate("job", "b" * 64, NearDuplicate(text_hash="a" * 64, similarity=0.92))
+    output_path = tmp_path / "report.json"
+
+    with patch('src.dedup.FingerprintIndex', return_value=index):
+        result = cli_runner.invoke(cli, ['dedup-report', '--output', str(output_path)])
+
+    assert result.exit_code == 0
+    assert "Deduplicated 1 of 2 indexed job documents" in result.output
+    assert json.loads(output_path.read_text())[0]["duplicate_of"] == "a" * 64
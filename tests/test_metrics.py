@@ -0,0 +1,57 @@
+import pytest
+from prometheus_client import REGISTRY
+from pydantic_ai.usage import Usage
+
+from src.metrics import estimate_cost, record_cache_hit, record_request_error, record_usage
+
+
+def get_sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_estimate_cost_known_model():
+    usage = Usage(request_tokens=1_000_000, response_tokens=1_000_000, details={"cached_tokens": 500_000})
+
+    # 0.5M uncached input, 0.5M cached input and 1M output tokens
+    assert estimate_cost("gpt-4o-mini", usage) == pytest.approx(0.5 * 0.15 + 0.5 * 0.075 + 0.60)
+
+
+def test_estimate_cost_prices_anthropic_cache_writes():
+    usage = Usage(
+        request_tokens=3_000_000,
+        response_tokens=0,
+        details={"cache_creation_input_tokens": 1_000_000, "cache_read_input_tokens": 1_000_000},
+    )
+
+    assert estimate_cost("claude-3-5-haiku-latest", usage) == pytest.approx(0.80 + 1.00 + 0.08)
+
+
+def test_estimate_cost_unknown_model():
+    assert estimate_cost("unknown", Usage(request_tokens=1000, response_tokens=1000)) == 0
+
+
+def test_record_usage():
+    labels = dict(provider="openai", model="gpt-4o-mini", stage="metrics_test")
+    before = get_sample("cv_matcher_llm_tokens_total", type="request", **labels)
+
+    record_usage(
+        **labels, usage=Usage(request_tokens=2000, response_tokens=10, details={"cached_tokens": 1024}), duration=1.5
+    )
+
+    assert get_sample("cv_matcher_llm_tokens_total", type="request", **labels) == before + 2000
+    assert get_sample("cv_matcher_llm_tokens_total", type="cached", **labels) >= 1024
+    assert get_sample("cv_matcher_llm_requests_total", outcome="success", **labels) >= 1
+    assert get_sample("cv_matcher_llm_request_duration_seconds_count", **labels) >= 1
+    assert get_sample("cv_matcher_llm_cost_usd_total", **labels) > 0
+
+
+def test_record_cache_hit_and_error():
+    labels = dict(provider="anthropic", model="test_model", stage="metrics_test")
+    hits = get_sample("cv_matcher_llm_cache_hits_total", **labels)
+    errors = get_sample("cv_matcher_llm_requests_total", outcome="error", **labels)
+
+    record_cache_hit(**labels)
+    record_request_error(**labels, duration=0.1)
+
+    assert get_sample("cv_matcher_llm_cache_hits_total", **labels) == hits + 1
+    assert get_sample("cv_matcher_llm_requests_total", outcome="error", **labels) == errors + 1
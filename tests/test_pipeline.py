@@ -0,0 +1,185 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.dedup import Deduplicator, FingerprintIndex
+from src.entities import ContactInfo, DetailedMatchResult, PipelineRecord, UnifiedResume
+from src.journal import ProgressJournal
+from src.pipeline import PipelineItem, ResumePipeline, iter_inputs
+from src.results import ResultsStore, text_hash
+from src.services import ResumeAnalysisService
+
+
+@pytest.fixture
+def service():
+    with patch('src.services.JobAnalyzer', return_value=AsyncMock()):
+        service = ResumeAnalysisService(client=MagicMock())
+    service.analyzer.extract_job_requirements.return_value = ["Python"]
+
+    async def parse_resume(text):
+        if "unreadable" in text:
+            raise ValueError("Could not unify resume")
+        return UnifiedResume(markdown=text.upper(), contact=ContactInfo())
+
+    service.analyzer.parse_resume.side_effect = parse_resume
+    service.analyzer.match_resume.side_effect = lambda **kwargs: DetailedMatchResult(
+        overall_score=len(kwargs["resume_text"]), criteria_scores=[], match_reasons="", red_flags={}
+    )
+    return service
+
+
+def test_iter_inputs(tmp_path):
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    (resumes / "alice.md").write_text("Alice")
+    (resumes / "bob.txt").write_text("Bob")
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# screened today\nresumes/alice.md\n\nresumes/bob.txt\n")
+    jsonl = tmp_path / "resumes.jsonl"
+    jsonl.write_text('{"id": "carol", "resume_text": "Carol"}\n{"path": "resumes/bob.txt"}\n{"id": "dave", \n[]\n')
+
+    assert sorted(item.item_id for item in iter_inputs(resumes)) == ["alice.md", "bob.txt"]
+    assert [item.path for item in iter_inputs(manifest)] == [resumes / "alice.md", resumes / "bob.txt"]
+    assert [(item.item_id, item.text, item.path) for item in iter_inputs(jsonl)] == [
+        ("carol", "Carol", None),
+        ("2", None, resumes / "bob.txt"),
+        ("3", None, None),
+        ("4", None, None),
+    ]
+    assert [item.error.split(":")[1].strip() for item in iter_inputs(jsonl) if item.error] == [
+        "Invalid JSON",
+        "Line is not a JSON object",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_writes_results_and_errors(service, tmp_path):
+    (tmp_path / "alice.md").write_text("Alice")
+    items = [
+        PipelineItem(item_id="alice", path=tmp_path / "alice.md"),
+        PipelineItem(item_id="bob", text="Bob Smith"),
+        PipelineItem(item_id="eve", text="unreadable scan"),
+        PipelineItem(item_id="ghost", path=tmp_path / "missing.pdf"),
+        PipelineItem(item_id="7", error="read: Invalid JSON: Expecting value"),
+    ]
+    output = tmp_path / "results.jsonl"
+
+    stats = await ResumePipeline(service, output, queue_size=2, concurrency=2, min_score=40).run(items, "job")
+
+    records = {record.id: record for record in map(PipelineRecord.model_validate_json, output.read_text().splitlines())}
+    assert (stats.completed, stats.failed) == (2, 3)
+    assert records["alice"].result.overall_score == len("ALICE")
+    assert records["bob"].resume_hash is not None
+    assert records["eve"].error == "unify: Could not unify resume"
+    assert records["ghost"].error.startswith("convert:")
+    assert records["7"].error == "read: Invalid JSON: Expecting value"
+    assert {call.kwargs["min_score"] for call in service.analyzer.match_resume.await_args_list} == {40}
+    service.analyzer.extract_job_requirements.assert_awaited_once_with("job")
+
+
+@pytest.mark.asyncio
+async def test_pipeline_reads_no_further_than_the_queues_hold(service, tmp_path):
+    read = 0
+
+    def items():
+        nonlocal read
+        for number in range(1000):
+            read += 1
+            yield PipelineItem(item_id=str(number), text=f"resume {number}")
+
+    scoring = asyncio.Event()
+
+    async def match_resume(**kwargs):
+        await scoring.wait()
+        return DetailedMatchResult(overall_score=50, criteria_scores=[], match_reasons="", red_flags={})
+
+    service.analyzer.match_resume.side_effect = match_resume
+    output = tmp_path / "results.jsonl"
+    run = asyncio.create_task(ResumePipeline(service, output, queue_size=2, concurrency=1).run(items(), "job"))
+    await asyncio.sleep(0.05)
+
+    # Three queues of two plus one item per worker and the reader's pending put
+    assert read <= 3 * 2 + 3 + 1
+    scoring.set()
+    stats = await run
+    assert stats.completed == 1000
+    assert len(output.read_text().splitlines()) == 1000
+    assert json.loads(output.read_text().splitlines()[0])["result"]["overall_score"] == 50
+
+
+@pytest.mark.asyncio
+async def test_restarted_pipeline_resumes_from_the_journal(service, tmp_path):
+    journal = ProgressJournal(path=tmp_path / "journal.sqlite3")
+    output = tmp_path / "results.jsonl"
+    scored = service.analyzer.match_resume.side_effect
+
+    def crash_on_bob(**kwargs):
+        if kwargs["resume_text"] == "BOB":
+            raise RuntimeError("worker restarted")
+        return scored(**kwargs)
+
+    def items():
+        return [PipelineItem(item_id=name, text=name) for name in ("Alice", "Bob", "Carol")]
+
+    service.analyzer.match_resume.side_effect = crash_on_bob
+    first = await ResumePipeline(service, output, concurrency=1, journal=journal).run(items(), "job")
+    service.analyzer.parse_resume.reset_mock()
+    service.analyzer.match_resume.side_effect = scored
+    second = await ResumePipeline(service, output, concurrency=1, journal=journal).run(items(), "job")
+
+    assert (first.completed, first.failed) == (2, 1)
+    assert (second.completed, second.resumed, second.skipped) == (1, 1, 2)
+    service.analyzer.parse_resume.assert_not_awaited()
+    records = [PipelineRecord.model_validate_json(line) for line in output.read_text().splitlines()]
+    assert [(record.id, record.result.overall_score) for record in records] == [("Alice", 5), ("Bob", 3), ("Carol", 5)]
+
+    # Pointed at a new output, a restart still writes every result from the journal
+    new_output = tmp_path / "rerun.jsonl"
+    third = await ResumePipeline(service, new_output, concurrency=1, journal=journal).run(items(), "job")
+    assert (third.completed, third.skipped) == (0, 3)
+    assert new_output.read_text() == output.read_text()
+
+
+@pytest.mark.asyncio
+async def test_journal_does_not_reuse_results_stopped_early_for_another_min_score(service, tmp_path):
+    journal = ProgressJournal(path=tmp_path / "journal.sqlite3")
+    items = [PipelineItem(item_id="alice", text="Alice")]
+
+    await ResumePipeline(service, tmp_path / "screened.jsonl", min_score=100, journal=journal).run(items, "job")
+    stats = await ResumePipeline(service, tmp_path / "full.jsonl", journal=journal).run(items, "job")
+
+    assert (stats.completed, stats.skipped) == (1, 0)
+    assert [call.kwargs["min_score"] for call in service.analyzer.match_resume.await_args_list] == [100, None]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_flags_and_reuses_near_duplicate_resumes(service, tmp_path):
+    service.store = ResultsStore(path=tmp_path / "results.sqlite3")
+    service.deduplicator = Deduplicator(
+        index=FingerprintIndex(path=tmp_path / "fingerprints.sqlite3"), resume_threshold=0.7, reuse_analysis=False
+    )
+    original = (
+        "Jane Doe, senior Python developer with eight years of data pipelines and web services in FastAPI, "
+        "PostgreSQL and Kafka. Led a team of five engineers moving a monolith to microservices on Kubernetes."
+    )
+    service.analyzer.match_resume.side_effect = lambda **kwargs: DetailedMatchResult(
+        overall_score=80, criteria_scores=[], match_reasons="", red_flags={}
+    )
+
+    async def run(item_id, text):
+        output = tmp_path / f"{item_id}.jsonl"
+        await ResumePipeline(service, output, concurrency=1).run([PipelineItem(item_id=item_id, text=text)], "job")
+        return PipelineRecord.model_validate_json(output.read_text())
+
+    await run("original", original)
+    flagged = await run("edited", original.replace("eight years", "8 years"))
+    service.deduplicator.reuse_analysis = True
+    reused = await run("reedited", original.replace("team of five", "team of six"))
+
+    assert flagged.result.duplicate_of.text_hash == text_hash(original)
+    assert not flagged.result.reused
+    assert reused.result.reused
+    assert reused.result.duplicate_of.text_hash == text_hash(original)
+    assert service.analyzer.parse_resume.await_count == 2
@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock
+
+from anthropic.types import Usage as AnthropicUsage
+from pydantic_ai.messages import ModelRequest, SystemPromptPart, UserPromptPart
+from pydantic_ai.usage import Usage
+
+from src.metrics import get_cached_tokens
+from src.providers import CachingAnthropicAgentModel, CachingAnthropicModel
+
+
+def create_agent_model(cache_prefix: str = "") -> CachingAnthropicAgentModel:
+    return CachingAnthropicAgentModel(MagicMock(), "test_model", True, [], cache_prefix=cache_prefix)
+
+
+def test_map_message_marks_prefix_as_cache_breakpoint():
+    agent_model = create_agent_model(cache_prefix="Resume: ...")
+    messages = [ModelRequest(parts=[SystemPromptPart("system"), UserPromptPart("Resume: ... Evaluate")])]
+
+    system_prompt, anthropic_messages = agent_model._map_message(messages)
+
+    assert system_prompt == "system"
+    assert anthropic_messages[0]["content"] == [
+        {"type": "text", "text": "Resume: ...", "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": " Evaluate"},
+    ]
+
+
+def test_map_message_without_prefix():
+    agent_model = create_agent_model()
+    messages = [ModelRequest(parts=[UserPromptPart("Evaluate")])]
+
+    _, anthropic_messages = agent_model._map_message(messages)
+
+    assert anthropic_messages[0]["content"] == "Evaluate"
+
+
+def test_map_usage_reports_cached_tokens():
+    response = MagicMock()
+    response.usage = AnthropicUsage(
+        input_tokens=10,
+        output_tokens=5,
+        cache_creation_input_tokens=0,
+        cache_read_input_tokens=1500,
+    )
+
+    usage = CachingAnthropicAgentModel._map_usage(response)
+
+    assert usage.request_tokens == 1510
+    assert usage.total_tokens == 1515
+    assert get_cached_tokens(usage) == 1500
+
+
+def test_get_cached_tokens_openai_details():
+    assert get_cached_tokens(Usage(details={"cached_tokens": 1024})) == 1024
+    assert get_cached_tokens(Usage()) == 0
+
+
+def test_caching_anthropic_model_base_url():
+    model = CachingAnthropicModel("claude-3-5-haiku-latest", api_key="key", base_url="http://localhost:9000")
+
+    assert str(model.client.base_url).startswith("http://localhost:9000")
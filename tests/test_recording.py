@@ -0,0 +1,93 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+from pydantic_ai.usage import Usage
+
+from src.client import AIClient, ModelType
+from src.entities import ArchiveMode
+from src.recording import ProviderArchive, ReplayMissError, get_request_key
+
+
+class TestResponse(BaseModel):
+    name: str
+    score: float
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    return tmp_path / "archive.jsonl"
+
+
+def create_client(tmp_path, archive: ProviderArchive) -> AIClient:
+    with patch("src.client.settings.cache_dir", str(tmp_path / "cache")):
+        return AIClient(ModelType.OPENAI, archive=archive)
+
+
+def mock_agent_response(data, usage: Usage):
+    response = MagicMock()
+    response.data = data
+    response.usage = lambda: usage
+    return response
+
+
+def test_request_key_ignores_whitespace():
+    key = get_request_key("openai", "gpt-4o-mini", "Score   this\n    resume", "system")
+
+    assert key == get_request_key("openai", "gpt-4o-mini", "Score this resume", "  system ")
+    assert key != get_request_key("openai", "gpt-4o", "Score this resume", "system")
+    assert key != get_request_key("openai", "gpt-4o-mini", "Score this resume", "system", TestResponse)
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay(tmp_path, archive_path):
+    recorder = create_client(tmp_path, ProviderArchive(archive_path, mode=ArchiveMode.RECORD))
+    responses = [
+        mock_agent_response("85", Usage(requests=1, total_tokens=100)),
+        mock_agent_response(TestResponse(name="Test", score=0.95), Usage(requests=1, total_tokens=50)),
+    ]
+    with patch("src.client.Agent") as MockAgent:
+        MockAgent.return_value.run = AsyncMock(side_effect=responses)
+        await recorder.run("score prompt", use_cache=False, stage="technical_skills")
+        await recorder.run("structured prompt", result_type=TestResponse, use_cache=False)
+
+    replayer = create_client(tmp_path, ProviderArchive(archive_path, mode=ArchiveMode.REPLAY, latency_scale=0))
+    with patch("src.client.Agent") as MockAgent:
+        assert await replayer.run("score prompt") == "85"
+        assert await replayer.run("structured prompt", result_type=TestResponse) == TestResponse(
+            name="Test", score=0.95
+        )
+        MockAgent.assert_not_called()
+
+    assert replayer.usage.total_tokens == 150
+    with pytest.raises(ReplayMissError):
+        await replayer.run("unseen prompt")
+
+
+@pytest.mark.asyncio
+async def test_recording_with_a_warm_cache_archives_cached_prompts(tmp_path, archive_path):
+    with patch("src.client.Agent") as MockAgent:
+        MockAgent.return_value.run = AsyncMock(return_value=mock_agent_response("70", Usage(requests=1)))
+        await create_client(tmp_path, archive=None).run("score prompt")
+
+        MockAgent.return_value.run = AsyncMock(return_value=mock_agent_response("85", Usage(requests=1)))
+        recorder = create_client(tmp_path, ProviderArchive(archive_path, mode=ArchiveMode.RECORD))
+        assert await recorder.run("score prompt") == "85"
+        MockAgent.return_value.run.assert_awaited_once()
+
+    replayer = create_client(tmp_path, ProviderArchive(archive_path, mode=ArchiveMode.REPLAY, latency_scale=0))
+    assert await replayer.run("score prompt") == "85"
+    assert await create_client(tmp_path, archive=None).run("score prompt") == "85"
+
+
+@pytest.mark.asyncio
+async def test_replay_cycles_repeated_requests_with_scaled_latency(archive_path):
+    recorder = ProviderArchive(archive_path)
+    recorder.record("key", "unify", "first", Usage(), latency=2.0)
+    recorder.record("key", "unify", "second", Usage(), latency=4.0)
+
+    replay = ProviderArchive(archive_path, mode=ArchiveMode.REPLAY, latency_scale=0.5)
+    with patch("src.recording.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        assert [(await replay.replay("key")).data for _ in range(3)] == ["first", "second", "first"]
+
+    assert [call.args[0] for call in mock_sleep.await_args_list] == [1.0, 2.0, 1.0]
@@ -0,0 +1,100 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.entities import AnalysisEvent, AnalysisEventType, DetailedMatchResult, RedFlagLevel, ScoringCriterion
+from src.results import ResultsStore, get_red_flag_level, text_hash
+from src.services import ResumeAnalysisService
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultsStore(path=tmp_path / "results.sqlite3")
+
+
+def make_result(overall_score: int, skills_score: int = 50, red_flags=None) -> DetailedMatchResult:
+    return DetailedMatchResult(
+        overall_score=overall_score,
+        criteria_scores=[
+            ScoringCriterion(
+                name="Technical Skills",
+                key="technical_skills",
+                weight=50,
+                description="",
+                factors=[],
+                score=skills_score,
+            ),
+            ScoringCriterion(name="Soft Skills", key="soft_skills", weight=50, description="", factors=[], score=50),
+        ],
+        match_reasons="Reasons",
+        red_flags=red_flags or {"low": [], "medium": [], "high": []},
+    )
+
+
+def test_red_flag_level():
+    assert get_red_flag_level(make_result(80)) == RedFlagLevel.NONE
+    assert get_red_flag_level(make_result(80, red_flags={"low": ["a"], "medium": ["b"]})) == RedFlagLevel.MEDIUM
+
+
+def test_save_replaces_same_pair(store):
+    first = store.save("resume", "job", make_result(60))
+    second = store.save("resume ", "job", make_result(80))
+
+    assert store.get(first.result_id) is None
+    assert store.get(second.result_id).result.overall_score == 80
+    assert second.job_hash == text_hash("job")
+    assert [item.result_id for item in store.top(text_hash("job"))] == [second.result_id]
+
+
+def test_top_by_score_criterion_and_red_flags(store):
+    store.save("a", "job", make_result(90, skills_score=40, red_flags={"high": ["Low Experience"]}))
+    store.save("b", "job", make_result(80, skills_score=95))
+    store.save("c", "job", make_result(70, skills_score=60))
+    store.save("d", "other job", make_result(100))
+
+    def scores(results):
+        return [item.result.overall_score for item in results]
+
+    assert scores(store.top(text_hash("job"), k=2)) == [90, 80]
+    assert scores(store.top(text_hash("job"), criterion="technical_skills")) == [80, 70, 90]
+    assert scores(store.top(text_hash("job"), max_red_flag_level=RedFlagLevel.MEDIUM)) == [80, 70]
+
+
+def test_page_with_cursor(store):
+    for index, score in enumerate([50, 90, 70, 70, 30]):
+        store.save(f"resume {index}", "job", make_result(score))
+
+    seen = []
+    page = store.page(limit=2)
+    while True:
+        seen.extend(item.result.overall_score for item in page.items)
+        if page.next_cursor is None:
+            break
+        page = store.page(limit=2, cursor=page.next_cursor)
+
+    assert seen == [90, 70, 70, 50, 30]
+    assert [item.result.overall_score for item in store.page(min_score=60).items] == [90, 70, 70]
+    with pytest.raises(ValueError):
+        store.page(cursor="bogus")
+
+
+@pytest.mark.asyncio
+async def test_service_stores_results(store):
+    result = make_result(75)
+    with patch('src.services.JobAnalyzer'):
+        service = ResumeAnalysisService(client=MagicMock(), store=store)
+    service.analyzer.extract_job_requirements = AsyncMock(return_value=MagicMock())
+    service.analyzer.parse_resume = AsyncMock(return_value=MagicMock(markdown="unified"))
+
+    async def match_resume_events(**kwargs):
+        yield AnalysisEvent(event=AnalysisEventType.RESULT, data=result)
+
+    service.analyzer.match_resume_events = match_resume_events
+
+    await service.analyze_resume("resume text", "job description")
+    await asyncio.sleep(0)
+
+    stored = store.top(text_hash("job description"))
+    assert [item.result for item in stored] == [result]
+    assert stored[0].resume_hash == text_hash("resume text")
@@ -1,17 +1,62 @@
+import asyncio
+import json
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock, patch
 
+import httpx
 import pytest
+from fastapi import FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.testclient import TestClient
 from markitdown._markitdown import FileConversionException
 
-from src.entities import DetailedMatchResult, ScoringCriterion
+from src.admission import AdmissionController, AdmissionRejected
+from src.entities import AnalysisEvent, AnalysisEventType, DetailedMatchResult, ScoringCriterion
+from src.results import ResultsStore, text_hash
 from src.routers import router
+from src.tasks import TaskQueue
 
 client = TestClient(router)
 
 
+@pytest.fixture
+def results_store(tmp_path):
+    store = ResultsStore(path=tmp_path / "results.sqlite3")
+    with patch("src.routers.get_results_store", return_value=store):
+        yield store
+
+
+@pytest.fixture(autouse=True)
+def disabled_results_store(request):
+    if "results_store" in request.fixturenames:
+        yield
+        return
+    with patch("src.routers.get_results_store", return_value=None):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def disabled_deduplicator():
+    with patch("src.routers.get_deduplicator", return_value=None):
+        yield
+
+
+@pytest.fixture
+def admission():
+    admission = Mock()
+    with patch("src.routers.get_admission_controller", return_value=admission):
+        yield admission
+
+
+@pytest.fixture(autouse=True)
+def disabled_admission(request):
+    if "admission" in request.fixturenames:
+        yield
+        return
+    with patch("src.routers.get_admission_controller", return_value=None):
+        yield
+
+
 def test_ping_endpoint():
     """Test the health check endpoint."""
     response = client.get("/ping")
@@ -19,6 +64,16 @@ def test_ping_endpoint():
     assert response.json() == {"ping": "pong"}
 
 
+def test_msgpack_content_negotiation():
+    msgpack = pytest.importorskip("msgpack")
+    response = client.get("/ping", headers={"Accept": "application/msgpack"})
+
+    assert response.headers["content-type"] == "application/msgpack"
+    assert response.headers["vary"] == "Accept"
+    assert msgpack.unpackb(response.content) == client.get("/ping").json()
+    assert client.get("/ping").headers["vary"] == "Accept"
+
+
 @pytest.fixture
 def sample_files():
     """Fixture providing paths to test files."""
@@ -79,6 +134,29 @@ async def test_analyze_resume_success(sample_files, mock_service):
     assert result["match_reasons"] == "Strong technical background with relevant skills"
 
 
+@pytest.mark.asyncio
+async def test_analyze_resume_extracts_text_off_the_event_loop(sample_files, mock_service):
+    def process_files(resume_path, job_desc_path):
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        return "resume content", "job description content"
+
+    mock_service.process_files.side_effect = process_files
+    resume_path, job_desc_path = sample_files
+
+    with open(resume_path, "rb") as resume_file, open(job_desc_path, "rb") as job_desc_file:
+        response = client.post(
+            "/analyze_resume",
+            files={
+                "resume_file": ("test_resume.pdf", resume_file, "application/pdf"),
+                "job_description_file": ("job_description.txt", job_desc_file, "text/plain"),
+            },
+        )
+
+    assert response.status_code == 200
+    mock_service.process_files.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_analyze_resume_invalid_file():
     """Test resume analysis with invalid file."""
@@ -103,3 +181,285 @@ async def test_analyze_resume_missing_file():
                 # Missing job description file
             },
         )
+
+
+@pytest.mark.asyncio
+async def test_analyze_resume_stream(sample_files, mock_service):
+    """Test streaming resume analysis progress as server-sent events."""
+    result = mock_service.analyze_resume.return_value
+
+    async def analyze_resume_events(resume_text, job_description, min_score=None):
+        yield AnalysisEvent(event=AnalysisEventType.CRITERION, data=result.criteria_scores[0])
+        yield AnalysisEvent(event=AnalysisEventType.RESULT, data=result)
+
+    mock_service.analyze_resume_events = analyze_resume_events
+    resume_path, job_desc_path = sample_files
+
+    with open(resume_path, "rb") as resume_file, open(job_desc_path, "rb") as job_desc_file:
+        response = client.post(
+            "/analyze_resume/stream",
+            files={
+                "resume_file": ("test_resume.pdf", resume_file, "application/pdf"),
+                "job_description_file": ("job_description.txt", job_desc_file, "text/plain"),
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = response.text.strip().split("\n\n")
+    assert messages[0].startswith("event: criterion\ndata: ")
+    assert messages[-1].startswith("event: result\ndata: ")
+    assert json.loads(messages[-1].split("data: ", 1)[1])["data"]["overall_score"] == 85
+
+
+@pytest.mark.asyncio
+async def test_analyze_resume_stream_error(sample_files, mock_service):
+    """Test that a failing analysis ends the stream with an error event."""
+
+    async def analyze_resume_events(resume_text, job_description, min_score=None):
+        raise ValueError("Could not extract job requirements")
+        yield
+
+    mock_service.analyze_resume_events = analyze_resume_events
+    resume_path, job_desc_path = sample_files
+
+    with open(resume_path, "rb") as resume_file, open(job_desc_path, "rb") as job_desc_file:
+        response = client.post(
+            "/analyze_resume/stream",
+            files={
+                "resume_file": ("test_resume.pdf", resume_file, "application/pdf"),
+                "job_description_file": ("job_description.txt", job_desc_file, "text/plain"),
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.text.startswith("event: error\n")
+    assert "Could not extract job requirements" in response.text
+
+
+@pytest.mark.asyncio
+async def test_analyze_resume_stream_sends_keepalive_while_stage_is_pending(sample_files, mock_service):
+    result = mock_service.analyze_resume.return_value
+
+    async def analyze_resume_events(resume_text, job_description, min_score=None):
+        await asyncio.sleep(0.2)
+        yield AnalysisEvent(event=AnalysisEventType.RESULT, data=result)
+
+    mock_service.analyze_resume_events = analyze_resume_events
+    resume_path, job_desc_path = sample_files
+
+    with (
+        patch("src.routers.settings.sse_keepalive_interval", 0.05),
+        open(resume_path, "rb") as resume_file,
+        open(job_desc_path, "rb") as job_desc_file,
+    ):
+        response = client.post(
+            "/analyze_resume/stream",
+            files={
+                "resume_file": ("test_resume.pdf", resume_file, "application/pdf"),
+                "job_description_file": ("job_description.txt", job_desc_file, "text/plain"),
+            },
+        )
+
+    messages = response.text.strip().split("\n\n")
+    assert messages[0] == ": ping"
+    assert messages[-1].startswith("event: result\ndata: ")
+    assert set(messages[:-1]) == {": ping"}
+
+
+@pytest.mark.parametrize("path", ["/analyze_resume", "/analyze_resume/stream"])
+@pytest.mark.parametrize("reason, status_code", [("overloaded", 503), ("key_quota", 429)])
+def test_analyze_resume_rejected_by_admission(mock_service, admission, path, reason, status_code):
+    admission.check.side_effect = AdmissionRejected(reason, 12.3, "Server is at capacity")
+
+    with pytest.raises(HTTPException) as exc_info:
+        client.post(
+            path,
+            files={
+                "resume_file": ("cv.txt", b"resume", "text/plain"),
+                "job_description_file": ("job.txt", b"job", "text/plain"),
+            },
+            headers={"X-API-Key": "alice"},
+        )
+
+    assert exc_info.value.status_code == status_code
+    assert exc_info.value.headers == {"Retry-After": "13"}
+    assert exc_info.value.detail == "Server is at capacity"
+    admission.check.assert_called_once_with("alice")
+    mock_service.process_files.assert_not_called()
+    mock_service.analyze_resume.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_keyless_requests_share_only_the_overall_limit(mock_service):
+    """Clients that send no X-API-Key are not squeezed into one key's quota."""
+    controller = AdmissionController(max_concurrency=16, max_wait=30, key_concurrency=4, initial_duration=1)
+    in_flight = 0
+    all_in_flight = asyncio.Event()
+
+    async def analyze_resume(resume_text, job_description, min_score=None):
+        nonlocal in_flight
+        in_flight += 1
+        if in_flight == 8:
+            all_in_flight.set()
+        await asyncio.wait_for(all_in_flight.wait(), timeout=5)
+        return mock_service.analyze_resume.return_value
+
+    mock_service.analyze_resume.side_effect = analyze_resume
+    app = FastAPI()
+    app.include_router(router)
+    files = {
+        "resume_file": ("cv.txt", b"resume", "text/plain"),
+        "job_description_file": ("job.txt", b"job", "text/plain"),
+    }
+
+    with patch("src.routers.get_admission_controller", return_value=controller):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http_client:
+            responses = await asyncio.gather(*(http_client.post("/analyze_resume", files=files) for _ in range(8)))
+
+    assert [response.status_code for response in responses] == [200] * 8
+    assert (controller.running, controller.queued) == (0, 0)
+
+
+def test_rerank():
+    def result(technical_score: int, soft_score: int) -> dict:
+        criteria = [
+            ScoringCriterion(name=name, key=key, weight=50, description=name, factors=[], score=score)
+            for name, key, score in [
+                ("Technical Skills", "technical_skills", technical_score),
+                ("Soft Skills", "soft_skills", soft_score),
+            ]
+        ]
+        return DetailedMatchResult(
+            overall_score=50, criteria_scores=criteria, match_reasons="", red_flags={}
+        ).model_dump()
+
+    response = client.post(
+        "/rerank",
+        json={"results": [result(10, 90), result(90, 10)], "emphasis": {"technical_skills_weight": 80}},
+    )
+
+    assert response.status_code == 200
+    ranked = response.json()
+    assert [item["index"] for item in ranked] == [1, 0]
+    assert ranked[0]["result"]["overall_score"] == 74
+    assert ranked[1]["result"]["red_flags"]["high"] == ["Low Technical Skills"]
+
+    compact = client.post(
+        "/rerank",
+        params={"format": "compact"},
+        json={"results": [result(10, 90), result(90, 10)], "emphasis": {"technical_skills_weight": 80}},
+    ).json()
+    assert [row[0] for row in compact["rows"]] == [1, 0]
+    assert compact["rows"][1][3] == [3, 0]
+
+
+@pytest.fixture
+def task_queue(tmp_path):
+    queue = TaskQueue(path=tmp_path / "tasks.sqlite3")
+    with patch("src.routers.get_task_queue", return_value=queue):
+        yield queue
+
+
+def test_submit_analysis_task(sample_files, mock_service, task_queue):
+    """Test queueing an analysis and polling its status."""
+    resume_path, job_desc_path = sample_files
+
+    with open(resume_path, "rb") as resume_file, open(job_desc_path, "rb") as job_desc_file:
+        response = client.post(
+            "/tasks/analyze_resume",
+            files={
+                "resume_file": ("test_resume.pdf", resume_file, "application/pdf"),
+                "job_description_file": ("job_description.txt", job_desc_file, "text/plain"),
+            },
+        )
+
+    assert response.status_code == 202
+    task_id = response.json()["task_id"]
+    assert response.json()["status"] == "pending"
+    assert task_queue.claim() == (task_id, 1, "resume content", "job description content")
+
+    response = client.get(f"/tasks/{task_id}")
+    assert response.status_code == 200
+    assert response.json()["status"] == "running"
+
+    with pytest.raises(HTTPException) as exc_info:
+        client.get(f"/tasks/{task_id}/result")
+    assert exc_info.value.status_code == 409
+
+
+def test_get_analysis_task_result(mock_service, task_queue):
+    """Test fetching the result of a completed task."""
+    task = task_queue.submit("resume content", "job description content")
+    _, attempt, _, _ = task_queue.claim()
+    task_queue.complete(task.task_id, attempt, mock_service.analyze_resume.return_value)
+
+    response = client.get(f"/tasks/{task.task_id}/result")
+
+    assert response.status_code == 200
+    assert response.json()["overall_score"] == 85
+
+
+@pytest.mark.parametrize("path", ["/tasks/unknown", "/tasks/unknown/result"])
+def test_get_unknown_analysis_task(task_queue, path):
+    with pytest.raises(HTTPException) as exc_info:
+        client.get(path)
+    assert exc_info.value.status_code == 404
+
+
+def stored_result(overall_score: int, technical_score: int, red_flags=None) -> DetailedMatchResult:
+    return DetailedMatchResult(
+        overall_score=overall_score,
+        criteria_scores=[
+            ScoringCriterion(
+                name="Technical Skills",
+                key="technical_skills",
+                weight=50,
+                description="",
+                factors=[],
+                score=technical_score,
+            )
+        ],
+        match_reasons="",
+        red_flags=red_flags or {},
+    )
+
+
+def test_results_endpoints(results_store):
+    best = results_store.save("resume 1", "job", stored_result(90, 60))
+    results_store.save("resume 2", "job", stored_result(70, 95, {"high": ["Low Experience"]}))
+    results_store.save("resume 3", "job", stored_result(50, 40))
+
+    top = client.get(f"/results/jobs/{text_hash('job')}/top", params={"k": 2, "max_red_flag_level": "medium"})
+    by_criterion = client.get(f"/results/jobs/{text_hash('job')}/top", params={"criterion": "technical_skills"})
+    first_page = client.get("/results", params={"limit": 2})
+    second_page = client.get("/results", params={"limit": 2, "cursor": first_page.json()["next_cursor"]})
+
+    assert [item["result"]["overall_score"] for item in top.json()] == [90, 50]
+    assert [item["result"]["overall_score"] for item in by_criterion.json()] == [70, 90, 50]
+    assert [item["result"]["overall_score"] for item in first_page.json()["items"]] == [90, 70]
+    assert [item["result"]["overall_score"] for item in second_page.json()["items"]] == [50]
+    assert second_page.json()["next_cursor"] is None
+    assert client.get(f"/results/{best.result_id}").json()["result_id"] == best.result_id
+
+    compact = client.get("/results", params={"limit": 2, "format": "compact"}).json()
+    assert [row[:2] for row in compact["rows"]] == [[best.result_id, 90], [compact["rows"][1][0], 70]]
+    assert compact["next_cursor"] == first_page.json()["next_cursor"]
+    top_compact = client.get(f"/results/jobs/{text_hash('job')}/top", params={"format": "compact"}).json()
+    assert [criterion["key"] for criterion in top_compact["criteria"]] == ["technical_skills"]
+
+
+def test_results_errors(results_store):
+    with pytest.raises(HTTPException) as exc_info:
+        client.get("/results/unknown")
+    assert exc_info.value.status_code == 404
+
+    with pytest.raises(HTTPException) as exc_info:
+        client.get("/results", params={"cursor": "not-a-cursor"})
+    assert exc_info.value.status_code == 400
+
+
+def test_results_store_disabled():
+    with pytest.raises(HTTPException) as exc_info:
+        client.get("/results")
+    assert exc_info.value.status_code == 404
@@ -0,0 +1,22 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.serialization import JSON_FORMAT, MSGPACK_FORMAT, dumps, is_available, loads
+
+PAYLOAD = {"type": "JobRequirements", "data": {"skills": ["Python", "Kafka"], "years": 5, "remote": None, "é": 1.5}}
+
+
+@pytest.mark.parametrize("data_format", [JSON_FORMAT, MSGPACK_FORMAT])
+def test_round_trip(data_format):
+    if not is_available(data_format):
+        pytest.skip(f"{data_format} is not installed")
+    assert loads(dumps(PAYLOAD, data_format), data_format) == PAYLOAD
+
+
+def test_stdlib_json_when_fast_json_disabled():
+    with patch("src.serialization.settings.fast_json_enabled", False):
+        encoded = dumps(PAYLOAD)
+        assert loads(encoded) == PAYLOAD
+
+    assert encoded == dumps(PAYLOAD)
@@ -4,7 +4,16 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import click
 import pytest
 
-from src.entities import DetailedMatchResult, ScoringCriterion
+from src.entities import (
+    AnalysisEvent,
+    AnalysisEventType,
+    ContactInfo,
+    DetailedMatchResult,
+    ModelTier,
+    NearDuplicate,
+    ScoringCriterion,
+    UnifiedResume,
+)
 from src.services import ResumeAnalysisService
 
 
@@ -29,13 +38,18 @@ def mock_markitdown():
 
 @pytest.fixture
 def service(mock_ai_client, mock_markitdown):
-    with (
-        patch('src.services.JobAnalyzer'),
-        patch('src.services.MarkItDown', return_value=mock_markitdown),
-        patch('src.services.Console'),
-    ):
+    with patch('src.services.JobAnalyzer'):
         service = ResumeAnalysisService(client=mock_ai_client)
-        return service
+    service.markitdown = mock_markitdown
+    return service
+
+
+@pytest.fixture
+def unified_resume():
+    return UnifiedResume(
+        markdown="Unified resume content",
+        contact=ContactInfo(website="https://www.example.com", email="jane@example.com"),
+    )
 
 
 @pytest.fixture
@@ -80,6 +94,18 @@ def test_process_files_success(service, tmp_path):
     assert isinstance(job_description, str)
     assert len(resume_text) > 0
     assert len(job_description) > 0
+    service.markitdown.convert.assert_not_called()
+
+
+def test_process_files_falls_back_to_markitdown(service, tmp_path):
+    resume_path = tmp_path / "resume.docx"
+    job_desc_path = tmp_path / "job.txt"
+    resume_path.write_bytes(b"PK\x03\x04")
+    job_desc_path.write_text("Job Description")
+
+    resume_text, _ = service.process_files(resume_path, job_desc_path)
+
+    assert resume_text == "Mocked resume content"
 
 
 def test_process_files_missing_file(service):
@@ -88,52 +114,138 @@ def test_process_files_missing_file(service):
 
 
 @pytest.mark.asyncio
-async def test_analyze_resume_success(service):
-    # Mock the analyzer methods with coroutine return values
-    service.analyzer.extract_job_requirements.return_value = ["Python", "AWS"]
-    service.analyzer.unify_resume.return_value = "Unified resume content"
-    service.analyzer.match_resume.return_value = DetailedMatchResult(
-        overall_score=75,
-        criteria_scores=[],
-        match_reasons="Good match",
-        red_flags={},
-    )
+async def test_analyze_resume_success(service, unified_resume):
+    async def match_resume_events(**kwargs):
+        yield AnalysisEvent(
+            event=AnalysisEventType.RESULT,
+            data=DetailedMatchResult(overall_score=75, criteria_scores=[], match_reasons="Good match", red_flags={}),
+        )
 
-    # Convert all return values to coroutines
     service.analyzer.extract_job_requirements = AsyncMock(return_value=["Python", "AWS"])
-    service.analyzer.unify_resume = AsyncMock(return_value="Unified resume content")
-    service.analyzer.match_resume = AsyncMock(
-        return_value=DetailedMatchResult(
-            overall_score=75,
-            criteria_scores=[],
-            match_reasons="Good match",
-            red_flags={},
-        )
-    )
+    service.analyzer.parse_resume = AsyncMock(return_value=unified_resume)
+    service.analyzer.match_resume_events = MagicMock(side_effect=match_resume_events)
 
     result = await service.analyze_resume("resume text", "job description")
 
     assert isinstance(result, DetailedMatchResult)
     assert result.overall_score == 75
     service.analyzer.extract_job_requirements.assert_awaited_once_with("job description")
-    service.analyzer.unify_resume.assert_awaited_once_with("resume text")
-    service.analyzer.match_resume.assert_awaited_once()
+    service.analyzer.parse_resume.assert_awaited_once_with("resume text")
+    service.analyzer.match_resume_events.assert_called_once_with(
+        resume_text="Unified resume content",
+        job_description="job description",
+        job_requirements=["Python", "AWS"],
+        contact=unified_resume.contact,
+        min_score=None,
+    )
 
 
 @pytest.mark.asyncio
 async def test_analyze_resume_failure(service):
     # Set up async mock with an exception
     service.analyzer.extract_job_requirements = AsyncMock(side_effect=Exception("API Error"))
-    service.analyzer.unify_resume = AsyncMock()
-    service.analyzer.match_resume = AsyncMock()
+    service.analyzer.parse_resume = AsyncMock()
+    service.analyzer.match_resume_events = MagicMock()
 
     with pytest.raises(click.ClickException):
         await service.analyze_resume("resume text", "job description")
 
     # Verify only the first method was called before the exception
     service.analyzer.extract_job_requirements.assert_awaited_once_with("job description")
-    service.analyzer.unify_resume.assert_not_awaited()
-    service.analyzer.match_resume.assert_not_awaited()
+    service.analyzer.parse_resume.assert_not_awaited()
+    service.analyzer.match_resume_events.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_analyze_resume_events(service, sample_match_result, unified_resume):
+    async def match_resume_events(**kwargs):
+        yield AnalysisEvent(event=AnalysisEventType.CRITERION, data=sample_match_result.criteria_scores[0])
+        yield AnalysisEvent(event=AnalysisEventType.RESULT, data=sample_match_result)
+
+    service.analyzer.extract_job_requirements = AsyncMock(return_value=["Python", "AWS"])
+    service.analyzer.parse_resume = AsyncMock(return_value=unified_resume)
+    service.analyzer.match_resume_events = match_resume_events
+
+    events = [event async for event in service.analyze_resume_events("resume text", "job description")]
+
+    assert [event.event for event in events] == [
+        AnalysisEventType.REQUIREMENTS,
+        AnalysisEventType.RESUME,
+        AnalysisEventType.CRITERION,
+        AnalysisEventType.RESULT,
+    ]
+    assert events[1].data == "Unified resume content"
+    assert events[-1].data == sample_match_result
+
+
+def match_result(score: int) -> DetailedMatchResult:
+    return DetailedMatchResult(overall_score=score, criteria_scores=[], match_reasons="", red_flags={})
+
+
+@pytest.mark.asyncio
+async def test_screen_resumes_rescores_shortlist_with_strong_model(mock_ai_client, unified_resume):
+    with patch('src.services.JobAnalyzer', side_effect=[AsyncMock(), AsyncMock()]):
+        service = ResumeAnalysisService(client=mock_ai_client, strong_client=MagicMock())
+    fast_scores = {"first": 80, "second": 40, "third": 60, "fourth": 70}
+    service.analyzer.extract_job_requirements.return_value = ["Python"]
+    service.analyzer.parse_resume.side_effect = lambda text: unified_resume.model_copy(update={"markdown": text})
+    service.analyzer.match_resume.side_effect = lambda **kwargs: match_result(fast_scores[kwargs["resume_text"]])
+    service.strong_analyzer.match_resume.side_effect = [match_result(55), Exception("API Error")]
+
+    ranked = await service.screen_resumes(
+        list(fast_scores), "job description", shortlist_size=2, shortlist_min_score=50, concurrency=1
+    )
+
+    assert [(item.index, item.result.overall_score, item.result.tier) for item in ranked] == [
+        (0, 55, ModelTier.STRONG),
+        (3, 70, ModelTier.FAST),
+        (2, 60, ModelTier.FAST),
+        (1, 40, ModelTier.FAST),
+    ]
+    assert {call.kwargs["min_score"] for call in service.analyzer.match_resume.await_args_list} == {50}
+    assert [call.kwargs["resume_text"] for call in service.strong_analyzer.match_resume.await_args_list] == [
+        "first",
+        "fourth",
+    ]
+    service.strong_analyzer.parse_resume.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_screen_resumes_without_strong_model(service, unified_resume):
+    service.analyzer.extract_job_requirements = AsyncMock(return_value=["Python"])
+    service.analyzer.parse_resume = AsyncMock(side_effect=[unified_resume, Exception("API Error")])
+    service.analyzer.match_resume = AsyncMock(return_value=match_result(75))
+
+    ranked = await service.screen_resumes(["first", "second"], "job description", shortlist_min_score=90)
+
+    assert [(item.index, item.result.tier) for item in ranked] == [(0, ModelTier.FAST)]
+    assert service.analyzer.match_resume.await_args.kwargs["min_score"] is None
+
+
+@pytest.mark.asyncio
+async def test_screen_resumes_checks_near_duplicates(mock_ai_client, unified_resume):
+    with patch('src.services.JobAnalyzer', side_effect=[AsyncMock(), AsyncMock()]):
+        service = ResumeAnalysisService(client=mock_ai_client, strong_client=MagicMock())
+    earlier = NearDuplicate(text_hash="abc", similarity=0.9)
+    reused = match_result(90).model_copy(update={"tier": ModelTier.STRONG, "duplicate_of": earlier, "reused": True})
+    checks = {"first": (None, None), "copy": (earlier, reused), "edited": (earlier, None)}
+    service.check_duplicates = AsyncMock(side_effect=lambda text, job_description: checks[text])
+    service.analyzer.extract_job_requirements.return_value = ["Python"]
+    service.analyzer.parse_resume.side_effect = lambda text: unified_resume.model_copy(update={"markdown": text})
+    service.analyzer.match_resume.side_effect = lambda **kwargs: match_result(70)
+    service.strong_analyzer.match_resume.side_effect = lambda **kwargs: match_result(75)
+
+    ranked = await service.screen_resumes(list(checks), "job description", shortlist_size=3, concurrency=1)
+
+    assert [(item.index, item.result.overall_score, item.result.duplicate_of) for item in ranked] == [
+        (1, 90, earlier),
+        (0, 75, None),
+        (2, 75, earlier),
+    ]
+    assert ranked[0].result.reused
+    assert service.check_duplicates.await_count == 3
+    assert [call.args[0] for call in service.analyzer.parse_resume.await_args_list] == ["first", "edited"]
+    assert service.strong_analyzer.match_resume.await_count == 2
 
 
 def test_show_analysis_result(service, sample_match_result, capsys):
@@ -0,0 +1,36 @@
+import sqlite3
+from dataclasses import dataclass
+from typing import ClassVar
+
+import pytest
+
+from src.storage import SQLiteStore
+
+NOTES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (note_id INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS tags (note_id INTEGER NOT NULL REFERENCES notes (note_id));
+"""
+
+
+@dataclass
+class NotesStore(SQLiteStore):
+    schema: ClassVar[str] = NOTES_SCHEMA
+
+
+def test_store_creates_database_with_schema(tmp_path):
+    store = NotesStore(path=str(tmp_path / "nested" / "notes.sqlite3"))
+
+    with store._connect() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.execute("INSERT INTO notes (note_id) VALUES (1)")
+        assert dict(conn.execute("SELECT * FROM notes").fetchone()) == {"note_id": 1}
+        # Foreign keys are only enforced by stores that ask for them
+        conn.execute("INSERT INTO tags (note_id) VALUES (2)")
+    assert store.path.exists()
+
+    NotesStore.foreign_keys = True
+    try:
+        with pytest.raises(sqlite3.IntegrityError), store._connect() as conn:
+            conn.execute("INSERT INTO tags (note_id) VALUES (3)")
+    finally:
+        NotesStore.foreign_keys = False
@@ -0,0 +1,86 @@
+import random
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from openai import AsyncOpenAI
+from pydantic_ai import Agent
+from pydantic_ai.models.openai import OpenAIModel
+
+from benchmarks.fake_client import LatencyModel
+from benchmarks.stub_server import StubConfig, Throttle, create_stub_app, fake_from_schema
+from src.entities import JobRequirements
+
+
+@pytest.fixture
+def stub_app():
+    return create_stub_app(StubConfig(latency=LatencyModel("constant", 0), response_words=5))
+
+
+def test_fake_from_schema_validates():
+    data = fake_from_schema(JobRequirements.model_json_schema(), random.Random(1))
+
+    assert JobRequirements.model_validate(data)
+
+
+def test_chat_completions_text(stub_app):
+    response = TestClient(stub_app).post(
+        "/v1/chat/completions",
+        json={
+            "model": "gpt-4o-mini",
+            "messages": [{"role": "user", "content": "Provide your evaluation as an integer score from 0 to 100."}],
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert 0 <= int(body["choices"][0]["message"]["content"]) <= 100
+    assert body["usage"]["prompt_tokens"] > 0
+
+
+def test_messages_tool_use(stub_app):
+    response = TestClient(stub_app).post(
+        "/v1/messages",
+        json={
+            "model": "claude-3-5-haiku-latest",
+            "max_tokens": 100,
+            "messages": [{"role": "user", "content": [{"type": "text", "text": "Extract requirements"}]}],
+            "tools": [{"name": "final_result", "input_schema": JobRequirements.model_json_schema()}],
+        },
+    )
+
+    assert response.status_code == 200
+    block = response.json()["content"][0]
+    assert block["type"] == "tool_use"
+    assert JobRequirements.model_validate(block["input"])
+
+
+def test_throttle():
+    throttle = Throttle(max_concurrency=1, rate_limit=0)
+
+    assert throttle.acquire() is True
+    assert throttle.acquire() is False
+    throttle.release()
+    assert throttle.acquire() is True
+
+
+def test_throttled_request_gets_429():
+    app = create_stub_app(StubConfig(latency=LatencyModel("constant", 0), rate_limit=1))
+    client = TestClient(app)
+    payload = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "hello"}]}
+
+    assert client.post("/v1/chat/completions", json=payload).status_code == 200
+    response = client.post("/v1/chat/completions", json=payload)
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_pydantic_ai_structured_result_through_stub(stub_app):
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub_app))
+    openai_client = AsyncOpenAI(base_url="http://stub/v1", api_key="stub", http_client=http_client)
+    agent = Agent(OpenAIModel("gpt-4o-mini", openai_client=openai_client), result_type=JobRequirements)
+
+    result = await agent.run("Extract the key requirements")
+
+    assert isinstance(result.data, JobRequirements)
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import click
+import pytest
+
+from src.entities import DetailedMatchResult, TaskStatus
+from src.tasks import TaskQueue, TaskWorker
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return TaskQueue(path=tmp_path / "tasks.sqlite3", lease_seconds=60, max_attempts=2)
+
+
+@pytest.fixture
+def match_result():
+    return DetailedMatchResult(overall_score=75, criteria_scores=[], match_reasons="Good match", red_flags={})
+
+
+def test_submit_and_get(queue):
+    task = queue.submit("resume text", "job description")
+
+    assert task.status == TaskStatus.PENDING
+    assert queue.get(task.task_id) == task
+    assert queue.get("unknown") is None
+
+
+def test_claim_in_order(queue):
+    first = queue.submit("resume 1", "job")
+    second = queue.submit("resume 2", "job")
+
+    assert queue.claim() == (first.task_id, 1, "resume 1", "job")
+    assert queue.claim() == (second.task_id, 1, "resume 2", "job")
+    assert queue.claim() is None
+    assert queue.get(first.task_id).status == TaskStatus.RUNNING
+    assert queue.get(first.task_id).attempts == 1
+
+
+def test_complete_and_fail(queue, match_result):
+    completed = queue.submit("resume 1", "job")
+    failed = queue.submit("resume 2", "job")
+    queue.claim()
+    queue.claim()
+
+    assert queue.complete(completed.task_id, 1, match_result)
+    assert queue.fail(failed.task_id, 1, "API Error")
+
+    assert queue.get(completed.task_id).status == TaskStatus.COMPLETED
+    assert queue.get_result(completed.task_id) == match_result
+    assert queue.get(failed.task_id).status == TaskStatus.FAILED
+    assert queue.get(failed.task_id).error == "API Error"
+    assert queue.get_result(failed.task_id) is None
+
+
+def test_expired_lease_is_reclaimed(queue):
+    queue.lease_seconds = -1
+    task = queue.submit("resume", "job")
+
+    assert queue.claim()[:2] == (task.task_id, 1)
+    # The first worker died; the lease has expired so another worker picks it up
+    assert queue.claim()[:2] == (task.task_id, 2)
+    # Out of attempts
+    assert queue.claim() is None
+    assert queue.get(task.task_id).status == TaskStatus.FAILED
+
+
+def test_stale_claim_cannot_renew_or_finish(queue, match_result):
+    queue.lease_seconds = -1
+    task = queue.submit("resume", "job")
+    queue.claim()
+    queue.lease_seconds = 60
+    queue.claim()
+
+    # The first worker outlived its lease; the second attempt owns the task now
+    assert not queue.renew(task.task_id, 1)
+    assert not queue.fail(task.task_id, 1, "Timed out")
+    assert queue.get(task.task_id).status == TaskStatus.RUNNING
+    assert queue.renew(task.task_id, 2)
+    assert queue.complete(task.task_id, 2, match_result)
+    assert queue.get_result(task.task_id) == match_result
+
+
+@pytest.mark.asyncio
+async def test_worker_renews_the_lease_of_a_long_analysis(queue, match_result):
+    queue.lease_seconds = 0.3
+
+    async def analyze_resume(resume_text, job_description):
+        await asyncio.sleep(1)
+        return match_result
+
+    service = MagicMock()
+    service.analyze_resume = analyze_resume
+    worker = TaskWorker(queue=queue, service=service, concurrency=1)
+    task = queue.submit("resume", "job")
+
+    processing = asyncio.create_task(worker.process_next())
+    await asyncio.sleep(0.6)
+    # Past the original lease, yet no other worker can take the task
+    assert queue.claim() is None
+    assert await processing is True
+    assert queue.get(task.task_id).status == TaskStatus.COMPLETED
+    assert queue.get(task.task_id).attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_abandons_a_task_whose_lease_was_taken_over(queue):
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def analyze_resume(resume_text, job_description):
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    service = MagicMock()
+    service.analyze_resume = analyze_resume
+    queue.lease_seconds = 0.3
+    worker = TaskWorker(queue=queue, service=service, concurrency=1)
+    task = queue.submit("resume", "job")
+
+    processing = asyncio.create_task(worker.process_next())
+    await started.wait()
+    # Another worker takes the task over, as if this one had stalled past its lease
+    queue.lease_seconds = -1
+    await asyncio.to_thread(queue.renew, task.task_id, 1)
+    queue.lease_seconds = 60
+    assert queue.claim()[:2] == (task.task_id, 2)
+
+    assert await asyncio.wait_for(processing, timeout=5) is True
+    assert cancelled.is_set()
+    assert queue.get(task.task_id).status == TaskStatus.RUNNING
+
+
+@pytest.mark.asyncio
+async def test_worker_process_next(queue, match_result):
+    service = MagicMock()
+    service.analyze_resume = AsyncMock(side_effect=[match_result, click.ClickException("API Error")])
+    worker = TaskWorker(queue=queue, service=service, concurrency=1)
+    completed = queue.submit("resume 1", "job")
+    failed = queue.submit("resume 2", "job")
+
+    assert await worker.process_next() is True
+    assert await worker.process_next() is True
+    assert await worker.process_next() is False
+
+    assert queue.get(completed.task_id).status == TaskStatus.COMPLETED
+    assert queue.get(failed.task_id).status == TaskStatus.FAILED
+    assert queue.get(failed.task_id).error == "API Error"
+
+
+@pytest.mark.asyncio
+async def test_worker_run_until_stopped(queue, match_result):
+    service = MagicMock()
+    service.analyze_resume = AsyncMock(return_value=match_result)
+    worker = TaskWorker(queue=queue, service=service, concurrency=2, poll_interval=0.01)
+    tasks = [queue.submit(f"resume {i}", "job") for i in range(3)]
+    stop = asyncio.Event()
+
+    run = asyncio.create_task(worker.run(stop))
+    deadline = time.monotonic() + 5
+    while any(queue.get(t.task_id).status != TaskStatus.COMPLETED for t in tasks) and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    stop.set()
+    await run
+
+    assert all(queue.get(t.task_id).status == TaskStatus.COMPLETED for t in tasks)
+    assert service.analyze_resume.await_count == 3